@@ -0,0 +1,82 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import bisect
+import contextlib
+
+from oslo_utils import timeutils
+
+# Upper bounds, in seconds, of the latency histogram buckets. An implicit
+# last bucket holds everything above the last bound.
+DEFAULT_LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                           1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram(object):
+    """In-process histogram of observed values."""
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def to_dict(self):
+        buckets = [(str(bound), count) for bound, count in
+                   zip(self.buckets, self.counts)]
+        buckets.append(('+Inf', self.counts[-1]))
+        return {'count': self.count,
+                'sum': self.sum,
+                'max': self.max,
+                'buckets': dict(buckets)}
+
+
+class HistogramRegistry(object):
+    """Set of histograms keyed by arbitrary hashable keys."""
+
+    def __init__(self, buckets=DEFAULT_LATENCY_BUCKETS):
+        self._buckets = buckets
+        self._histograms = {}
+
+    def observe(self, key, value):
+        histogram = self._histograms.get(key)
+        if not histogram:
+            histogram = self._histograms[key] = Histogram(self._buckets)
+        histogram.observe(value)
+
+    @contextlib.contextmanager
+    def timed(self, key):
+        start = timeutils.now()
+        try:
+            yield
+        finally:
+            self.observe(key, timeutils.now() - start)
+
+    def get(self, key):
+        return self._histograms.get(key)
+
+    def keys(self):
+        return list(self._histograms.keys())
+
+    def snapshot(self):
+        return dict((key, histogram.to_dict())
+                    for key, histogram in self._histograms.items())
+
+    def reset(self):
+        self._histograms = {}
@@ -170,6 +170,16 @@ class AgentBaseNotification(object):
         """
         self.cctxt.cast(self, 'send_notification', notification_data=[data])
 
+    def _notifications(self, data):
+        """Enqueues a list of notification events at once.
+
+        :param data: List of event data blobs
+
+        Returns: None
+
+        """
+        self.cctxt.cast(self, 'send_notification', notification_data=data)
+
     def to_dict(self):
         return {}
 
@@ -13,6 +13,7 @@
 import copy
 import os
 
+import eventlet
 import six
 
 from gbpservice.contrib.nfp.configurator.agents import agent_base
@@ -20,6 +21,7 @@ from gbpservice.contrib.nfp.configurator.lib import (
     generic_config_constants as gen_cfg_const)
 from gbpservice.contrib.nfp.configurator.lib import constants as common_const
 from gbpservice.contrib.nfp.configurator.lib import data_parser
+from gbpservice.contrib.nfp.configurator.lib import health_monitor
 from gbpservice.contrib.nfp.configurator.lib import utils
 from gbpservice.nfp.core import event as nfp_event
 from gbpservice.nfp.core import log as nfp_logging
@@ -54,6 +56,8 @@ class GenericConfigRpcManager(agent_base.AgentBaseRPCManager):
         """
 
         self.parse = data_parser.DataParser()
+        # Set by init_agent when the periodic health checks are batched
+        self.hm_scheduler = None
         super(GenericConfigRpcManager, self).__init__(sc, conf)
 
     def _send_event(self, context, resource_data, event_id, event_key=None):
@@ -147,6 +151,10 @@ class GenericConfigRpcManager(agent_base.AgentBaseRPCManager):
                  "%(nfds)s",
                  {'nfds': resource_data['nfds']})
         resource_data['fail_count'] = 0
+        if self.hm_scheduler and (resource_data['nfds'][0]['periodicity'] ==
+                                  gen_cfg_const.FOREVER):
+            self.hm_scheduler.add(context, resource_data)
+            return
         self._send_event(context,
                          resource_data,
                          gen_cfg_const.EVENT_CONFIGURE_HEALTHMONITOR,
@@ -166,6 +174,8 @@ class GenericConfigRpcManager(agent_base.AgentBaseRPCManager):
                  "%(nfds)s",
                  {'nfds': resource_data['nfds']})
         event_key = resource_data['nfds'][0]['vmid']
+        if self.hm_scheduler:
+            self.hm_scheduler.remove(event_key)
         poll_event_id = gen_cfg_const.EVENT_CONFIGURE_HEALTHMONITOR
         self.sc.stop_poll_event(event_key, poll_event_id)
 
@@ -260,16 +270,20 @@ class GenericConfigEventHandler(agent_base.AgentBaseEventHandler,
             LOG.error(msg)
             return
 
-    def send_periodic_hm_notification(self, ev, nfd, result, notification_id):
+    def send_periodic_hm_notification(self, ev, nfd, result, notification_id,
+                                      notifications=None):
         ev_copy = copy.deepcopy(ev)
         ev_copy.data["context"]["notification_data"] = {}
         ev_copy.data["context"]["context"]["nfp_context"]["id"] = (
             notification_id)
         ev_copy.data['context']['context']['nfd_id'] = nfd.get('vmid')
         notification_data = self._prepare_notification_data(ev_copy, result)
-        self.notify._notification(notification_data)
+        if notifications is not None:
+            notifications.append(notification_data)
+        else:
+            self.notify._notification(notification_data)
 
-    def handle_periodic_hm(self, ev, result):
+    def handle_periodic_hm(self, ev, result, notifications=None):
         resource_data = ev.data['resource_data']
         nfd = ev.data["resource_data"]['nfds'][0]
         periodic_polling_reason = nfd["periodic_polling_reason"]
@@ -286,7 +300,8 @@ class GenericConfigEventHandler(agent_base.AgentBaseEventHandler,
                         gen_cfg_const.DEVICE_TO_BECOME_DOWN):
                     notification_id = gen_cfg_const.DEVICE_NOT_REACHABLE
                     self.send_periodic_hm_notification(ev, nfd, result,
-                                                       notification_id)
+                                                       notification_id,
+                                                       notifications)
                     nfd["periodic_polling_reason"] = (
                         gen_cfg_const.DEVICE_TO_BECOME_UP)
         elif result == common_const.SUCCESS:
@@ -296,11 +311,36 @@ class GenericConfigEventHandler(agent_base.AgentBaseEventHandler,
             if periodic_polling_reason == gen_cfg_const.DEVICE_TO_BECOME_UP:
                 notification_id = gen_cfg_const.DEVICE_REACHABLE
                 self.send_periodic_hm_notification(ev, nfd, result,
-                                                   notification_id)
+                                                   notification_id,
+                                                   notifications)
                 nfd["periodic_polling_reason"] = (
                     gen_cfg_const.DEVICE_TO_BECOME_DOWN)
 
-    def _process_event(self, ev):
+    def handle_periodic_hm_batch(self, batch):
+        """Checks the health of a batch of service VMs concurrently.
+
+        The notifications of the devices which became reachable or not
+        reachable are sent at once.
+
+        :param batch: List of (agent_info, resource_data) of the devices,
+        as received for the periodic health monitoring.
+
+        Returns: None
+
+        """
+        notifications = []
+        pool = eventlet.GreenPool(gen_cfg_const.PERIODIC_HM_CONCURRENCY)
+        for agent_info, resource_data in batch:
+            ev = self.sc.new_event(
+                id=gen_cfg_const.EVENT_CONFIGURE_HEALTHMONITOR,
+                data={'context': agent_info, 'resource_data': resource_data},
+                key=resource_data['nfds'][0]['vmid'])
+            pool.spawn_n(self._process_event, ev, notifications)
+        pool.waitall()
+        if notifications:
+            self.notify._notifications(notifications)
+
+    def _process_event(self, ev, notifications=None):
         LOG.debug(" Handling event %s ", (ev.data))
         # Process single request data blob
         resource_data = ev.data['resource_data']
@@ -344,7 +384,7 @@ class GenericConfigEventHandler(agent_base.AgentBaseEventHandler,
             elif resource_data['nfds'][0]['periodicity'] == (
                     gen_cfg_const.FOREVER):
                 ev.data["context"]["resource"] = gen_cfg_const.PERIODIC_HM
-                self.handle_periodic_hm(ev, result)
+                self.handle_periodic_hm(ev, result, notifications)
         else:
             """For other events, irrespective of result send notification"""
             notification_data = self._prepare_notification_data(ev, result)
@@ -515,6 +555,10 @@ def init_agent(cm, sc, conf):
         LOG.debug(msg)
 
     rpcmgr = GenericConfigRpcManager(sc, conf)
+    if conf.configurator.periodic_hm_batch_size:
+        rpcmgr.hm_scheduler = health_monitor.HealthMonitorScheduler(
+            GenericConfigEventHandler(sc, drivers, rpcmgr),
+            conf.configurator.periodic_hm_batch_size)
 
     try:
         events_init(sc, drivers, rpcmgr)
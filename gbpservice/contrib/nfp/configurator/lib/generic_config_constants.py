@@ -33,3 +33,8 @@ DEVICE_REACHABLE = 'PERIODIC_HM_DEVICE_REACHABLE'
 # POLLING EVENTS SPACING AND MAXRETRIES
 EVENT_CONFIGURE_HEALTHMONITOR_SPACING = 10  # unit in sec.
 EVENT_CONFIGURE_HEALTHMONITOR_MAXRETRY = 100
+
+# Periodic health monitoring in batches, see HealthMonitorScheduler
+PERIODIC_HM_TICK = 1  # unit in sec.
+PERIODIC_HM_JITTER = 0.2  # fraction of the spacing
+PERIODIC_HM_CONCURRENCY = 64
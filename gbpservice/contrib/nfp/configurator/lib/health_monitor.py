@@ -0,0 +1,97 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import random
+import time
+
+import eventlet
+
+from gbpservice.contrib.nfp.configurator.lib import (
+    generic_config_constants as gen_cfg_const)
+from gbpservice.nfp.core import log as nfp_logging
+
+LOG = nfp_logging.getLogger(__name__)
+
+
+class HealthMonitorScheduler(object):
+    """Periodic health monitoring of the service VMs, in batches.
+
+    Rather than polling each service VM with its own poll event, the
+    devices registered for periodic health monitoring are checked by a
+    single task of the process receiving the requests. Every device is due
+    once per spacing, with its period jittered so that the devices
+    registered together don't keep being checked together. The due devices
+    are grouped by service driver and handed over to the handler in batches
+    of batch_size, which probes them concurrently.
+    """
+
+    def __init__(self, handler, batch_size,
+                 spacing=gen_cfg_const.EVENT_CONFIGURE_HEALTHMONITOR_SPACING,
+                 jitter=gen_cfg_const.PERIODIC_HM_JITTER):
+        self.handler = handler
+        self.batch_size = batch_size
+        self.spacing = spacing
+        self.jitter = jitter
+        # vmid -> [next due time, group, agent_info, resource_data]
+        self._devices = {}
+        self._task = None
+
+    def _next_due(self, now):
+        return now + self.spacing * random.uniform(1 - self.jitter,
+                                                   1 + self.jitter)
+
+    def add(self, agent_info, resource_data):
+        vmid = resource_data['nfds'][0]['vmid']
+        group = (agent_info['resource_type'], agent_info['service_vendor'],
+                 agent_info.get('service_feature', ''))
+        # The first check is spread over a whole period
+        due = time.time() + random.uniform(0, self.spacing)
+        self._devices[vmid] = [due, group, agent_info, resource_data]
+        if not self._task:
+            self._task = eventlet.spawn(self._run)
+
+    def remove(self, vmid):
+        return self._devices.pop(vmid, None) is not None
+
+    def get_due_batches(self, now=None):
+        """Returns the batches of the devices due, and reschedules them."""
+        now = now or time.time()
+        groups = {}
+        for vmid, device in list(self._devices.items()):
+            if device[0] > now:
+                continue
+            device[0] = self._next_due(now)
+            groups.setdefault(device[1], []).append(
+                (vmid, device[2], device[3]))
+        batches = []
+        for devices in groups.values():
+            for i in range(0, len(devices), self.batch_size):
+                batches.append(devices[i:i + self.batch_size])
+        return batches
+
+    def check_due(self, now=None):
+        for batch in self.get_due_batches(now):
+            # The devices cleared since they were found due are skipped
+            batch = [(agent_info, resource_data)
+                     for vmid, agent_info, resource_data in batch
+                     if vmid in self._devices]
+            try:
+                self.handler.handle_periodic_hm_batch(batch)
+            except Exception as err:
+                LOG.error("Failed to check the health of %(count)d "
+                          "devices. Reason: %(err)s",
+                          {'count': len(batch), 'err': err})
+
+    def _run(self):
+        while True:
+            eventlet.sleep(gen_cfg_const.PERIODIC_HM_TICK)
+            self.check_due()
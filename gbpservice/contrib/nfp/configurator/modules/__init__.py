@@ -19,7 +19,13 @@ nfp_configurator_extra_opts = [
                        default='514', help='Log collector port number'),
     oslo_config.StrOpt('log_level',
                        default='debug',
-                       help='Log level info/error/debug/warning')]
+                       help='Log level info/error/debug/warning'),
+    oslo_config.IntOpt('periodic_hm_batch_size',
+                       default=50,
+                       help='Maximum number of service VMs whose periodic '
+                            'health check is done at once, concurrently. '
+                            '0 polls each service VM with its own poll '
+                            'event')]
 
 oslo_config.CONF.register_opts(nfp_configurator_extra_opts, "configurator")
 
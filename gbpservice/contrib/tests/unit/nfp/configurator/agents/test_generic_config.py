@@ -130,6 +130,28 @@ class GenericConfigRpcManagerTestCase(base.BaseTestCase):
 
         self._test_event_creation(const.EVENT_CONFIGURE_HEALTHMONITOR)
 
+    def test_configure_hm_forever_scheduled_genericconfigrpcmanager(self):
+        """ Implements test case for configure healthmonitor method
+        of generic config agent RPCmanager, with the periodic health
+        monitoring done in batches.
+
+        Returns: none
+
+        """
+
+        agent, sc = self._get_GenericConfigRpcManager_object()
+        agent.hm_scheduler = mock.Mock()
+        resource_data = self.fo._fake_resource_data()
+        resource_data['nfds'][0]['periodicity'] = const.FOREVER
+        with mock.patch.object(sc, 'post_event') as mock_sc_rpc_event:
+            agent.configure_healthmonitor(self.fo.context, resource_data)
+            agent.clear_healthmonitor(self.fo.context, resource_data)
+
+        agent.hm_scheduler.add.assert_called_once_with(
+            self.fo.context, resource_data)
+        agent.hm_scheduler.remove.assert_called_once_with(self.fo.vmid)
+        self.assertFalse(mock_sc_rpc_event.called)
+
     @unittest2.skip('not implemented yet')
     def test_clear_hm_genericconfigrpcmanager(self):
         """ Implements test case for clear healthmonitor method
@@ -363,3 +385,54 @@ class GenericConfigEventHandlerTestCase(base.BaseTestCase):
         ev = fo.FakeEventGenericConfig()
         ev.id = const.EVENT_CONFIGURE_HEALTHMONITOR
         self._test_handle_periodic_event(ev)
+
+    def test_handle_periodic_hm_batch_genericconfigeventhandler(self):
+        """ Implements test case for the batched periodic health checks
+        of generic config event handler.
+
+        Returns: none
+
+        """
+
+        agent, sc = self._get_GenericConfigEventHandler_object()
+        driver = mock.Mock()
+        driver.configure_healthmonitor.return_value = common_const.FAILED
+
+        def new_event(id, data, key):
+            ev = fo.FakeEventGenericConfig()
+            ev.id = id
+            ev.data = data
+            return ev
+
+        batch = []
+        for vmid in ['vm1', 'vm2']:
+            ev = fo.FakeEventGenericConfig()
+            ev.data['context']['context']['nfp_context'] = {}
+            resource_data = ev.data['resource_data']
+            resource_data['fail_count'] = const.MAX_FAIL_COUNT - 1
+            resource_data['nfds'][0].update(
+                {'vmid': vmid,
+                 'periodicity': const.FOREVER,
+                 'periodic_polling_reason': const.DEVICE_TO_BECOME_DOWN})
+            batch.append((ev.data['context'], resource_data))
+
+        with mock.patch.object(
+                agent, '_get_driver', return_value=driver), (
+            mock.patch.object(sc, 'new_event', side_effect=new_event)), (
+            mock.patch.object(agent.notify, '_notifications')) as (
+                mock_notifications), (
+            mock.patch.object(agent.notify, '_notification')) as (
+                mock_notification):
+            agent.handle_periodic_hm_batch(batch)
+
+        self.assertEqual(2, driver.configure_healthmonitor.call_count)
+        self.assertFalse(mock_notification.called)
+        notifications = mock_notifications.call_args[0][0]
+        self.assertEqual(
+            set(['vm1', 'vm2']),
+            set(notification['info']['context']['nfd_id']
+                for notification in notifications))
+        for _, resource_data in batch:
+            self.assertEqual(const.DEVICE_TO_BECOME_UP,
+                             resource_data['nfds'][0][
+                                 'periodic_polling_reason'])
@@ -0,0 +1,58 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import time
+
+import mock
+from neutron.tests import base
+
+from gbpservice.contrib.nfp.configurator.lib import health_monitor
+
+
+class HealthMonitorSchedulerTestCase(base.BaseTestCase):
+
+    def setUp(self):
+        super(HealthMonitorSchedulerTestCase, self).setUp()
+        self.handler = mock.Mock()
+        self.scheduler = health_monitor.HealthMonitorScheduler(
+            self.handler, batch_size=2, spacing=10, jitter=0.2)
+        mock.patch('eventlet.spawn').start()
+
+    def _add(self, vmid, service_vendor='vyos'):
+        agent_info = {'resource_type': 'generic_config',
+                      'service_vendor': service_vendor}
+        resource_data = {'nfds': [{'vmid': vmid}]}
+        self.scheduler.add(agent_info, resource_data)
+        return agent_info, resource_data
+
+    def test_get_due_batches(self):
+        for vmid in ['vm1', 'vm2', 'vm3']:
+            self._add(vmid)
+        self._add('vm4', service_vendor='haproxy')
+        now = time.time() + 10
+        batches = self.scheduler.get_due_batches(now)
+        self.assertEqual([1, 1, 2], sorted(len(batch) for batch in batches))
+        self.assertEqual(
+            set(['vm1', 'vm2', 'vm3', 'vm4']),
+            set(vmid for batch in batches for vmid, _, _ in batch))
+        # Due again in a jittered period only
+        self.assertEqual([], self.scheduler.get_due_batches(now + 7.9))
+        self.assertEqual(4, sum(
+            len(batch) for batch in self.scheduler.get_due_batches(now + 12)))
+
+    def test_check_due(self):
+        vm1 = self._add('vm1')
+        self._add('vm2')
+        self.assertTrue(self.scheduler.remove('vm2'))
+        self.assertFalse(self.scheduler.remove('vm2'))
+        self.scheduler.check_due(time.time() + 10)
+        self.handler.handle_periodic_hm_batch.assert_called_once_with([vm1])
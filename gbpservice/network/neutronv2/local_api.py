@@ -182,6 +182,13 @@ class LocalAPI(object):
         return self._create_resource(self._core_plugin, plugin_context, 'port',
                                      attrs)
 
+    def _create_ports(self, plugin_context, attrs_list):
+        # Uses the core plugin's native bulk support, so that all the
+        # ports are created within a single transaction.
+        return self._core_plugin.create_port_bulk(
+            plugin_context, {'ports': [{'port': attrs}
+                                       for attrs in attrs_list]})
+
     def _update_port(self, plugin_context, port_id, attrs):
         return self._update_resource(self._core_plugin, plugin_context, 'port',
                                      port_id, attrs)
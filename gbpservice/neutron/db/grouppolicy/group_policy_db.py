@@ -388,9 +388,50 @@ class GroupPolicyDbPlugin(gpolicy.GroupPolicyPluginBase,
     __native_pagination_support = True
     __native_sorting_support = True
 
+    # Columns, keyed by table name, whose values are transformed or
+    # overridden when making the resource dict, and hence cannot be
+    # projected directly from the DB.
+    _non_projectable_columns = {}
+
     def __init__(self, *args, **kwargs):
         super(GroupPolicyDbPlugin, self).__init__(*args, **kwargs)
 
+    def _get_projected_columns(self, model, fields):
+        # Returns the names of the columns backing the requested fields
+        # if all of them map to plain columns (or synonyms of columns,
+        # like tenant_id) of the model, None otherwise.
+        if not fields:
+            return
+        mapper = sa.inspect(model)
+        columns = dict((key, key) for key in mapper.column_attrs.keys())
+        columns.update((synonym.key, synonym.name)
+                       for synonym in mapper.synonyms)
+        for key in self._non_projectable_columns.get(model.__tablename__,
+                                                     set()):
+            columns.pop(key, None)
+        if set(fields) <= set(columns):
+            return set(columns[field] for field in fields)
+
+    def _get_collection(self, context, model, dict_func, filters=None,
+                        fields=None, sorts=None, limit=None, marker_obj=None,
+                        page_reverse=False):
+        # When only plain columns are requested, select just those
+        # columns and skip building the full resource dict, which would
+        # otherwise load all the association relationships of each row.
+        columns = self._get_projected_columns(model, fields)
+        if not columns:
+            return super(GroupPolicyDbPlugin, self)._get_collection(
+                context, model, dict_func, filters=filters, fields=fields,
+                sorts=sorts, limit=limit, marker_obj=marker_obj,
+                page_reverse=page_reverse)
+        query = self._get_collection_query(context, model, filters=filters,
+                                           sorts=sorts, limit=limit,
+                                           marker_obj=marker_obj,
+                                           page_reverse=page_reverse)
+        query = query.options(orm.lazyload('*'), orm.load_only(*columns))
+        return [dict((field, getattr(item, field)) for field in fields)
+                for item in query]
+
     def _find_gbp_resource(self, context, type, id, on_fail=None):
         try:
             return self._get_by_id(context, type, id)
@@ -1029,9 +1070,10 @@ class GroupPolicyDbPlugin(gpolicy.GroupPolicyPluginBase,
 
     def _get_l3p_ptgs(self, context, l3p_id, l3p_klass=L3Policy,
                       ptg_klass=PolicyTargetGroup, l2p_klass=L2Policy):
+        # The L3P itself need not be joined, the L2P references it.
         return [self._make_policy_target_group_dict(x) for x in
                 context.session.query(ptg_klass).join(
-                    l2p_klass).join(l3p_klass).filter(
+                    l2p_klass).filter(
                         l2p_klass.l3_policy_id == l3p_id).all()]
 
     def _get_attribute(self, attrs, key):
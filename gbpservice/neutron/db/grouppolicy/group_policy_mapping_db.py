@@ -49,6 +49,12 @@ class PolicyTargetMapping(gpdb.PolicyTarget):
 class PTGToSubnetAssociation(model_base.BASEV2):
     """Many to many relation between PolicyTargetGroup and Subnets."""
     __tablename__ = 'gp_ptg_to_subnet_associations'
+    # Covers the subnet to PTGs reverse lookups, the primary key only
+    # covers the PTG to subnets ones.
+    __table_args__ = (
+        sa.Index('ix_gp_ptg_to_subnet_associations_subnet_id',
+                 'subnet_id', 'policy_target_group_id'),
+    )
     policy_target_group_id = sa.Column(
         sa.String(36), sa.ForeignKey('gp_policy_target_groups.id'),
         primary_key=True)
@@ -75,6 +81,12 @@ class L2PolicyMapping(gpdb.L2Policy):
 class L3PolicyRouterAssociation(model_base.BASEV2):
     """Models the many to many relation between L3Policies and Routers."""
     __tablename__ = 'gp_l3_policy_router_associations'
+    # Covers the router to L3P reverse lookups, the primary key only
+    # covers the L3P to routers ones.
+    __table_args__ = (
+        sa.Index('ix_gp_l3_policy_router_associations_router_id',
+                 'router_id', 'l3_policy_id'),
+    )
     l3_policy_id = sa.Column(sa.String(36), sa.ForeignKey('gp_l3_policies.id'),
                              primary_key=True)
     router_id = sa.Column(sa.String(36), sa.ForeignKey('routers.id'),
@@ -137,6 +149,10 @@ class GroupPolicyMappingDbPlugin(gpdb.GroupPolicyDbPlugin):
     """Group Policy Mapping interface implementation using SQLAlchemy models.
     """
 
+    # The L3P ip_pool is derived from its subnetpools' prefixes.
+    _non_projectable_columns = {
+        gpdb.L3Policy.__tablename__: set(['ip_pool'])}
+
     def _make_policy_target_dict(self, pt, fields=None, **kwargs):
         res = super(GroupPolicyMappingDbPlugin,
                     self)._make_policy_target_dict(pt)
@@ -208,11 +224,12 @@ class GroupPolicyMappingDbPlugin(gpdb.GroupPolicyDbPlugin):
         return [subnet.subnet_id for subnet in ptg_db.subnets]
 
     def _remove_subnets_from_policy_target_groups(self, context, subnet_ids):
+        if not subnet_ids:
+            return
         with context.session.begin(subtransactions=True):
-            assocs = context.session.query(PTGToSubnetAssociation).filter(
-                PTGToSubnetAssociation.subnet_id.in_(subnet_ids)).all()
-            for assoc in assocs:
-                context.session.delete(assoc)
+            (context.session.query(PTGToSubnetAssociation).
+             filter(PTGToSubnetAssociation.subnet_id.in_(subnet_ids)).
+             delete(synchronize_session='fetch'))
 
     def _remove_subnets_from_policy_target_group(self, context, ptg_id):
         with context.session.begin(subtransactions=True):
@@ -383,11 +400,36 @@ class GroupPolicyMappingDbPlugin(gpdb.GroupPolicyDbPlugin):
             context, l3p_id, l3p_klass=L3PolicyMapping,
             ptg_klass=PolicyTargetGroupMapping, l2p_klass=L2PolicyMapping)
 
+    def _get_l3p_subnet_ids(self, context, l3p_id):
+        """Return the IDs of the subnets of all the PTGs of a L3P."""
+        query = context.session.query(PTGToSubnetAssociation.subnet_id).join(
+            gpdb.PolicyTargetGroup,
+            gpdb.PolicyTargetGroup.id ==
+            PTGToSubnetAssociation.policy_target_group_id).join(
+                gpdb.L2Policy,
+                gpdb.L2Policy.id == gpdb.PolicyTargetGroup.l2_policy_id)
+        return [x.subnet_id for x in
+                query.filter(gpdb.L2Policy.l3_policy_id == l3p_id)]
+
     def get_l3p_id_from_router_id(self, context, router_id):
-        mapping = context.session.query(L3PolicyRouterAssociation).filter_by(
-            router_id=router_id).first()
+        mapping = context.session.query(
+            L3PolicyRouterAssociation.l3_policy_id).filter_by(
+                router_id=router_id).first()
         if mapping:
-            return mapping['l3_policy_id']
+            return mapping.l3_policy_id
+
+    def get_l3p_ids_from_router_ids(self, context, router_ids):
+        """Return a dictionary of L3P IDs keyed by router ID.
+
+        Routers not associated with any L3P are not included.
+        """
+        if not router_ids:
+            return {}
+        query = context.session.query(
+            L3PolicyRouterAssociation.router_id,
+            L3PolicyRouterAssociation.l3_policy_id).filter(
+                L3PolicyRouterAssociation.router_id.in_(router_ids))
+        return dict((x.router_id, x.l3_policy_id) for x in query)
 
     def _set_db_np_subnet(self, context, nat_pool, subnet_id):
         with context.session.begin(subtransactions=True):
@@ -397,9 +439,27 @@ class GroupPolicyMappingDbPlugin(gpdb.GroupPolicyDbPlugin):
             context.session.merge(db_np)
 
     def _get_ptgs_for_subnet(self, context, subnet_id):
-        return [x['policy_target_group_id'] for x in
-            context.session.query(PTGToSubnetAssociation).filter_by(
-                subnet_id=subnet_id)]
+        return [x.policy_target_group_id for x in
+            context.session.query(
+                PTGToSubnetAssociation.policy_target_group_id).filter_by(
+                    subnet_id=subnet_id)]
+
+    def _get_ptgs_for_subnets(self, context, subnet_ids):
+        """Return a dictionary of PTG ID lists keyed by subnet ID.
+
+        Subnets not associated with any PTG are not included.
+        """
+        ptgs_by_subnet = {}
+        if not subnet_ids:
+            return ptgs_by_subnet
+        query = context.session.query(
+            PTGToSubnetAssociation.subnet_id,
+            PTGToSubnetAssociation.policy_target_group_id).filter(
+                PTGToSubnetAssociation.subnet_id.in_(subnet_ids))
+        for x in query:
+            ptgs_by_subnet.setdefault(x.subnet_id, []).append(
+                x.policy_target_group_id)
+        return ptgs_by_subnet
 
     def _validate_pt_port_exta_attributes(self, context, pt):
         attributes = pt.get('port_attributes')
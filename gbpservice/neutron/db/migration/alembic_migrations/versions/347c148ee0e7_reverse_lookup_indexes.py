@@ -0,0 +1,38 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Reverse lookup indexes
+
+Revision ID: 347c148ee0e7
+Revises: bda3c34581e0
+Create Date: 2026-10-19 10:12:43.512360
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '347c148ee0e7'
+down_revision = 'bda3c34581e0'
+
+from alembic import op
+
+
+def upgrade():
+    op.create_index('ix_gp_ptg_to_subnet_associations_subnet_id',
+                    'gp_ptg_to_subnet_associations',
+                    ['subnet_id', 'policy_target_group_id'])
+    op.create_index('ix_gp_l3_policy_router_associations_router_id',
+                    'gp_l3_policy_router_associations',
+                    ['router_id', 'l3_policy_id'])
+
+
+def downgrade():
+    pass
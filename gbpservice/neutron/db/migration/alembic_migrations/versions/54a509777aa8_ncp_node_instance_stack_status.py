@@ -0,0 +1,38 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""NCP node instance stack status
+
+Revision ID: 54a509777aa8
+Revises: 347c148ee0e7
+Create Date: 2026-10-19 11:02:17.204518
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = '54a509777aa8'
+down_revision = '347c148ee0e7'
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.add_column('ncp_node_instance_stacks',
+                  sa.Column('status', sa.String(16), nullable=True))
+    op.add_column('ncp_node_instance_stacks',
+                  sa.Column('status_details', sa.String(4096),
+                            nullable=True))
+
+
+def downgrade():
+    pass
@@ -0,0 +1,35 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""NCP node instance stack config hash
+
+Revision ID: b10772e434bc
+Revises: 54a509777aa8
+Create Date: 2026-10-19 14:21:40.118237
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = 'b10772e434bc'
+down_revision = '54a509777aa8'
+
+from alembic import op
+import sqlalchemy as sa
+
+
+def upgrade():
+    op.add_column('ncp_node_instance_stacks',
+                  sa.Column('config_hash', sa.String(64), nullable=True))
+
+
+def downgrade():
+    pass
@@ -0,0 +1,42 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""NFP device sharing indexes
+
+Revision ID: e2c2a4aa1d6b
+Revises: b10772e434bc
+Create Date: 2026-10-19 16:05:12.402817
+
+"""
+
+# revision identifiers, used by Alembic.
+revision = 'e2c2a4aa1d6b'
+down_revision = 'b10772e434bc'
+
+from alembic import op
+
+
+def upgrade():
+    op.create_index('ix_nfp_network_function_devices_sharing',
+                    'nfp_network_function_devices',
+                    ['project_id', 'service_vendor', 'status',
+                     'interfaces_in_use'])
+    op.create_index('ix_nfd_cluster_mapping_info_nfd_id',
+                    'nfd_cluster_mapping_info',
+                    ['network_function_device_id'])
+    op.create_index('ix_nfp_service_gateway_info_gateway_ptg',
+                    'nfp_service_gateway_info',
+                    ['gateway_ptg'])
+
+
+def downgrade():
+    pass
@@ -0,0 +1,274 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Optional instrumentation of the Group Policy plugin operations.
+
+When enabled, the latency of every plugin operation, and of its phases
+(DB statements, policy driver precommit/postcommit/status calls and
+extension driver calls), is recorded in histograms along with the number
+of DB statements issued by each operation. The histograms can be
+periodically dumped to a local file as JSON, and a sample of the
+operations can be run under cProfile, keeping the profiles of the ones
+slower than a threshold.
+"""
+
+import contextlib
+import cProfile
+import functools
+import json
+import os
+import random
+import threading
+
+from oslo_config import cfg
+from oslo_log import log as logging
+from oslo_utils import timeutils
+import sqlalchemy as sa
+
+from gbpservice.common import metrics
+
+
+LOG = logging.getLogger(__name__)
+cfg.CONF.import_group('group_policy',
+                      'gbpservice.neutron.services.grouppolicy.config')
+
+PHASE_DB = 'db'
+PHASE_PRECOMMIT = 'precommit'
+PHASE_POSTCOMMIT = 'postcommit'
+PHASE_STATUS = 'status'
+PHASE_EXTENSION = 'extension'
+# Pseudo phase recording the whole operation.
+PHASE_TOTAL = 'total'
+
+INSTRUMENTED_PREFIXES = ('create_', 'update_', 'delete_', 'get_')
+STATEMENT_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+_recorder = None
+
+
+class _Operation(object):
+
+    def __init__(self, name):
+        self.name = name
+        self.statements = 0
+        self.db_time = 0.0
+
+
+class OperationRecorder(object):
+    """Records the latencies and DB statement counts of operations.
+
+    Operations are tracked per thread (green thread when monkey patched),
+    and may nest, in which case the phases and the DB statements are
+    accounted to all the operations in progress.
+    """
+
+    def __init__(self, dump_file=None, dump_interval=60,
+                 profile_sample_rate=0.0, slow_threshold=None,
+                 profile_dir=None):
+        self.latencies = metrics.HistogramRegistry()
+        self.statements = metrics.HistogramRegistry(
+            buckets=STATEMENT_COUNT_BUCKETS)
+        self.dump_file = dump_file
+        self.dump_interval = dump_interval
+        self.profile_sample_rate = profile_sample_rate
+        self.slow_threshold = slow_threshold
+        self.profile_dir = profile_dir
+        self._last_dump = timeutils.now()
+        self._local = threading.local()
+
+    def _get_stack(self):
+        stack = getattr(self._local, 'operations', None)
+        if stack is None:
+            stack = self._local.operations = []
+        return stack
+
+    @contextlib.contextmanager
+    def operation(self, name):
+        stack = self._get_stack()
+        op = _Operation(name)
+        profiler = None
+        if (not stack and self.profile_sample_rate and
+                random.random() < self.profile_sample_rate):
+            profiler = cProfile.Profile()
+            profiler.enable()
+        stack.append(op)
+        start = timeutils.now()
+        try:
+            yield
+        finally:
+            elapsed = timeutils.now() - start
+            stack.pop()
+            if profiler:
+                profiler.disable()
+            self.latencies.observe((name, PHASE_TOTAL), elapsed)
+            self.latencies.observe((name, PHASE_DB), op.db_time)
+            self.statements.observe(name, op.statements)
+            if not stack:
+                if (self.slow_threshold is not None and
+                        elapsed >= self.slow_threshold):
+                    self._report_slow_operation(op, elapsed, profiler)
+                self._maybe_dump()
+
+    @contextlib.contextmanager
+    def phase(self, phase):
+        stack = self._get_stack()
+        if not stack:
+            yield
+            return
+        names = set(op.name for op in stack)
+        start = timeutils.now()
+        try:
+            yield
+        finally:
+            elapsed = timeutils.now() - start
+            for name in names:
+                self.latencies.observe((name, phase), elapsed)
+
+    def statement_executed(self, elapsed):
+        for op in self._get_stack():
+            op.statements += 1
+            op.db_time += elapsed
+
+    def _report_slow_operation(self, op, elapsed, profiler):
+        LOG.warning("Slow Group Policy operation %(name)s: %(elapsed).3fs, "
+                    "%(statements)s DB statements in %(db_time).3fs",
+                    {'name': op.name, 'elapsed': elapsed,
+                     'statements': op.statements, 'db_time': op.db_time})
+        if profiler and self.profile_dir:
+            path = os.path.join(
+                self.profile_dir, '%s-%s.prof' % (
+                    op.name, timeutils.utcnow().strftime('%Y%m%d%H%M%S%f')))
+            try:
+                profiler.dump_stats(path)
+                LOG.warning("Profile of %(name)s saved to %(path)s",
+                            {'name': op.name, 'path': path})
+            except (IOError, OSError) as e:
+                LOG.warning("Failed to save profile of %(name)s: %(err)s",
+                            {'name': op.name, 'err': e})
+
+    def snapshot(self):
+        """Return the recorded histograms keyed by operation."""
+        operations = {}
+        for (name, phase), histogram in self.latencies.snapshot().items():
+            operations.setdefault(name, {}).setdefault(
+                'latency', {})[phase] = histogram
+        for name, histogram in self.statements.snapshot().items():
+            operations.setdefault(name, {})['db_statements'] = histogram
+        return operations
+
+    def _maybe_dump(self):
+        now = timeutils.now()
+        if not self.dump_file or now - self._last_dump < self.dump_interval:
+            return
+        self._last_dump = now
+        self.dump()
+
+    def dump(self):
+        tmp_file = '%s.tmp' % self.dump_file
+        try:
+            with open(tmp_file, 'w') as f:
+                json.dump(self.snapshot(), f, sort_keys=True)
+            os.rename(tmp_file, self.dump_file)
+        except (IOError, OSError) as e:
+            LOG.warning("Failed to dump Group Policy operation metrics to "
+                        "%(file)s: %(err)s",
+                        {'file': self.dump_file, 'err': e})
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context,
+                           executemany):
+    conn.info.setdefault('gbp_query_start_time', []).append(timeutils.now())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context,
+                          executemany):
+    start_times = conn.info.get('gbp_query_start_time')
+    if start_times:
+        elapsed = timeutils.now() - start_times.pop()
+        if _recorder:
+            _recorder.statement_executed(elapsed)
+
+
+def get_recorder():
+    return _recorder
+
+
+def setup():
+    """Enable the instrumentation if configured, return the recorder."""
+    global _recorder
+    conf = cfg.CONF.group_policy
+    if not conf.api_instrumentation:
+        return None
+    if not _recorder:
+        _recorder = OperationRecorder(
+            dump_file=conf.api_instrumentation_dump_file,
+            dump_interval=conf.api_instrumentation_dump_interval,
+            profile_sample_rate=conf.api_profile_sample_rate,
+            slow_threshold=conf.api_slow_operation_threshold,
+            profile_dir=conf.api_profile_dir)
+        if not sa.event.contains(sa.engine.Engine, 'before_cursor_execute',
+                                 _before_cursor_execute):
+            sa.event.listen(sa.engine.Engine, 'before_cursor_execute',
+                            _before_cursor_execute)
+            sa.event.listen(sa.engine.Engine, 'after_cursor_execute',
+                            _after_cursor_execute)
+        LOG.info("Group Policy operation instrumentation enabled")
+    return _recorder
+
+
+@contextlib.contextmanager
+def phase(name):
+    """Account the enclosed code to a phase of the current operations."""
+    if not _recorder or not name:
+        yield
+        return
+    with _recorder.phase(name):
+        yield
+
+
+def get_driver_phase(method_name):
+    for phase_name in (PHASE_PRECOMMIT, PHASE_POSTCOMMIT, PHASE_STATUS):
+        if method_name.endswith('_' + phase_name):
+            return phase_name
+
+
+def dispatch_phase(phase_name=None):
+    """Account a driver dispatch method to a phase of the operations.
+
+    The decorated method takes the name of the driver method it calls as
+    first argument. Without phase_name, the phase is derived from that name.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, method_name, *args, **kwargs):
+            with phase(phase_name or get_driver_phase(method_name)):
+                return method(self, method_name, *args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _instrument_method(recorder, name, method):
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        with recorder.operation(name):
+            return method(*args, **kwargs)
+    return wrapper
+
+
+def instrument_plugin(plugin, recorder):
+    """Record the CRUD operations of a plugin instance."""
+    for name in dir(type(plugin)):
+        if not name.startswith(INSTRUMENTED_PREFIXES):
+            continue
+        method = getattr(plugin, name, None)
+        if callable(method):
+            setattr(plugin, name, _instrument_method(recorder, name, method))
@@ -28,6 +28,38 @@ group_policy_opts = [
                        "entrypoints to be loaded from the "
                        "gbpservice.neutron.group_policy.extension_drivers "
                        "namespace.")),
+    cfg.BoolOpt('policy_driver_timing',
+                default=False,
+                help=_("Record per policy driver, per method latency "
+                       "histograms for the calls made by the policy "
+                       "driver manager.")),
+    cfg.BoolOpt('api_instrumentation',
+                default=False,
+                help=_("Record per operation and per phase (DB, policy "
+                       "driver precommit, postcommit and status, extension "
+                       "drivers) latency histograms and DB statement counts "
+                       "for the Group Policy plugin operations.")),
+    cfg.StrOpt('api_instrumentation_dump_file',
+               help=_("File to which the Group Policy operation metrics "
+                      "are periodically dumped as JSON, when "
+                      "api_instrumentation is enabled.")),
+    cfg.IntOpt('api_instrumentation_dump_interval',
+               default=60,
+               help=_("Minimum interval, in seconds, between dumps of the "
+                      "Group Policy operation metrics.")),
+    cfg.FloatOpt('api_slow_operation_threshold',
+                 help=_("Duration, in seconds, above which a Group Policy "
+                        "operation is logged as slow, when "
+                        "api_instrumentation is enabled.")),
+    cfg.FloatOpt('api_profile_sample_rate',
+                 default=0.0, min=0.0, max=1.0,
+                 help=_("Fraction of the Group Policy operations run under "
+                        "cProfile. The profiles of the sampled operations "
+                        "slower than api_slow_operation_threshold are saved "
+                        "to api_profile_dir.")),
+    cfg.StrOpt('api_profile_dir',
+               help=_("Directory to which the profiles of slow Group "
+                      "Policy operations are saved.")),
 ]
 
 
@@ -10,6 +10,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+
 from keystoneclient import exceptions as k_exceptions
 from keystoneclient.v2_0 import client as k_client
 from neutron_lib.db import model_base
@@ -628,72 +630,148 @@ class ChainMappingDriver(api.PolicyDriver, local_api.LocalAPI,
     # classifier ID.
     def _handle_redirect_action(self, context, policy_rule_set_ids,
                                 providing_ptg=None):
+        plugin_context = context._plugin_context
         policy_rule_sets = context._plugin.get_policy_rule_sets(
-            context._plugin_context, filters={'id': policy_rule_set_ids})
+            plugin_context, filters={'id': policy_rule_set_ids})
+        if not policy_rule_sets:
+            return
+        # Read all the parents, rules, redirect actions and providers
+        # involved at once.
+        parent_ids = set(prs['parent_id'] for prs in policy_rule_sets
+                         if prs['parent_id'])
+        parents = {}
+        if parent_ids:
+            parents = dict((x['id'], x) for x in
+                           context._plugin.get_policy_rule_sets(
+                               plugin_context,
+                               filters={'id': list(parent_ids)}))
+        policy_rule_ids = set()
+        for prs in policy_rule_sets + list(parents.values()):
+            policy_rule_ids.update(prs['policy_rules'])
+        policy_rules = {}
+        if policy_rule_ids:
+            policy_rules = dict((x['id'], x) for x in
+                                context._plugin.get_policy_rules(
+                                    plugin_context,
+                                    filters={'id': list(policy_rule_ids)}))
+        policy_action_ids = set()
+        for policy_rule in policy_rules.values():
+            policy_action_ids.update(policy_rule['policy_actions'])
+        redirect_actions = {}
+        if policy_action_ids:
+            redirect_actions = dict(
+                (x['id'], x) for x in context._plugin.get_policy_actions(
+                    plugin_context,
+                    filters={'id': list(policy_action_ids),
+                             'action_type': [gconst.GP_ACTION_REDIRECT]}))
+
+        def get_redirect_actions(prs):
+            return [(policy_rules[pr_id],
+                     [redirect_actions[x] for x in
+                      policy_rules[pr_id]['policy_actions']
+                      if x in redirect_actions])
+                    for pr_id in prs['policy_rules'] if pr_id in policy_rules]
+
+        # Only one Redirect action per PRS. The chain may belong to
+        # another PRS in which case the chain should not be deleted
+        redirect_in_prss = any(actions for prs in policy_rule_sets
+                               for _, actions in get_redirect_actions(prs))
+        if providing_ptg:
+            providers = {providing_ptg['id']: providing_ptg}
+        else:
+            provider_ids = set()
+            for prs in policy_rule_sets:
+                provider_ids.update(prs['providing_policy_target_groups'])
+            providers = {}
+            if provider_ids:
+                providers = dict(
+                    (x['id'], x) for x in
+                    context._plugin.get_policy_target_groups(
+                        plugin_context.elevated(),
+                        {'id': list(provider_ids)}))
+
+        # Compute the resulting chain of each provider, the last rule
+        # processed for a provider determines it.
+        chains = collections.OrderedDict()
         for policy_rule_set in policy_rule_sets:
             if providing_ptg:
                 ptgs_providing_prs = [providing_ptg]
             else:
-                if not policy_rule_set['providing_policy_target_groups']:
+                ptgs_providing_prs = [
+                    providers[x] for x in
+                    policy_rule_set['providing_policy_target_groups']
+                    if x in providers]
+                if not ptgs_providing_prs:
                     continue
-                ptgs_providing_prs = context._plugin.get_policy_target_groups(
-                    context._plugin_context.elevated(),
-                    {'id': policy_rule_set['providing_policy_target_groups']})
             parent_classifier_id = None
             parent_spec_id = None
-            if policy_rule_set['parent_id']:
-                parent = context._plugin.get_policy_rule_set(
-                    context._plugin_context, policy_rule_set['parent_id'])
-                policy_rules = context._plugin.get_policy_rules(
-                    context._plugin_context,
-                    filters={'id': parent['policy_rules']})
-                for policy_rule in policy_rules:
-                    policy_actions = context._plugin.get_policy_actions(
-                        context._plugin_context,
-                        filters={'id': policy_rule["policy_actions"],
-                                 'action_type': [gconst.GP_ACTION_REDIRECT]})
+            parent = parents.get(policy_rule_set['parent_id'])
+            if parent:
+                for policy_rule, policy_actions in get_redirect_actions(
+                        parent):
                     if policy_actions:
                         parent_spec_id = policy_actions[0].get("action_value")
                         parent_classifier_id = policy_rule.get(
                             "policy_classifier_id")
                         break  # only one redirect action is supported
-            policy_rules = context._plugin.get_policy_rules(
-                    context._plugin_context,
-                    filters={'id': policy_rule_set['policy_rules']})
-            for policy_rule in policy_rules:
+            for policy_rule, policy_actions in get_redirect_actions(
+                    policy_rule_set):
                 hierarchial_classifier_mismatch = False
                 classifier_id = policy_rule.get("policy_classifier_id")
                 if parent_classifier_id and (parent_classifier_id !=
                                              classifier_id):
                     hierarchial_classifier_mismatch = True
-                policy_actions = context._plugin.get_policy_actions(
-                        context._plugin_context,
-                        filters={'id': policy_rule.get("policy_actions"),
-                                 'action_type': [gconst.GP_ACTION_REDIRECT]})
-                # Only one Redirect action per PRS. The chain may belong to
-                # another PRS in which case the chain should not be deleted
-                if (self._is_redirect_in_policy_rule_sets(
-                    context, policy_rule_set_ids) and not policy_actions):
+                if redirect_in_prss and not policy_actions:
                     continue
                 spec_id = (policy_actions and
                            policy_actions[0]['action_value'] or None)
                 for ptg_providing_prs in ptgs_providing_prs:
-                    # REVISIT(Magesh): There are concurrency issues here with
-                    # concurrent updates to the same PRS, Policy Rule or Action
-                    # value
                     if self._is_group_chainable(context, ptg_providing_prs):
-                        self._create_or_update_chain(
-                            context, ptg_providing_prs['id'],
-                            SCI_CONSUMER_NOT_AVAILABLE, spec_id,
-                            parent_spec_id, classifier_id,
-                            hierarchial_classifier_mismatch,
-                            policy_rule_set)
+                        chains.pop(ptg_providing_prs['id'], None)
+                        chains[ptg_providing_prs['id']] = (
+                            spec_id, parent_spec_id, classifier_id,
+                            hierarchial_classifier_mismatch, policy_rule_set)
+        if not chains:
+            return
+
+        # Apply only the chains that changed.
+        ptg_chain_maps = {}
+        for ptg_chain_map in self._get_ptg_servicechain_mapping(
+                plugin_context.session, provider_ptg_ids=list(chains)):
+            ptg_chain_maps.setdefault(ptg_chain_map.provider_ptg_id,
+                                      []).append(ptg_chain_map)
+        instances = {}
+        if ptg_chain_maps:
+            instances = dict(
+                (x['id'], x) for x in
+                self._servicechain_plugin.get_servicechain_instances(
+                    plugin_context.elevated(),
+                    filters={'id': [x[0].servicechain_instance_id
+                                    for x in ptg_chain_maps.values()]}))
+        for provider_id, chain in chains.items():
+            # REVISIT(Magesh): There are concurrency issues here with
+            # concurrent updates to the same PRS, Policy Rule or Action
+            # value
+            ptg_chain_map = ptg_chain_maps.get(provider_id, [])
+            instance = None
+            if ptg_chain_map:
+                instance = instances.get(
+                    ptg_chain_map[0].servicechain_instance_id)
+            (spec_id, parent_spec_id, classifier_id,
+             hierarchial_classifier_mismatch, policy_rule_set) = chain
+            self._create_or_update_chain(
+                context, provider_id, SCI_CONSUMER_NOT_AVAILABLE, spec_id,
+                parent_spec_id, classifier_id,
+                hierarchial_classifier_mismatch, policy_rule_set,
+                ptg_chain_map=ptg_chain_map, instance=instance)
 
     def _create_or_update_chain(self, context, provider, consumer, spec_id,
                                 parent_spec_id, classifier_id,
-                                hierarchial_classifier_mismatch, prs_id):
-        ptg_chain_map = self._get_ptg_servicechain_mapping(
-            context._plugin_context.session, provider)
+                                hierarchial_classifier_mismatch, prs_id,
+                                ptg_chain_map=None, instance=None):
+        if ptg_chain_map is None:
+            ptg_chain_map = self._get_ptg_servicechain_mapping(
+                context._plugin_context.session, provider)
         if ptg_chain_map:
             if hierarchial_classifier_mismatch or not spec_id:
                 ctx = self._get_chain_admin_context(
@@ -705,6 +783,12 @@ class ChainMappingDriver(api.PolicyDriver, local_api.LocalAPI,
                 sc_specs = [spec_id]
                 if parent_spec_id:
                     sc_specs.insert(0, parent_spec_id)
+                if (instance and
+                        instance['servicechain_specs'] == sc_specs and
+                        instance['classifier_id'] == classifier_id):
+                    LOG.debug("Servicechain instance %s is up to date",
+                              instance['id'])
+                    return
                 # One chain per providing PTG
                 self._update_servicechain_instance(
                     context._plugin_context,
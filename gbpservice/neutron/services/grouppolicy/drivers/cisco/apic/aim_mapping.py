@@ -730,6 +730,39 @@ class AIMMappingDriver(nrd.CommonNeutronBase, aim_rpc.AIMMappingRPCMixin):
             self._use_implicit_port(context, subnets=subnets)
         self._associate_fip_to_pt(context)
 
+    @log.log_method_call
+    def create_policy_target_bulk_precommit(self, contexts):
+        ptgs = {}
+        for context in contexts:
+            ptg_id = context.current['policy_target_group_id']
+            if ptg_id not in ptgs:
+                ptgs[ptg_id] = self._get_policy_target_group(
+                    context._plugin_context, ptg_id)
+                policy.enforce(context._plugin_context,
+                               'get_policy_target_group', ptgs[ptg_id],
+                               pluralized='policy_target_groups')
+            context.ptg = ptgs[ptg_id]
+            if context.current['port_id']:
+                # Explicit port case.
+                port_context = self.aim_mech_driver.make_port_context(
+                    context._plugin_context, context.current['port_id'])
+                self.aim_mech_driver.associate_domain(port_context)
+
+    @log.log_method_call
+    def create_policy_target_bulk_postcommit(self, contexts):
+        implicit = [context for context in contexts
+                    if not context.current['port_id']]
+        if implicit:
+            subnets_by_ptg = {}
+            for context in implicit:
+                if context.ptg['id'] not in subnets_by_ptg:
+                    subnets_by_ptg[context.ptg['id']] = self._get_subnets(
+                        context._plugin_context,
+                        {'id': context.ptg['subnets']})
+            self._use_implicit_ports(implicit, subnets_by_ptg=subnets_by_ptg)
+        for context in contexts:
+            self._associate_fip_to_pt(context)
+
     @log.log_method_call
     def update_policy_target_precommit(self, context):
         pass
@@ -1883,10 +1916,11 @@ class AIMMappingDriver(nrd.CommonNeutronBase, aim_rpc.AIMMappingRPCMixin):
     def _process_subnets_for_ptg_delete(self, context, subnet_ids, router_ids):
         plugin_context = context._plugin_context
         if subnet_ids:
+            ptgs_by_subnet = context._plugin._get_ptgs_for_subnets(
+                plugin_context, subnet_ids)
             for subnet_id in subnet_ids:
                 # Clean-up subnet if this is the last PTG using the L2P.
-                if not context._plugin._get_ptgs_for_subnet(
-                        plugin_context, subnet_id):
+                if not ptgs_by_subnet.get(subnet_id):
                     for router_id in router_ids:
                         # If the subnet interface for this router has
                         # already been removed (say manually), the
@@ -2289,6 +2323,14 @@ class AIMMappingDriver(nrd.CommonNeutronBase, aim_rpc.AIMMappingRPCMixin):
         super(AIMMappingDriver, self)._use_implicit_port(
                 context, subnets=subnets)
 
+    def _use_implicit_ports(self, contexts, subnets_by_ptg=None):
+        for tenant_id in set([context.current['tenant_id']
+                              for context in contexts]):
+            self._create_default_security_group(
+                contexts[0]._plugin_context, tenant_id)
+        super(AIMMappingDriver, self)._use_implicit_ports(
+            contexts, subnets_by_ptg=subnets_by_ptg)
+
     def _handle_create_network_service_policy(self, context):
         self._validate_nat_pool_for_nsp(context)
         self._handle_network_service_policy(context)
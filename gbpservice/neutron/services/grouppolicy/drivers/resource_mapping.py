@@ -433,9 +433,12 @@ class ImplicitResourceOperations(local_api.LocalAPI,
             context, subnet_id)
 
     def _get_l3p_allocated_subnets(self, context, l3p_id):
-        ptgs = context._plugin._get_l3p_ptgs(
+        subnets = context._plugin._get_l3p_subnet_ids(
             context._plugin_context.elevated(), l3p_id)
-        return self._get_ptg_cidrs(context, None, ptg_dicts=ptgs)
+        if not subnets:
+            return []
+        return [x['cidr'] for x in self._get_subnets(
+            context._plugin_context.elevated(), {'id': subnets})]
 
     def _validate_and_add_subnet(self, context, subnet, l3p_id):
         subnet_id = subnet['id']
@@ -443,11 +446,8 @@ class ImplicitResourceOperations(local_api.LocalAPI,
         with session.begin(subtransactions=True):
             LOG.debug("starting validate_and_add_subnet transaction for "
                       "subnet %s", subnet_id)
-            ptgs = context._plugin._get_l3p_ptgs(
-                context._plugin_context.elevated(), l3p_id)
             allocated = netaddr.IPSet(
-                iterable=self._get_ptg_cidrs(context, None,
-                                             ptg_dicts=ptgs))
+                iterable=self._get_l3p_allocated_subnets(context, l3p_id))
             cidr = subnet['cidr']
             if cidr in allocated:
                 LOG.debug("CIDR %s in-use for L3P %s, allocated: %s",
@@ -703,19 +703,8 @@ class ImplicitResourceOperations(local_api.LocalAPI,
                 if alt_subnet:
                     fixed_ips.append({'subnet_id': alt_subnet['id']})
                 try:
-                    attrs = {'tenant_id': context.current['tenant_id'],
-                             'name': 'pt_' + context.current['name'],
-                             'network_id': l2p['network_id'],
-                             'mac_address': n_const.ATTR_NOT_SPECIFIED,
-                             'fixed_ips': fixed_ips,
-                             'device_id': '',
-                             'device_owner': '',
-                             'security_groups': [sg_id] if sg_id else None,
-                             'admin_state_up': True}
-                    if context.current.get('group_default_gateway'):
-                        attrs['fixed_ips'][0]['ip_address'] = subnet[
-                            'gateway_ip']
-                    attrs.update(context.current.get('port_attributes', {}))
+                    attrs = self._get_implicit_port_attrs(
+                        context, l2p, sg_id, fixed_ips, subnet)
                     port = self._create_port(context._plugin_context, attrs)
                     port_id = port['id']
                     self._mark_port_owned(context._plugin_context.session,
@@ -728,6 +717,70 @@ class ImplicitResourceOperations(local_api.LocalAPI,
                     last = ex
         raise last
 
+    def _get_implicit_port_attrs(self, context, l2p, sg_id, fixed_ips,
+                                 subnet):
+        attrs = {'tenant_id': context.current['tenant_id'],
+                 'name': 'pt_' + context.current['name'],
+                 'network_id': l2p['network_id'],
+                 'mac_address': n_const.ATTR_NOT_SPECIFIED,
+                 'fixed_ips': fixed_ips,
+                 'device_id': '',
+                 'device_owner': '',
+                 'security_groups': [sg_id] if sg_id else None,
+                 'admin_state_up': True}
+        if context.current.get('group_default_gateway'):
+            attrs['fixed_ips'][0]['ip_address'] = subnet['gateway_ip']
+        attrs.update(context.current.get('port_attributes', {}))
+        return attrs
+
+    def _use_implicit_ports(self, contexts, subnets_by_ptg=None):
+        # Bulk version of _use_implicit_port. The implicit ports of the
+        # policy targets sharing a policy target group (and tenant) are
+        # created with a single bulk port create on the group's first
+        # subnet(s). If that fails because the subnet ran out of
+        # addresses, we fall back to the per port allocation which tries
+        # each of the group's subnets in turn.
+        subnets_by_ptg = subnets_by_ptg or {}
+        batches = {}
+        for context in contexts:
+            key = (context.current['policy_target_group_id'],
+                   context.current['tenant_id'])
+            batches.setdefault(key, []).append(context)
+        for (ptg_id, tenant_id), batch in batches.items():
+            plugin_context = batch[0]._plugin_context
+            ptg = batch[0]._plugin.get_policy_target_group(
+                plugin_context, ptg_id)
+            l2p = batch[0]._plugin.get_l2_policy(
+                plugin_context, ptg['l2_policy_id'])
+            sg_id = self._get_default_security_group(
+                plugin_context, ptg_id, tenant_id)
+            subnets = subnets_by_ptg.get(ptg_id) or self._get_subnets(
+                plugin_context, {'id': ptg['subnets']})
+            if not subnets:
+                raise exc.NoSubnetAvailable()
+            subnet = subnets[0]
+            alt_subnets = [alt for alt in subnets
+                           if alt['ip_version'] != subnet['ip_version']]
+            attrs_list = []
+            for context in batch:
+                fixed_ips = [{'subnet_id': subnet['id']}]
+                if alt_subnets:
+                    fixed_ips.append({'subnet_id': alt_subnets[0]['id']})
+                attrs_list.append(self._get_implicit_port_attrs(
+                    context, l2p, sg_id, fixed_ips, subnet))
+            try:
+                ports = self._create_ports(plugin_context, attrs_list)
+            except n_exc.IpAddressGenerationFailure:
+                LOG.warning("Not enough addresses available in subnet %s "
+                            "for bulk port creation, allocating ports "
+                            "individually", subnet['id'])
+                for context in batch:
+                    self._use_implicit_port(context, subnets=subnets)
+                continue
+            for context, port in zip(batch, ports):
+                self._mark_port_owned(plugin_context.session, port['id'])
+                context.set_port_id(port['id'])
+
     def _cleanup_port(self, plugin_context, port_id):
         if self._port_is_owned(plugin_context.session, port_id):
             try:
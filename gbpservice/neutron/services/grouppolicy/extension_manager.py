@@ -17,7 +17,9 @@ from oslo_log import log
 from oslo_utils import excutils
 import stevedore
 
+from gbpservice.common import utils as gbp_utils
 from gbpservice.neutron.services.grouppolicy.common import exceptions as gp_exc
+from gbpservice.neutron.services.grouppolicy.common import instrumentation
 
 
 LOG = log.getLogger(__name__)
@@ -67,6 +69,48 @@ class ExtensionManager(stevedore.named.NamedExtensionManager):
                      {'alias': alias, 'drv': driver.name})
         return exts
 
+    def _get_driver_attributes(self, driver, resource_name):
+        # Returns the attributes that the driver adds to the resource, or
+        # None if the driver does not declare its extended attributes.
+        extension_dict = getattr(driver.obj, '_extension_dict', None)
+        if extension_dict is None:
+            return
+        return set(extension_dict.get(
+            gbp_utils.get_resource_plural(resource_name), {}))
+
+    def get_extended_attributes(self, resource_name):
+        """Return the attributes added to a resource by extension drivers.
+
+        Returns None if any of the drivers does not declare the
+        attributes it adds, in which case all of them have to be called.
+        """
+        extended_attributes = set()
+        for driver in self.ordered_ext_drivers:
+            attributes = self._get_driver_attributes(driver, resource_name)
+            if attributes is None:
+                return
+            extended_attributes |= attributes
+        return extended_attributes
+
+    @instrumentation.dispatch_phase(instrumentation.PHASE_EXTENSION)
+    def _call_on_extend_dict_drivers(self, method_name, resource_name,
+                                     session, result, fields=None):
+        """Helper method for extending a resource dictionary.
+
+        If fields are specified, only the drivers that add any of the
+        requested fields (or do not declare the attributes they add)
+        are called.
+        """
+        for driver in self.ordered_ext_drivers:
+            if fields:
+                attributes = self._get_driver_attributes(driver,
+                                                         resource_name)
+                if attributes is not None and not attributes.intersection(
+                        fields):
+                    continue
+            getattr(driver.obj, method_name)(session, result)
+
+    @instrumentation.dispatch_phase(instrumentation.PHASE_EXTENSION)
     def _call_on_ext_drivers(self, method_name, session, data, result):
         """Helper method for calling a method across all extension drivers."""
         for driver in self.ordered_ext_drivers:
@@ -96,10 +140,11 @@ class ExtensionManager(stevedore.named.NamedExtensionManager):
         self._call_on_ext_drivers("process_update_policy_target",
                                   session, data, result)
 
-    def extend_policy_target_dict(self, session, result):
+    def extend_policy_target_dict(self, session, result, fields=None):
         """Call all extension drivers to extend PT dictionary."""
-        for driver in self.ordered_ext_drivers:
-            driver.obj.extend_policy_target_dict(session, result)
+        self._call_on_extend_dict_drivers(
+            "extend_policy_target_dict", "policy_target",
+            session, result, fields)
 
     def process_create_policy_target_group(self, session, data, result):
         """Call all extension drivers during PTG creation."""
@@ -111,10 +156,11 @@ class ExtensionManager(stevedore.named.NamedExtensionManager):
         self._call_on_ext_drivers("process_update_policy_target_group",
                                   session, data, result)
 
-    def extend_policy_target_group_dict(self, session, result):
+    def extend_policy_target_group_dict(self, session, result, fields=None):
         """Call all extension drivers to extend PTG dictionary."""
-        for driver in self.ordered_ext_drivers:
-            driver.obj.extend_policy_target_group_dict(session, result)
+        self._call_on_extend_dict_drivers(
+            "extend_policy_target_group_dict", "policy_target_group",
+            session, result, fields)
 
     def process_create_application_policy_group(self, session, data, result):
         """Call all extension drivers during PTG creation."""
@@ -126,10 +172,12 @@ class ExtensionManager(stevedore.named.NamedExtensionManager):
         self._call_on_ext_drivers("process_update_application_policy_group",
                                   session, data, result)
 
-    def extend_application_policy_group_dict(self, session, result):
+    def extend_application_policy_group_dict(self, session, result,
+                                             fields=None):
         """Call all extension drivers to extend PTG dictionary."""
-        for driver in self.ordered_ext_drivers:
-            driver.obj.extend_application_policy_group_dict(session, result)
+        self._call_on_extend_dict_drivers(
+            "extend_application_policy_group_dict", "application_policy_group",
+            session, result, fields)
 
     def process_create_l2_policy(self, session, data, result):
         """Call all extension drivers during L2P creation."""
@@ -141,10 +189,10 @@ class ExtensionManager(stevedore.named.NamedExtensionManager):
         self._call_on_ext_drivers("process_update_l2_policy",
                                   session, data, result)
 
-    def extend_l2_policy_dict(self, session, result):
+    def extend_l2_policy_dict(self, session, result, fields=None):
         """Call all extension drivers to extend L2P dictionary."""
-        for driver in self.ordered_ext_drivers:
-            driver.obj.extend_l2_policy_dict(session, result)
+        self._call_on_extend_dict_drivers("extend_l2_policy_dict", "l2_policy",
+                                          session, result, fields)
 
     def process_create_l3_policy(self, session, data, result):
         """Call all extension drivers during L3P creation."""
@@ -156,10 +204,10 @@ class ExtensionManager(stevedore.named.NamedExtensionManager):
         self._call_on_ext_drivers("process_update_l3_policy",
                                   session, data, result)
 
-    def extend_l3_policy_dict(self, session, result):
+    def extend_l3_policy_dict(self, session, result, fields=None):
         """Call all extension drivers to extend L3P dictionary."""
-        for driver in self.ordered_ext_drivers:
-            driver.obj.extend_l3_policy_dict(session, result)
+        self._call_on_extend_dict_drivers("extend_l3_policy_dict", "l3_policy",
+                                          session, result, fields)
 
     def process_create_policy_classifier(self, session, data, result):
         """Call all extension drivers during PC creation."""
@@ -171,10 +219,11 @@ class ExtensionManager(stevedore.named.NamedExtensionManager):
         self._call_on_ext_drivers("process_update_policy_classifier",
                                   session, data, result)
 
-    def extend_policy_classifier_dict(self, session, result):
+    def extend_policy_classifier_dict(self, session, result, fields=None):
         """Call all extension drivers to extend PC dictionary."""
-        for driver in self.ordered_ext_drivers:
-            driver.obj.extend_policy_classifier_dict(session, result)
+        self._call_on_extend_dict_drivers(
+            "extend_policy_classifier_dict", "policy_classifier",
+            session, result, fields)
 
     def process_create_policy_action(self, session, data, result):
         """Call all extension drivers during PA creation."""
@@ -186,10 +235,11 @@ class ExtensionManager(stevedore.named.NamedExtensionManager):
         self._call_on_ext_drivers("process_update_policy_action",
                                   session, data, result)
 
-    def extend_policy_action_dict(self, session, result):
+    def extend_policy_action_dict(self, session, result, fields=None):
         """Call all extension drivers to extend PA dictionary."""
-        for driver in self.ordered_ext_drivers:
-            driver.obj.extend_policy_action_dict(session, result)
+        self._call_on_extend_dict_drivers(
+            "extend_policy_action_dict", "policy_action",
+            session, result, fields)
 
     def process_create_policy_rule(self, session, data, result):
         """Call all extension drivers during PR creation."""
@@ -201,10 +251,11 @@ class ExtensionManager(stevedore.named.NamedExtensionManager):
         self._call_on_ext_drivers("process_update_policy_rule",
                                   session, data, result)
 
-    def extend_policy_rule_dict(self, session, result):
+    def extend_policy_rule_dict(self, session, result, fields=None):
         """Call all extension drivers to extend PR dictionary."""
-        for driver in self.ordered_ext_drivers:
-            driver.obj.extend_policy_rule_dict(session, result)
+        self._call_on_extend_dict_drivers(
+            "extend_policy_rule_dict", "policy_rule",
+            session, result, fields)
 
     def process_create_policy_rule_set(self, session, data, result):
         """Call all extension drivers during PRS creation."""
@@ -216,10 +267,11 @@ class ExtensionManager(stevedore.named.NamedExtensionManager):
         self._call_on_ext_drivers("process_update_policy_rule_set",
                                   session, data, result)
 
-    def extend_policy_rule_set_dict(self, session, result):
+    def extend_policy_rule_set_dict(self, session, result, fields=None):
         """Call all extension drivers to extend PRS dictionary."""
-        for driver in self.ordered_ext_drivers:
-            driver.obj.extend_policy_rule_set_dict(session, result)
+        self._call_on_extend_dict_drivers(
+            "extend_policy_rule_set_dict", "policy_rule_set",
+            session, result, fields)
 
     def process_create_network_service_policy(self, session, data, result):
         """Call all extension drivers during NSP creation."""
@@ -231,10 +283,11 @@ class ExtensionManager(stevedore.named.NamedExtensionManager):
         self._call_on_ext_drivers("process_update_network_service_policy",
                                   session, data, result)
 
-    def extend_network_service_policy_dict(self, session, result):
+    def extend_network_service_policy_dict(self, session, result, fields=None):
         """Call all extension drivers to extend NSP dictionary."""
-        for driver in self.ordered_ext_drivers:
-            driver.obj.extend_network_service_policy_dict(session, result)
+        self._call_on_extend_dict_drivers(
+            "extend_network_service_policy_dict", "network_service_policy",
+            session, result, fields)
 
     def process_create_external_segment(self, session, data, result):
         """Call all extension drivers during EP creation."""
@@ -246,10 +299,11 @@ class ExtensionManager(stevedore.named.NamedExtensionManager):
         self._call_on_ext_drivers("process_update_external_segment",
                                   session, data, result)
 
-    def extend_external_segment_dict(self, session, result):
+    def extend_external_segment_dict(self, session, result, fields=None):
         """Call all extension drivers to extend EP dictionary."""
-        for driver in self.ordered_ext_drivers:
-            driver.obj.extend_external_segment_dict(session, result)
+        self._call_on_extend_dict_drivers(
+            "extend_external_segment_dict", "external_segment",
+            session, result, fields)
 
     def process_create_external_policy(self, session, data, result):
         """Call all extension drivers during EP creation."""
@@ -261,10 +315,11 @@ class ExtensionManager(stevedore.named.NamedExtensionManager):
         self._call_on_ext_drivers("process_update_external_policy",
                                   session, data, result)
 
-    def extend_external_policy_dict(self, session, result):
+    def extend_external_policy_dict(self, session, result, fields=None):
         """Call all extension drivers to extend EP dictionary."""
-        for driver in self.ordered_ext_drivers:
-            driver.obj.extend_external_policy_dict(session, result)
+        self._call_on_extend_dict_drivers(
+            "extend_external_policy_dict", "external_policy",
+            session, result, fields)
 
     def process_create_nat_pool(self, session, data, result):
         """Call all extension drivers during NP creation."""
@@ -276,7 +331,7 @@ class ExtensionManager(stevedore.named.NamedExtensionManager):
         self._call_on_ext_drivers("process_update_nat_pool",
                                   session, data, result)
 
-    def extend_nat_pool_dict(self, session, result):
+    def extend_nat_pool_dict(self, session, result, fields=None):
         """Call all extension drivers to extend NP dictionary."""
-        for driver in self.ordered_ext_drivers:
-            driver.obj.extend_nat_pool_dict(session, result)
+        self._call_on_extend_dict_drivers("extend_nat_pool_dict", "nat_pool",
+                                          session, result, fields)
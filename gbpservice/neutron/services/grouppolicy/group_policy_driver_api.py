@@ -597,6 +597,35 @@ class PolicyDriver(object):
         """
         pass
 
+    def create_policy_target_bulk_precommit(self, contexts):
+        """Allocate resources for a batch of new policy_targets.
+
+        :param contexts: list of PolicyTargetContext instances describing the
+        new policy_targets.
+
+        Called once per bulk create request, within the same
+        transaction as the DB operations for the whole batch. The
+        default implementation calls create_policy_target_precommit for
+        each member of the batch.
+        """
+        for context in contexts:
+            self.create_policy_target_precommit(context)
+
+    def create_policy_target_bulk_postcommit(self, contexts):
+        """Create a batch of policy_targets.
+
+        :param contexts: list of PolicyTargetContext instances describing the
+        new policy_targets.
+
+        Called once per bulk create request, after the transaction
+        has been committed. Drivers which can create the backing
+        resources for the whole batch at once should override this.
+        The default implementation calls create_policy_target_postcommit
+        for each member of the batch.
+        """
+        for context in contexts:
+            self.create_policy_target_postcommit(context)
+
     def update_policy_target_precommit(self, context):
         """Update resources of a policy_target.
 
@@ -657,6 +686,35 @@ class PolicyDriver(object):
         """
         pass
 
+    def create_policy_target_group_bulk_precommit(self, contexts):
+        """Allocate resources for a batch of new policy_target_groups.
+
+        :param contexts: list of PolicyTargetGroupContext instances
+        describing the new policy_target_groups.
+
+        Called once per bulk create request, within the same
+        transaction as the DB operations for the whole batch. The
+        default implementation calls create_policy_target_group_precommit for
+        each member of the batch.
+        """
+        for context in contexts:
+            self.create_policy_target_group_precommit(context)
+
+    def create_policy_target_group_bulk_postcommit(self, contexts):
+        """Create a batch of policy_target_groups.
+
+        :param contexts: list of PolicyTargetGroupContext instances
+        describing the new policy_target_groups.
+
+        Called once per bulk create request, after the transaction
+        has been committed. Drivers which can create the backing
+        resources for the whole batch at once should override this.
+        The default implementation calls create_policy_target_group_postcommit
+        for each member of the batch.
+        """
+        for context in contexts:
+            self.create_policy_target_group_postcommit(context)
+
     def update_policy_target_group_precommit(self, context):
         """Update resources of a policy_target_group.
 
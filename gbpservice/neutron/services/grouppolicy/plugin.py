@@ -38,6 +38,7 @@ from gbpservice.neutron.services.grouppolicy import (
     policy_driver_manager as manager)
 from gbpservice.neutron.services.grouppolicy.common import constants as gp_cts
 from gbpservice.neutron.services.grouppolicy.common import exceptions as gp_exc
+from gbpservice.neutron.services.grouppolicy.common import instrumentation
 from gbpservice.neutron.services.grouppolicy.common import utils
 from gbpservice.neutron.services.servicechain.plugins.ncp import (
     model as ncp_model)
@@ -381,19 +382,42 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
                 context, resource_id, None)
             extend_resources_method = "".join(['extend_', resource_name,
                                                '_dict'])
+            # Invoke drivers only if status attributes are requested
+            status_requested = not fields or STATUS_SET.intersection(
+                set(fields))
             getattr(self.extension_manager, extend_resources_method)(
-                session, result)
+                session, result, fields=None if status_requested else fields)
 
-            # Invoke drivers only if status attributes are requested
-            if not fields or STATUS_SET.intersection(set(fields)):
+            if status_requested:
                 result = self._get_status_from_drivers(
                     context, gbp_context_name, resource_name, resource_id,
                     result)
             return self._fields(result, fields)
 
+    def _get_fields_for_projection(self, resource_name, filters, fields):
+        # Returns the fields to be requested from the DB layer and the
+        # fields to be requested from the extension drivers when listing
+        # resources. When the status attributes are requested, the policy
+        # drivers need the complete resource, so nothing is pushed down.
+        # Otherwise, only the extension drivers owning any of the
+        # requested (or filtered on) attributes are called, and if none
+        # of these is an extended attribute, only the needed columns are
+        # fetched from the DB.
+        if not fields or STATUS_SET.intersection(set(fields)):
+            return None, None
+        ext_fields = set(fields) | set(filters or {})
+        extended_attributes = self.extension_manager.get_extended_attributes(
+            resource_name)
+        if (extended_attributes is None or
+                extended_attributes.intersection(ext_fields)):
+            return None, ext_fields
+        return list(ext_fields | set(['id'])), ext_fields
+
     def _get_resources(self, context, resource_name, gbp_context_name,
                        filters=None, fields=None, sorts=None, limit=None,
                        marker=None, page_reverse=False):
+        db_fields, ext_fields = self._get_fields_for_projection(
+            resource_name, filters, fields)
         # The following is a writer because we do DB write for status
         with db_api.CONTEXT_WRITER.using(context):
             session = context.session
@@ -401,13 +425,14 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
             get_resources_method = "".join(['get_', resource_plural])
             results = getattr(super(GroupPolicyPlugin, self),
                               get_resources_method)(
-                context, filters, None, sorts, limit, marker, page_reverse)
+                context, filters, db_fields, sorts, limit, marker,
+                page_reverse)
             filtered_results = []
             for result in results:
                 extend_resources_method = "".join(['extend_', resource_name,
                                                    '_dict'])
                 getattr(self.extension_manager, extend_resources_method)(
-                    session, result)
+                    session, result, fields=ext_fields)
                 filtered = self._filter_extended_result(result, filters)
                 if filtered:
                     filtered_results.append(filtered)
@@ -444,6 +469,97 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
         super(GroupPolicyPlugin, self).__init__()
         self.extension_manager.initialize()
         self.policy_driver_manager.initialize()
+        self.__native_bulk_support = (
+            self.policy_driver_manager.native_bulk_support)
+        recorder = instrumentation.setup()
+        if recorder:
+            instrumentation.instrument_plugin(self, recorder)
+
+    def _ensure_tenant_bulk(self, context, resources, singular):
+        tenant_ids = set([resource[singular]['tenant_id']
+                          for resource in resources
+                          if 'tenant_id' in resource[singular]])
+        for tenant_id in tenant_ids:
+            self.policy_driver_manager.ensure_tenant(context, tenant_id)
+
+    def _create_resources_bulk(self, context, resource_name,
+                               gbp_context_name, resources,
+                               pre_process=None):
+        # All the DB operations and the precommit calls for the whole
+        # batch are done in a single transaction, and each policy driver
+        # is called once with the contexts of the batch, so that it can
+        # create any backing resources in bulk.
+        resource_plural = gbp_utils.get_resource_plural(resource_name)
+        items = resources[resource_plural]
+        self._ensure_tenant_bulk(context, items, resource_name)
+        policy_contexts = []
+        with db_api.CONTEXT_WRITER.using(context):
+            session = context.session
+            for item in items:
+                if pre_process:
+                    pre_process(item)
+                result = getattr(super(GroupPolicyPlugin, self),
+                                 'create_' + resource_name)(context, item)
+                getattr(self.extension_manager,
+                        'process_create_' + resource_name)(
+                            session, item, result)
+                self._validate_shared_create(
+                    self, context, result, resource_name)
+                policy_contexts.append(getattr(p_context, gbp_context_name)(
+                    self, context, result))
+            getattr(self.policy_driver_manager,
+                    'create_%s_bulk_precommit' % resource_name)(
+                        policy_contexts)
+
+        created_ids = [policy_context.current['id']
+                       for policy_context in policy_contexts]
+        try:
+            getattr(self.policy_driver_manager,
+                    'create_%s_bulk_postcommit' % resource_name)(
+                        policy_contexts)
+        except Exception:
+            with excutils.save_and_reraise_exception():
+                LOG.exception("create_%(res)s_bulk_postcommit failed, "
+                              "deleting %(res)ss %(ids)s",
+                              {'res': resource_name, 'ids': created_ids})
+                for resource_id in created_ids:
+                    try:
+                        getattr(self, 'delete_' + resource_name)(
+                            context, resource_id)
+                    except Exception:
+                        LOG.exception("Failed to delete %(res)s %(id)s",
+                                      {'res': resource_name,
+                                       'id': resource_id})
+
+        results = dict((result['id'], result) for result in getattr(
+            self, 'get_' + resource_plural)(
+                context, filters={'id': created_ids}))
+        return [results[resource_id] for resource_id in created_ids]
+
+    def _create_resources_emulated_bulk(self, context, resource_name,
+                                        resources):
+        # Native bulk support is advertised for the plugin as a whole, but
+        # only the policy targets and policy target groups are created as
+        # a batch. The other resources are created one by one, like the
+        # API does when emulating bulk creates, and the ones already
+        # created are deleted if any of them fails.
+        created = []
+        try:
+            for item in resources[gbp_utils.get_resource_plural(
+                    resource_name)]:
+                created.append(getattr(self, 'create_' + resource_name)(
+                    context, item))
+        except Exception:
+            with excutils.save_and_reraise_exception():
+                for result in reversed(created):
+                    try:
+                        getattr(self, 'delete_' + resource_name)(
+                            context, result['id'])
+                    except Exception:
+                        LOG.exception("Failed to delete %(res)s %(id)s",
+                                      {'res': resource_name,
+                                       'id': result['id']})
+        return created
 
     def _filter_extended_result(self, result, filters):
         filters = filters or {}
@@ -495,6 +611,14 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
 
         return self.get_policy_target(context, result['id'])
 
+    @log.log_method_call
+    @n_utils.transaction_guard
+    @db_api.retry_if_session_inactive()
+    def create_policy_target_bulk(self, context, policy_targets):
+        return self._create_resources_bulk(
+            context, 'policy_target', 'PolicyTargetContext', policy_targets,
+            pre_process=self._add_fixed_ips_to_port_attributes)
+
     @log.log_method_call
     @n_utils.transaction_guard
     @db_api.retry_if_session_inactive()
@@ -591,6 +715,14 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
 
         return self.get_policy_target_group(context, result['id'])
 
+    @log.log_method_call
+    @n_utils.transaction_guard
+    @db_api.retry_if_session_inactive()
+    def create_policy_target_group_bulk(self, context, policy_target_groups):
+        return self._create_resources_bulk(
+            context, 'policy_target_group', 'PolicyTargetGroupContext',
+            policy_target_groups)
+
     @log.log_method_call
     @n_utils.transaction_guard
     @db_api.retry_if_session_inactive()
@@ -741,6 +873,12 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
 
         return self.get_application_policy_group(context, result['id'])
 
+    @log.log_method_call
+    def create_application_policy_group_bulk(self, context,
+                                             application_policy_groups):
+        return self._create_resources_emulated_bulk(
+            context, 'application_policy_group', application_policy_groups)
+
     @log.log_method_call
     @n_utils.transaction_guard
     @db_api.retry_if_session_inactive()
@@ -845,6 +983,11 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
 
         return self.get_l2_policy(context, result['id'])
 
+    @log.log_method_call
+    def create_l2_policy_bulk(self, context, l2_policies):
+        return self._create_resources_emulated_bulk(
+            context, 'l2_policy', l2_policies)
+
     @log.log_method_call
     @n_utils.transaction_guard
     @db_api.retry_if_session_inactive()
@@ -941,6 +1084,12 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
 
         return self.get_network_service_policy(context, result['id'])
 
+    @log.log_method_call
+    def create_network_service_policy_bulk(self, context,
+                                           network_service_policies):
+        return self._create_resources_emulated_bulk(
+            context, 'network_service_policy', network_service_policies)
+
     @log.log_method_call
     @n_utils.transaction_guard
     @db_api.retry_if_session_inactive()
@@ -1043,6 +1192,11 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
 
         return self.get_l3_policy(context, result['id'])
 
+    @log.log_method_call
+    def create_l3_policy_bulk(self, context, l3_policies):
+        return self._create_resources_emulated_bulk(
+            context, 'l3_policy', l3_policies)
+
     @log.log_method_call
     @n_utils.transaction_guard
     @db_api.retry_if_session_inactive()
@@ -1143,6 +1297,11 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
 
         return self.get_policy_classifier(context, result['id'])
 
+    @log.log_method_call
+    def create_policy_classifier_bulk(self, context, policy_classifiers):
+        return self._create_resources_emulated_bulk(
+            context, 'policy_classifier', policy_classifiers)
+
     @log.log_method_call
     @n_utils.transaction_guard
     @db_api.retry_if_session_inactive()
@@ -1238,6 +1397,11 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
 
         return self.get_policy_action(context, result['id'])
 
+    @log.log_method_call
+    def create_policy_action_bulk(self, context, policy_actions):
+        return self._create_resources_emulated_bulk(
+            context, 'policy_action', policy_actions)
+
     @log.log_method_call
     @n_utils.transaction_guard
     @db_api.retry_if_session_inactive()
@@ -1331,6 +1495,11 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
 
         return self.get_policy_rule(context, result['id'])
 
+    @log.log_method_call
+    def create_policy_rule_bulk(self, context, policy_rules):
+        return self._create_resources_emulated_bulk(
+            context, 'policy_rule', policy_rules)
+
     @log.log_method_call
     @n_utils.transaction_guard
     @db_api.retry_if_session_inactive()
@@ -1424,6 +1593,11 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
 
         return self.get_policy_rule_set(context, result['id'])
 
+    @log.log_method_call
+    def create_policy_rule_set_bulk(self, context, policy_rule_sets):
+        return self._create_resources_emulated_bulk(
+            context, 'policy_rule_set', policy_rule_sets)
+
     @log.log_method_call
     @n_utils.transaction_guard
     @db_api.retry_if_session_inactive()
@@ -1520,6 +1694,11 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
 
         return self.get_external_segment(context, result['id'])
 
+    @log.log_method_call
+    def create_external_segment_bulk(self, context, external_segments):
+        return self._create_resources_emulated_bulk(
+            context, 'external_segment', external_segments)
+
     @log.log_method_call
     @n_utils.transaction_guard
     @db_api.retry_if_session_inactive()
@@ -1624,6 +1803,11 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
 
         return self.get_external_policy(context, result['id'])
 
+    @log.log_method_call
+    def create_external_policy_bulk(self, context, external_policies):
+        return self._create_resources_emulated_bulk(
+            context, 'external_policy', external_policies)
+
     @log.log_method_call
     @n_utils.transaction_guard
     @db_api.retry_if_session_inactive()
@@ -1719,6 +1903,11 @@ class GroupPolicyPlugin(group_policy_mapping_db.GroupPolicyMappingDbPlugin):
 
         return self.get_nat_pool(context, result['id'])
 
+    @log.log_method_call
+    def create_nat_pool_bulk(self, context, nat_pools):
+        return self._create_resources_emulated_bulk(
+            context, 'nat_pool', nat_pools)
+
     @log.log_method_call
     @n_utils.transaction_guard
     @db_api.retry_if_session_inactive()
@@ -16,19 +16,30 @@ from oslo_db import exception as oslo_db_excp
 from oslo_log import log
 from oslo_policy import policy as oslo_policy
 from oslo_utils import excutils
+import six
 from sqlalchemy import exc as sqlalchemy_exc
 import stevedore
 
+from gbpservice.common import metrics
 from gbpservice.neutron.db import api as db_api
 from gbpservice.neutron.services.grouppolicy import (
     group_policy_driver_api as api)
 from gbpservice.neutron.services.grouppolicy.common import exceptions as gp_exc
+from gbpservice.neutron.services.grouppolicy.common import instrumentation
 
 
 LOG = log.getLogger(__name__)
 cfg.CONF.import_opt('policy_drivers',
                     'gbpservice.neutron.services.grouppolicy.config',
                     group='group_policy')
+cfg.CONF.import_opt('policy_driver_timing',
+                    'gbpservice.neutron.services.grouppolicy.config',
+                    group='group_policy')
+
+# Suffixes of the PolicyDriver methods that are no-ops in the base class,
+# and hence need not be called on drivers not overriding them.
+HOOK_SUFFIXES = ('_precommit', '_postcommit', '_status')
+BULK_INFIX = '_bulk_'
 
 
 class PolicyDriverManager(stevedore.named.NamedExtensionManager):
@@ -69,6 +80,12 @@ class PolicyDriverManager(stevedore.named.NamedExtensionManager):
         # the order in which the drivers are called.
         self.ordered_policy_drivers = []
         self.reverse_ordered_policy_drivers = []
+        # Drivers implementing each hook method, in calling order, keyed
+        # by method name. Built at initialize().
+        self.hook_drivers = {}
+        # Per driver, per method latency histograms, keyed by
+        # (driver name, method name).
+        self.driver_timings = None
 
         LOG.info("Configured policy driver names: %s",
                  cfg.CONF.group_policy.policy_drivers)
@@ -96,16 +113,82 @@ class PolicyDriverManager(stevedore.named.NamedExtensionManager):
 
     def initialize(self):
         # Group Policy bulk operations requires each driver to support them.
-        # However, this is currently not supported at the plugin level,
-        # so setting it to False. When the plugin does support it, we can
-        # set it to True such that the drivers can override it.
-        self.native_bulk_support = False
+        # Drivers derived from api.PolicyDriver inherit bulk hooks which
+        # fall back to the per-resource hooks, so they support bulk unless
+        # they explicitly set native_bulk_support to False.
+        self.native_bulk_support = True
         for driver in self.ordered_policy_drivers:
             LOG.info("Initializing policy driver '%s'", driver.name)
             driver.obj.initialize()
-            self.native_bulk_support &= getattr(driver.obj,
-                                                'native_bulk_support', True)
-
+            self.native_bulk_support &= (
+                isinstance(driver.obj, api.PolicyDriver) and
+                getattr(driver.obj, 'native_bulk_support', True))
+        LOG.info("Policy drivers native bulk support: %s",
+                 self.native_bulk_support)
+        self._register_hook_drivers()
+        if cfg.CONF.group_policy.policy_driver_timing:
+            self.driver_timings = metrics.HistogramRegistry()
+
+    @staticmethod
+    def _driver_implements(driver, method_name):
+        # Drivers not derived from api.PolicyDriver, and methods not
+        # defined by it, are always called.
+        if not isinstance(driver.obj, api.PolicyDriver):
+            return True
+        base_method = getattr(api.PolicyDriver, method_name, None)
+        if not base_method or method_name in vars(driver.obj):
+            return True
+        method = getattr(type(driver.obj), method_name)
+        return (six.get_unbound_function(method) is not
+                six.get_unbound_function(base_method))
+
+    def _register_hook_drivers(self):
+        """Register the drivers implementing each hook method.
+
+        The base PolicyDriver hooks are no-ops, so only the drivers that
+        override a hook need to be called for it. The base bulk hooks
+        call the per-resource hooks, so a driver implements a bulk hook
+        if it overrides either of them.
+        """
+        self.hook_drivers = {}
+        for method_name in dir(api.PolicyDriver):
+            if not method_name.endswith(HOOK_SUFFIXES):
+                continue
+            drivers = (self.ordered_policy_drivers if not
+                       method_name.startswith('delete') else
+                       self.reverse_ordered_policy_drivers)
+            method_names = [method_name]
+            if BULK_INFIX in method_name:
+                method_names.append(method_name.replace(BULK_INFIX, '_'))
+            self.hook_drivers[method_name] = [
+                driver for driver in drivers
+                if any(self._driver_implements(driver, name)
+                       for name in method_names)]
+        LOG.debug("Registered policy drivers per hook: %s",
+                  dict((method_name, [driver.name for driver in drivers])
+                       for method_name, drivers in self.hook_drivers.items()))
+
+    def get_driver_timings(self):
+        """Return the latency histograms of the policy driver calls.
+
+        Returns a dictionary keyed by driver name, whose values are
+        dictionaries of histograms keyed by method name. Empty unless the
+        policy_driver_timing option is enabled.
+        """
+        timings = {}
+        if self.driver_timings:
+            for (name, method_name), histogram in (
+                    self.driver_timings.snapshot().items()):
+                timings.setdefault(name, {})[method_name] = histogram
+        return timings
+
+    def _call_on_driver(self, driver, method_name, context):
+        if not self.driver_timings:
+            return getattr(driver.obj, method_name)(context)
+        with self.driver_timings.timed((driver.name, method_name)):
+            return getattr(driver.obj, method_name)(context)
+
+    @instrumentation.dispatch_phase()
     def _call_on_drivers(self, method_name, context=None,
                          continue_on_failure=False):
         """Helper method for calling a method across all policy drivers.
@@ -118,9 +201,11 @@ class PolicyDriverManager(stevedore.named.NamedExtensionManager):
         if any policy driver call fails.
         """
         error = False
-        drivers = (self.ordered_policy_drivers if not
-                   method_name.startswith('delete') else
-                   self.reverse_ordered_policy_drivers)
+        drivers = self.hook_drivers.get(method_name)
+        if drivers is None:
+            drivers = (self.ordered_policy_drivers if not
+                       method_name.startswith('delete') else
+                       self.reverse_ordered_policy_drivers)
         if method_name == 'start_rpc_listeners':
             servers = []
         for driver in drivers:
@@ -130,7 +215,7 @@ class PolicyDriverManager(stevedore.named.NamedExtensionManager):
                     if server:
                         servers.extend(server)
                 else:
-                    getattr(driver.obj, method_name)(context)
+                    self._call_on_driver(driver, method_name, context)
             except Exception as e:
                 if db_api.is_retriable(e):
                     with excutils.save_and_reraise_exception():
@@ -191,6 +276,14 @@ class PolicyDriverManager(stevedore.named.NamedExtensionManager):
     def create_policy_target_postcommit(self, context):
         self._call_on_drivers("create_policy_target_postcommit", context)
 
+    def create_policy_target_bulk_precommit(self, contexts):
+        self._call_on_drivers("create_policy_target_bulk_precommit",
+                              contexts)
+
+    def create_policy_target_bulk_postcommit(self, contexts):
+        self._call_on_drivers("create_policy_target_bulk_postcommit",
+                              contexts)
+
     def update_policy_target_precommit(self, context):
         self._call_on_drivers("update_policy_target_precommit", context)
 
@@ -213,6 +306,14 @@ class PolicyDriverManager(stevedore.named.NamedExtensionManager):
     def create_policy_target_group_postcommit(self, context):
         self._call_on_drivers("create_policy_target_group_postcommit", context)
 
+    def create_policy_target_group_bulk_precommit(self, contexts):
+        self._call_on_drivers("create_policy_target_group_bulk_precommit",
+                              contexts)
+
+    def create_policy_target_group_bulk_postcommit(self, contexts):
+        self._call_on_drivers("create_policy_target_group_bulk_postcommit",
+                              contexts)
+
     def update_policy_target_group_precommit(self, context):
         self._call_on_drivers("update_policy_target_group_precommit", context)
 
@@ -27,7 +27,39 @@ service_chain_opts = [
                help=_("The plumber used by the Node Composition Plugin "
                       "for service plumbing. Entrypoint loaded from the "
                       "gbpservice.neutron.servicechain.ncp_plumbers "
-                      "namespace."))
+                      "namespace.")),
+    cfg.BoolOpt('parallel_node_deployment',
+                default=False,
+                help=_("Deploy, update and destroy the nodes of a "
+                       "servicechain instance concurrently, when all their "
+                       "node drivers support it.")),
+    cfg.IntOpt('node_deployment_pool_size',
+               default=4,
+               help=_("Maximum number of nodes of a servicechain instance "
+                      "processed concurrently when parallel node deployment "
+                      "is enabled.")),
+    cfg.IntOpt('node_deployment_timeout',
+               default=600,
+               help=_("Time in seconds after which the concurrent node "
+                      "operations of a servicechain instance are aborted.")),
+    cfg.IntOpt('graph_cache_ttl',
+               default=0,
+               help=_("Time in seconds for which the servicechain specs, "
+                      "nodes and profiles read while scheduling node "
+                      "drivers, as well as the node drivers chosen for "
+                      "deployment, are cached. Changes made through this "
+                      "server invalidate the cache immediately, while "
+                      "changes made through other servers are only seen "
+                      "once it expires. Node drivers must then only "
+                      "validate the creation of a node based on its spec, "
+                      "node and profile. 0 disables the cache.")),
+    cfg.FloatOpt('policy_target_notification_window',
+                 default=0,
+                 help=_("Time in seconds over which the policy targets "
+                        "added to and removed from the provider of a "
+                        "servicechain instance are accumulated, before "
+                        "notifying them to its node drivers at once. 0 "
+                        "notifies every policy target right away."))
 ]
 
 
@@ -10,6 +10,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import copy
+
 from neutron_lib.plugins import constants
 from neutron_lib.plugins import directory
 
@@ -26,8 +28,8 @@ def get_node_driver_context(sc_plugin, context, sc_instance,
                             current_node, original_node=None,
                             management_group=None, service_targets=None):
     admin_context = utils.admin_context(context)
-    specs = sc_plugin.get_servicechain_specs(
-        admin_context, filters={'id': sc_instance['servicechain_specs']})
+    specs = sc_plugin.get_cached_servicechain_specs(
+        admin_context, sc_instance['servicechain_specs'])
     position = _calculate_node_position(specs, current_node['id'])
     provider, _ = _get_ptg_or_ep(
         admin_context, sc_instance['provider_ptg_id'])
@@ -37,9 +39,9 @@ def get_node_driver_context(sc_plugin, context, sc_instance,
                                    sc_instance['management_ptg_id'])
     classifier = get_gbp_plugin().get_policy_classifier(
         admin_context, sc_instance['classifier_id'])
-    current_profile = sc_plugin.get_service_profile(
+    current_profile = sc_plugin.get_cached_service_profile(
         admin_context, current_node['service_profile_id'])
-    original_profile = sc_plugin.get_service_profile(
+    original_profile = sc_plugin.get_cached_service_profile(
         admin_context,
         original_node['service_profile_id']) if original_node else None
     if not service_targets:
@@ -130,6 +132,13 @@ class NodeDriverContext(object):
         self._l3_plugin = directory.get_plugin(constants.L3)
         self._position = position
 
+    def clone(self, context):
+        """Return a copy of this context bound to another plugin context."""
+        clone = copy.copy(self)
+        clone._plugin_context = context
+        clone._admin_context = None
+        return clone
+
     @property
     def gbp_plugin(self):
         return self._gbp_plugin
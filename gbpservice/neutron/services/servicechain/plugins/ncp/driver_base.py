@@ -28,6 +28,10 @@ class NodeDriverBase(object):
     the driver.
     """
 
+    # Whether the driver's create, update and delete of different nodes of
+    # a chain can run concurrently, each with its own plugin context.
+    supports_concurrent_operations = False
+
     @abc.abstractmethod
     def initialize(self, name):
         """Perform driver initialization.
@@ -172,6 +176,34 @@ class NodeDriverBase(object):
         """
         pass
 
+    def update_policy_targets_added(self, context, policy_targets):
+        """Update a deployed Service Chain Node on adding of several PTs.
+
+        Called instead of update_policy_target_added when the PT additions
+        to a relevant PTG are notified in batches. Drivers can override this
+        method to react to all of them at once.
+
+        :param context: NodeDriverContext instance describing the service chain
+        and the specific node to be processed by this driver.
+        :param policy_targets: List of dicts representing Policy Targets.
+        """
+        for policy_target in policy_targets:
+            self.update_policy_target_added(context, policy_target)
+
+    def update_policy_targets_removed(self, context, policy_targets):
+        """Update a deployed Service Chain Node on removal of several PTs.
+
+        Called instead of update_policy_target_removed when the PT removals
+        from a relevant PTG are notified in batches. Drivers can override
+        this method to react to all of them at once.
+
+        :param context: NodeDriverContext instance describing the service chain
+        and the specific node to be processed by this driver.
+        :param policy_targets: List of dicts representing Policy Targets.
+        """
+        for policy_target in policy_targets:
+            self.update_policy_target_removed(context, policy_target)
+
     @abc.abstractmethod
     def update_node_consumer_ptg_added(self, context, policy_target_group):
         """Update a deployed Service Chain Node on addition of a consumer PTG.
@@ -22,6 +22,12 @@ class NodeDriverError(exceptions.NeutronException):
     message = _("%(method)s failed.")
 
 
+class NodeOperationTimeout(NodeDriverError):
+    """Concurrent node driver calls didn't complete in time."""
+    message = _("%(method)s of the nodes of servicechain instance "
+                "%(instance_id)s didn't complete in %(timeout)s seconds.")
+
+
 class NodeCompositionPluginException(exceptions.NeutronException):
     """Base for node driver exceptions returned to user."""
     pass
@@ -0,0 +1,78 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import copy
+
+from oslo_utils import timeutils
+
+
+class ServiceChainGraphCache(object):
+    """Versioned in-process cache of the servicechain spec graph.
+
+    Caches the specs, nodes and profiles read by NCP, as well as arbitrary
+    values derived from them (memos). Every entry is tagged with the
+    version of the cache when its read started: any change to a spec, node
+    or profile made through this process bumps the version, invalidating
+    all the entries. Entries also expire after ttl seconds, which bounds
+    the staleness of the changes made through other processes. A ttl of 0
+    disables the cache.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.version = 0
+        self._entries = {}
+
+    def invalidate(self):
+        self.version += 1
+        self._entries = {}
+
+    def _get(self, key):
+        entry = self._entries.get(key)
+        if entry:
+            version, expiration, value = entry
+            if version == self.version and expiration > timeutils.now():
+                return value
+            del self._entries[key]
+
+    def _set(self, key, value, version):
+        # Don't cache what was read before an invalidation.
+        if self.ttl and version == self.version:
+            self._entries[key] = (version, timeutils.now() + self.ttl, value)
+
+    def get_resources(self, resource, ids, reader):
+        """Return the resources with the given IDs, in the same order.
+
+        The resources not cached are read at once with reader(ids), which
+        returns them as a list of dicts.
+        """
+        version = self.version
+        resources = {}
+        missing = []
+        for resource_id in ids:
+            value = self._get((resource, resource_id))
+            if value is None:
+                missing.append(resource_id)
+            else:
+                resources[resource_id] = value
+        if missing:
+            for value in reader(missing):
+                resources[value['id']] = value
+                self._set((resource, value['id']), value, version)
+        return [copy.deepcopy(resources[resource_id]) for resource_id in ids
+                if resource_id in resources]
+
+    def get_memo(self, key):
+        return self._get(('memo', key))
+
+    def set_memo(self, key, value, version):
+        self._set(('memo', key), value, version)
@@ -59,12 +59,18 @@ class NodeDriverManager(stevedore.named.NamedExtensionManager):
             self.native_bulk_support &= getattr(driver.obj,
                                                 'native_bulk_support', True)
 
-    def schedule_deploy(self, context):
+    def schedule_deploy(self, context, driver_name=None):
         """Schedule Node Driver for Node creation.
 
         Given a NodeContext, this method returns the driver capable of creating
-        the specific node.
+        the specific node. If driver_name is given, that driver already
+        validated the creation of the node and is returned right away.
         """
+        if driver_name in self.drivers:
+            driver = self.drivers[driver_name].obj
+            if not model.get_node_owner(context):
+                model.set_node_owner(context, driver.name)
+            return driver
         for driver in self.ordered_drivers:
             try:
                 driver.obj.validate_create(context)
@@ -10,6 +10,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import hashlib
+import itertools
 import time
 
 from heatclient import exc as heat_exc
@@ -21,6 +23,7 @@ from oslo_db import exception as db_exc
 from oslo_log import helpers as log
 from oslo_log import log as logging
 from oslo_serialization import jsonutils
+from oslo_service import loopingcall
 import sqlalchemy as sa
 
 from gbpservice._i18n import _
@@ -49,6 +52,12 @@ service_chain_opts = [
                default='ExcludePoolMember',
                help=_("Policy Targets created for the LB Pool Members should "
                       "have this tag in their description")),
+    cfg.IntOpt('stack_status_poll_interval',
+               default=10,
+               help=_("Seconds between polls of the status of the stacks "
+                      "with a pending operation. All the pending stacks "
+                      "of a tenant are polled with a single Heat API call. "
+                      "Set to 0 to disable the poller.")),
 ]
 
 cfg.CONF.register_opts(service_chain_opts, "heat_node_driver")
@@ -57,6 +66,10 @@ STACK_ACTION_WAIT_TIME = cfg.CONF.heat_node_driver.stack_action_wait_time
 STACK_ACTION_RETRY_WAIT = 5  # Retry after every 5 seconds
 DELETE_VIP_PORT_RETRIES = cfg.CONF.heat_node_driver.delete_vip_port_retries
 
+STATUS_BUILD = 'BUILD'
+STATUS_ACTIVE = 'ACTIVE'
+STATUS_ERROR = 'ERROR'
+
 
 class ServiceNodeInstanceStack(model_base.BASEV2):
     """ServiceChainInstance stacks owned by the Node driver."""
@@ -68,6 +81,147 @@ class ServiceNodeInstanceStack(model_base.BASEV2):
                            nullable=False, primary_key=True)
     stack_id = sa.Column(sa.String(36),
                          nullable=False, primary_key=True)
+    # Status of the last stack operation, BUILD while it is pending.
+    status = sa.Column(sa.String(16), nullable=True)
+    status_details = sa.Column(sa.String(4096), nullable=True)
+    # Hash of the template and parameters the stack was last sent.
+    config_hash = sa.Column(sa.String(64), nullable=True)
+
+
+def get_stack_config_hash(stack_template, stack_params):
+    """Return the hash identifying a stack template and its parameters."""
+    return hashlib.sha256(jsonutils.dump_as_bytes(
+        [stack_template, stack_params], sort_keys=True)).hexdigest()
+
+
+def get_stack_operation_status(stack):
+    """Return the (status, status details) of the last stack operation."""
+    if not stack:
+        return STATUS_ERROR, 'Stack not found'
+    stack_status = stack.stack_status
+    if stack_status.endswith('_IN_PROGRESS'):
+        return STATUS_BUILD, stack_status
+    if stack_status.endswith('_FAILED') or stack_status == 'DELETE_COMPLETE':
+        return STATUS_ERROR, getattr(stack, 'stack_status_reason', None) or (
+            stack_status)
+    return STATUS_ACTIVE, stack_status
+
+
+class StackOperationTracker(object):
+    """Resolves the status of the pending stack operations.
+
+    The stacks with a pending operation have the BUILD status in the
+    ncp_node_instance_stacks table. A single background poller resolves
+    all of them, listing the pending stacks of each tenant with one Heat
+    API call, so that the API calls need not wait for the operations to
+    complete. The stacks are listed with a client built from the last
+    context tracking stacks of the tenant. If its token has expired, the
+    stacks of the tenant stop being tracked until the next context, which
+    reads their status, tracks them again.
+
+    An operation can be started on a stack while the poller lists it. The
+    listed status is then only written if the stack row is still pending
+    with the config it had before the listing, and the stack is left
+    tracked if it was tracked again meanwhile.
+    """
+
+    def __init__(self, heat_uri, interval):
+        self._heat_uri = heat_uri
+        self._interval = interval
+        # Heat client of the last context seen for each tenant.
+        self._clients = {}
+        # Tenant and tracking generation of each pending stack.
+        self._pending = {}
+        self._generations = itertools.count()
+        self._poller = None
+
+    def is_tracked(self, stack_id):
+        return stack_id in self._pending
+
+    def track(self, plugin_context, stack_ids):
+        tenant = plugin_context.tenant
+        self._clients[tenant] = heat_api_client.HeatClient(
+            plugin_context, self._heat_uri)
+        generation = next(self._generations)
+        for stack_id in stack_ids:
+            self._pending[stack_id] = (tenant, generation)
+        if self._interval and not self._poller:
+            self._poller = loopingcall.FixedIntervalLoopingCall(self._poll)
+            self._poller.start(interval=self._interval,
+                               initial_delay=self._interval,
+                               stop_on_exception=False)
+
+    def _poll(self):
+        if not self._pending:
+            self._poller = None
+            raise loopingcall.LoopingCallDone()
+        # The listings yield, the tracked stacks and their rows can change
+        # until they are done.
+        tracked = dict(self._pending)
+        config_hashes = self._get_stack_config_hashes(list(tracked))
+        stacks_by_tenant = {}
+        for stack_id, (tenant, generation) in tracked.items():
+            stacks_by_tenant.setdefault(tenant, []).append(stack_id)
+        statuses = {}
+        for tenant, stack_ids in stacks_by_tenant.items():
+            try:
+                stacks = dict((stack.id, stack) for stack in
+                              self._clients[tenant].list(stack_ids))
+            except heat_exc.HTTPUnauthorized:
+                LOG.info("The token listing the pending stacks of tenant "
+                         "%s is no longer valid, untracking them",
+                         tenant)
+                self._untrack_tenant(tenant)
+                continue
+            except Exception as e:
+                LOG.warning("Failed to list the pending stacks of tenant "
+                            "%(tenant)s: %(err)s",
+                            {'tenant': tenant, 'err': e})
+                continue
+            for stack_id in stack_ids:
+                status = get_stack_operation_status(stacks.get(stack_id))
+                if status[0] != STATUS_BUILD:
+                    statuses[stack_id] = status
+        if statuses:
+            self._set_stack_statuses(statuses, config_hashes)
+            for stack_id in statuses:
+                if self._pending.get(stack_id) == tracked[stack_id]:
+                    del self._pending[stack_id]
+
+    def _untrack_tenant(self, tenant):
+        self._clients.pop(tenant, None)
+        for stack_id, (stack_tenant, generation) in list(
+                self._pending.items()):
+            if stack_tenant == tenant:
+                del self._pending[stack_id]
+
+    def _get_stack_config_hashes(self, stack_ids):
+        session = db_api.get_reader_session()
+        with session.begin(subtransactions=True):
+            return dict(session.query(
+                ServiceNodeInstanceStack.stack_id,
+                ServiceNodeInstanceStack.config_hash).filter(
+                    ServiceNodeInstanceStack.stack_id.in_(stack_ids)))
+
+    def _set_stack_statuses(self, statuses, config_hashes):
+        stack = ServiceNodeInstanceStack
+        session = db_api.get_writer_session()
+        with session.begin(subtransactions=True):
+            for stack_id, (status, status_details) in statuses.items():
+                if stack_id not in config_hashes:
+                    continue
+                config_hash = config_hashes[stack_id]
+                # A single conditional UPDATE, the operations started since
+                # the listing are not overwritten.
+                session.query(stack).filter(
+                    stack.stack_id == stack_id,
+                    sa.or_(stack.status.is_(None),
+                           stack.status == STATUS_BUILD),
+                    stack.config_hash.is_(None) if config_hash is None
+                    else stack.config_hash == config_hash).update(
+                        {stack.status: status,
+                         stack.status_details: status_details},
+                        synchronize_session=False)
 
 
 class InvalidServiceType(exc.NodeCompositionPluginBadRequest):
@@ -117,6 +271,7 @@ class HeatNodeDriver(driver_base.NodeDriverBase):
 
     vendor_name = 'heat_based_node_driver'
     initialized = False
+    supports_concurrent_operations = True
     sc_supported_type = [pconst.LOADBALANCERV2, pconst.FIREWALL]
     required_heat_resources = {
         pconst.LOADBALANCERV2: ['OS::Neutron::LBaaS::LoadBalancer',
@@ -130,6 +285,9 @@ class HeatNodeDriver(driver_base.NodeDriverBase):
     def initialize(self, name):
         self.initialized = True
         self._name = name
+        self._stack_tracker = StackOperationTracker(
+            cfg.CONF.heat_node_driver.heat_uri,
+            cfg.CONF.heat_node_driver.stack_status_poll_interval)
 
     @log.log_method_call
     def get_plumbing_info(self, context):
@@ -206,7 +364,10 @@ class HeatNodeDriver(driver_base.NodeDriverBase):
 
         self._insert_node_instance_stack_in_db(
             context.plugin_session, context.current_node['id'],
-            context.instance['id'], stack['stack']['id'])
+            context.instance['id'], stack['stack']['id'],
+            get_stack_config_hash(stack_template, stack_params))
+        self._stack_tracker.track(context.plugin_context,
+                                  [stack['stack']['id']])
 
     @log.log_method_call
     def delete(self, context):
@@ -255,14 +416,33 @@ class HeatNodeDriver(driver_base.NodeDriverBase):
         heatclient = self._get_heat_client(context.plugin_context)
 
         stack_template, stack_params = self._fetch_template_and_params(context)
-
-        stack_ids = self._get_node_instance_stacks(context.plugin_session,
-                                                   context.current_node['id'],
-                                                   context.instance['id'])
+        config_hash = get_stack_config_hash(stack_template, stack_params)
+
+        # The stacks already sent the same template and parameters need no
+        # update, unless it failed.
+        stack_ids = [stack for stack in self._get_node_instance_stacks(
+                         context.plugin_session, context.current_node['id'],
+                         context.instance['id'])
+                     if stack.config_hash != config_hash or
+                     stack.status == STATUS_ERROR]
+        if not stack_ids:
+            LOG.debug("Stacks of node %(node)s for instance %(instance)s "
+                      "are up to date",
+                      {'node': context.current_node['id'],
+                       'instance': context.instance['id']})
+            return
         for stack in stack_ids:
-            self._wait_for_stack_operation_complete(
+            # Heat rejects updating a stack with an operation in progress,
+            # only the stacks whose last operation is not known to be
+            # completed need to be checked.
+            if stack.status in (None, STATUS_BUILD):
+                self._wait_for_stack_operation_complete(
                                 heatclient, stack.stack_id, 'update')
             heatclient.update(stack.stack_id, stack_template, stack_params)
+        self._set_node_instance_stacks_pending(context.plugin_session,
+                                               stack_ids, config_hash)
+        self._stack_tracker.track(context.plugin_context,
+                                  [stack.stack_id for stack in stack_ids])
 
     @log.log_method_call
     def update_policy_target_added(self, context, policy_target):
@@ -274,6 +454,18 @@ class HeatNodeDriver(driver_base.NodeDriverBase):
         if context.current_profile['service_type'] == pconst.LOADBALANCERV2:
             self.update(context)
 
+    @log.log_method_call
+    def update_policy_targets_added(self, context, policy_targets):
+        # The stack is rendered from all the current members of the
+        # provider, so a single update covers the whole batch.
+        if context.current_profile['service_type'] == pconst.LOADBALANCERV2:
+            self.update(context)
+
+    @log.log_method_call
+    def update_policy_targets_removed(self, context, policy_targets):
+        if context.current_profile['service_type'] == pconst.LOADBALANCERV2:
+            self.update(context)
+
     @log.log_method_call
     def update_node_consumer_ptg_added(self, context, policy_target_group):
         pass
@@ -292,8 +484,26 @@ class HeatNodeDriver(driver_base.NodeDriverBase):
         pass
 
     def get_status(self, context):
-        # TODO(Sumit): Needs to be implemented
-        return {'status': '', 'status_details': ''}
+        stacks = self._get_node_instance_stacks(context.plugin_session,
+                                                context.current_node['id'],
+                                                context.instance['id'])
+        if not stacks:
+            return {'status': '', 'status_details': ''}
+        # Stacks left pending by another server, before a restart, or
+        # while the poller's token had expired, are resolved by this
+        # server's poller, which gets the token of this context.
+        pending = [stack.stack_id for stack in stacks
+                   if stack.status in (None, STATUS_BUILD)]
+        if pending:
+            self._stack_tracker.track(context.plugin_context, pending)
+        statuses = [stack.status or STATUS_BUILD for stack in stacks]
+        for status in (STATUS_ERROR, STATUS_BUILD):
+            if status in statuses:
+                stack = stacks[statuses.index(status)]
+                return {'status': status,
+                        'status_details': stack.status_details or ''}
+        return {'status': STATUS_ACTIVE,
+                'status_details': 'node deployment completed'}
 
     @property
     def name(self):
@@ -398,14 +608,25 @@ class HeatNodeDriver(driver_base.NodeDriverBase):
                 session.delete(stack)
 
     def _insert_node_instance_stack_in_db(self, session, sc_node_id,
-                                          sc_instance_id, stack_id):
+                                          sc_instance_id, stack_id,
+                                          config_hash=None):
         with session.begin(subtransactions=True):
             chainstack = ServiceNodeInstanceStack(
                 sc_node_id=sc_node_id,
                 sc_instance_id=sc_instance_id,
-                stack_id=stack_id)
+                stack_id=stack_id,
+                status=STATUS_BUILD,
+                config_hash=config_hash)
             session.add(chainstack)
 
+    def _set_node_instance_stacks_pending(self, session, stacks,
+                                          config_hash=None):
+        with session.begin(subtransactions=True):
+            for stack in stacks:
+                stack.status = STATUS_BUILD
+                stack.status_details = None
+                stack.config_hash = config_hash
+
     def _get_node_instance_stacks(self, session, sc_node_id=None,
                                   sc_instance_id=None):
         with session.begin(subtransactions=True):
@@ -502,19 +723,24 @@ class HeatNodeDriver(driver_base.NodeDriverBase):
                     "weight": 1}}
 
     def _get_member_ips(self, context, ptg):
-        member_addresses = []
         policy_target_groups = context.gbp_plugin.get_policy_targets(
                 context.plugin_context,
                 filters={'id': ptg.get("policy_targets")})
-        for policy_target in policy_target_groups:
-            if EXCLUDE_POOL_MEMBER_TAG not in policy_target['description']:
-                port_id = policy_target.get("port_id")
-                if port_id:
-                    port = context.core_plugin.get_port(
-                                        context._plugin_context, port_id)
-                    ip = port.get('fixed_ips')[0].get("ip_address")
-                    member_addresses.append(ip)
-        return member_addresses
+        port_ids = [policy_target.get("port_id")
+                    for policy_target in policy_target_groups
+                    if EXCLUDE_POOL_MEMBER_TAG not in
+                    policy_target['description'] and
+                    policy_target.get("port_id")]
+        if not port_ids:
+            return []
+        # All the member ports are retrieved at once, large pools would
+        # otherwise take a query per member on every update.
+        ports = dict((port['id'], port) for port in
+                     context.core_plugin.get_ports(
+                         context._plugin_context, filters={'id': port_ids},
+                         fields=['id', 'fixed_ips']))
+        return [ports[port_id]['fixed_ips'][0]['ip_address']
+                for port_id in port_ids if port_id in ports]
 
     def _get_heat_resource_key(self, template_resource_dict,
                                is_template_aws_version, resource_name):
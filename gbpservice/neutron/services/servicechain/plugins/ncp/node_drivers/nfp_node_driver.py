@@ -15,6 +15,7 @@ import sys
 import threading
 
 import eventlet
+from eventlet import event as eventlet_event
 from eventlet import greenpool
 from keystoneclient import exceptions as k_exceptions
 from keystoneclient.v2_0 import client as keyclient
@@ -27,6 +28,7 @@ from oslo_log import log as logging
 import oslo_messaging
 from oslo_serialization import jsonutils
 from oslo_utils import excutils
+from oslo_utils import timeutils
 import six
 import sqlalchemy as sa
 
@@ -57,6 +59,13 @@ NFP_NODE_DRIVER_OPTS = [
                default=nfp_constants.SERVICE_DELETE_TIMEOUT,
                help=_("Seconds to wait for service deletion "
                       "to complete")),
+    cfg.IntOpt('service_status_poll_interval',
+               default=nfp_constants.SERVICE_STATUS_POLL_INTERVAL,
+               help=_("Seconds between polls of the network function "
+                      "status while waiting for a service operation to "
+                      "complete. Status changes are normally notified by "
+                      "the service orchestrator, polling is a fallback "
+                      "for lost notifications.")),
 ]
 # REVISIT(ashu): Can we use is_service_admin_owned config from RMD
 cfg.CONF.register_opts(NFP_NODE_DRIVER_OPTS, "nfp_node_driver")
@@ -253,6 +262,29 @@ class NFPClientApi(object):
                    network_function_id=network_function_id,
                    policy_target=policy_target)
 
+    def policy_targets_added_notification(self, context, network_function_id,
+                                          policy_targets):
+        LOG.info("Sending RPC POLICY TARGETS ADDED NOTIFICATION to "
+                 "Service Orchestrator for NF:%(network_function_id)s",
+                 {'network_function_id': network_function_id})
+        cctxt = self.client.prepare(version=self.RPC_API_VERSION)
+        return cctxt.cast(context,
+                   'policy_targets_added_notification',
+                   network_function_id=network_function_id,
+                   policy_targets=policy_targets)
+
+    def policy_targets_removed_notification(self, context,
+                                            network_function_id,
+                                            policy_targets):
+        LOG.info("Sending RPC POLICY TARGETS REMOVED NOTIFICATION to "
+                 "Service Orchestrator for NF:%(network_function_id)s",
+                 {'network_function_id': network_function_id})
+        cctxt = self.client.prepare(version=self.RPC_API_VERSION)
+        return cctxt.cast(context,
+                   'policy_targets_removed_notification',
+                   network_function_id=network_function_id,
+                   policy_targets=policy_targets)
+
     def get_plumbing_info(self, context, node_driver_ctxt):
         LOG.info("Sending RPC GET PLUMBING INFO to Service Orchestrator ")
         request_info = dict(profile=node_driver_ctxt.current_profile,
@@ -263,6 +295,58 @@ class NFPClientApi(object):
                           request_info=request_info)
 
 
+class NetworkFunctionStatusRegistry(object):
+    """Local registry of the waiters for network function status changes.
+
+    The service orchestrator notifies the network function status changes
+    on a fanout topic. Each waiter watches the network function it waits
+    for, and is woken up on the notification of its next status change.
+    """
+
+    def __init__(self):
+        # network function id -> events of its waiters
+        self._events = {}
+
+    def watch(self, network_function_id):
+        event = eventlet_event.Event()
+        self._events.setdefault(network_function_id, set()).add(event)
+        return event
+
+    def unwatch(self, network_function_id, event):
+        events = self._events.get(network_function_id)
+        if events:
+            events.discard(event)
+            if not events:
+                del self._events[network_function_id]
+
+    def notify(self, network_function_id, status):
+        for event in self._events.pop(network_function_id, ()):
+            event.send(status)
+
+    @staticmethod
+    def wait(event, timeout):
+        """Return the notified status, or None on timeout."""
+        with eventlet.Timeout(timeout, False):
+            return event.wait()
+
+
+nf_status_registry = NetworkFunctionStatusRegistry()
+
+
+class NFPNodeDriverCallbacks(object):
+    """Node driver side of the network function status notifications."""
+
+    RPC_API_VERSION = '1.0'
+    target = oslo_messaging.Target(version=RPC_API_VERSION)
+
+    def network_function_status_changed(self, context, network_function_id,
+                                        status):
+        LOG.debug("Network function %(nf_id)s status changed to "
+                  "%(status)s", {'nf_id': network_function_id,
+                                 'status': status})
+        nf_status_registry.notify(network_function_id, status)
+
+
 class NFPContext(object):
 
     @staticmethod
@@ -322,6 +406,7 @@ class NFPNodeDriver(driver_base.NodeDriverBase):
     def __init__(self):
         super(NFPNodeDriver, self).__init__()
         self._lbaas_plugin = None
+        self._status_listener = None
         self.nfp_db = nfp_db.NFPDbBase()
 
     @property
@@ -340,6 +425,17 @@ class NFPNodeDriver(driver_base.NodeDriverBase):
     def _setup_rpc(self):
         self.nfp_notifier = NFPClientApi(nfp_rpc_topics.NFP_NSO_TOPIC)
 
+    def _start_status_listener(self):
+        # Started on first use, so that each API worker process consumes
+        # the notifications of the network functions it waits for.
+        if self._status_listener:
+            return
+        self._status_listener = n_rpc.Connection()
+        self._status_listener.create_consumer(
+            nfp_rpc_topics.NFP_NODE_DRIVER_CALLBACK_TOPIC,
+            [NFPNodeDriverCallbacks()], fanout=True)
+        self._status_listener.consume_in_threads()
+
     def _parse_service_flavor_string(self, service_flavor_str):
         service_details = {}
         if ',' not in service_flavor_str:
@@ -611,47 +707,53 @@ class NFPNodeDriver(driver_base.NodeDriverBase):
         self._update_ptg(context)
 
     def update_policy_target_added(self, context, policy_target):
-        if context.current_profile['service_type'] == pconst.LOADBALANCERV2:
-            if self._is_service_target(policy_target):
-                return
-            context._plugin_context = self._get_resource_owner_context(
-                context._plugin_context)
-            network_function_map = (
-                self.nfp_db.get_node_instance_network_function_map(
-                    context.plugin_session,
-                    context.current_node['id'],
-                    context.instance['id']))
-            if network_function_map:
-                updated_network_function_map = {
-                    'status': nfp_constants.BUILD,
-                    'status_details': 'node driver processing PT add'}
-                self._update_node_instance_network_function_map(
-                    context, updated_network_function_map)
-                network_function_id = network_function_map.network_function_id
-                self.nfp_notifier.policy_target_added_notification(
-                    context.plugin_context, network_function_id, policy_target)
+        self.update_policy_targets_added(context, [policy_target])
 
     def update_policy_target_removed(self, context, policy_target):
-        if context.current_profile['service_type'] == pconst.LOADBALANCERV2:
-            if self._is_service_target(policy_target):
-                return
-            context._plugin_context = self._get_resource_owner_context(
-                context._plugin_context)
-            network_function_map = (
-                self.nfp_db.get_node_instance_network_function_map(
-                    context.plugin_session,
-                    context.current_node['id'],
-                    context.instance['id']))
+        self.update_policy_targets_removed(context, [policy_target])
 
-            if network_function_map:
-                updated_network_function_map = {
-                    'status': nfp_constants.BUILD,
-                    'status_details': 'node driver processing PT remove'}
-                self._update_node_instance_network_function_map(
-                    context, updated_network_function_map)
-                network_function_id = network_function_map.network_function_id
-                self.nfp_notifier.policy_target_removed_notification(
-                    context.plugin_context, network_function_id, policy_target)
+    def update_policy_targets_added(self, context, policy_targets):
+        self._update_policy_targets(context, policy_targets, 'added',
+                                    'node driver processing PT add')
+
+    def update_policy_targets_removed(self, context, policy_targets):
+        self._update_policy_targets(context, policy_targets, 'removed',
+                                    'node driver processing PT remove')
+
+    def _update_policy_targets(self, context, policy_targets, action,
+                               status_details):
+        if context.current_profile['service_type'] != pconst.LOADBALANCERV2:
+            return
+        policy_targets = [pt for pt in policy_targets
+                          if not self._is_service_target(pt)]
+        if not policy_targets:
+            return
+        context._plugin_context = self._get_resource_owner_context(
+            context._plugin_context)
+        network_function_map = (
+            self.nfp_db.get_node_instance_network_function_map(
+                context.plugin_session,
+                context.current_node['id'],
+                context.instance['id']))
+        if network_function_map:
+            updated_network_function_map = {
+                'status': nfp_constants.BUILD,
+                'status_details': status_details}
+            self._update_node_instance_network_function_map(
+                context, updated_network_function_map)
+            network_function_id = network_function_map.network_function_id
+            # A single PT is still notified on its own, the orchestrator
+            # regenerates the configuration once either way.
+            if len(policy_targets) == 1:
+                getattr(self.nfp_notifier,
+                        'policy_target_%s_notification' % action)(
+                    context.plugin_context, network_function_id,
+                    policy_targets[0])
+            else:
+                getattr(self.nfp_notifier,
+                        'policy_targets_%s_notification' % action)(
+                    context.plugin_context, network_function_id,
+                    policy_targets)
 
     def notify_chain_parameters_updated(self, context):
         pass  # We are not using the classifier specified in redirect Rule
@@ -733,22 +835,47 @@ class NFPNodeDriver(driver_base.NodeDriverBase):
                                 {'provided_policy_rule_sets':
                                     dict((x, '') for x in prs)}})
 
+    def _wait_for_network_function_status(self, context, network_function_id,
+                                          timeout, is_complete):
+        """Wait for a network function to reach a completion status.
+
+        The network function is fetched when its status change is
+        notified, or every service_status_poll_interval seconds if no
+        notification is received, until is_complete returns True for it
+        or the timeout expires. Returns the last network function fetched.
+        """
+        self._start_status_listener()
+        poll_interval = cfg.CONF.nfp_node_driver.service_status_poll_interval
+        watch = timeutils.StopWatch(duration=timeout).start()
+        network_function = None
+        while True:
+            # Watch before fetching, so that no status change is missed.
+            event = nf_status_registry.watch(network_function_id)
+            try:
+                network_function = self.nfp_notifier.get_network_function(
+                    context.plugin_context, network_function_id)
+                if is_complete(network_function) or watch.expired():
+                    return network_function
+                status = nf_status_registry.wait(
+                    event, min(poll_interval, watch.leftover()))
+            finally:
+                nf_status_registry.unwatch(network_function_id, event)
+            LOG.debug("Network function %(nf_id)s status %(status)s after "
+                      "%(elapsed).1f seconds",
+                      {'nf_id': network_function_id,
+                       'status': status or 'not notified',
+                       'elapsed': watch.elapsed()})
+
     def _wait_for_network_function_delete_completion(self, context,
                                                      network_function_id):
         # [REVISIT: (akash) do we need to do error handling here]
         if not network_function_id:
             return
 
-        time_waited = 0
-        network_function = None
-        while time_waited < cfg.CONF.nfp_node_driver.service_delete_timeout:
-            network_function = self.nfp_notifier.get_network_function(
-                context.plugin_context, network_function_id)
-            if not network_function or (
-                    network_function['status'] == nfp_constants.ERROR):
-                break
-            eventlet.sleep(5)
-            time_waited = time_waited + 5
+        network_function = self._wait_for_network_function_status(
+            context, network_function_id,
+            cfg.CONF.nfp_node_driver.service_delete_timeout,
+            lambda nf: not nf or nf['status'] == nfp_constants.ERROR)
 
         if network_function:
             LOG.error("Delete network function %(network_function)s "
@@ -762,38 +889,18 @@ class NFPNodeDriver(driver_base.NodeDriverBase):
         if not network_function_id:
             raise NodeInstanceCreateFailed()
 
-        time_waited = 0
-        network_function = None
-        timeout = cfg.CONF.nfp_node_driver.service_create_timeout
-
-        while time_waited < timeout:
-            network_function = self.nfp_notifier.get_network_function(
-                context.plugin_context, network_function_id)
-            LOG.debug("Got %s nf result for NF: %s with status:%s,"
-                      "time waited: %s", (network_function_id, operation,
-                      time_waited, network_function['status']))
-            if not network_function:
-                LOG.error("Failed to retrieve network function")
-                eventlet.sleep(5)
-                time_waited = time_waited + 5
-                continue
-            else:
-                if time_waited == 0:
-                    LOG.info("STARTED POLLING for %(operation)s network "
-                             "function for NF:%(network_function_id)s "
-                             "with initial result: %(result)s ",
-                             {'operation': operation,
-                              'network_function_id': network_function_id,
-                              'result': network_function})
-            if (network_function['status'] == nfp_constants.ACTIVE or
-                network_function['status'] == nfp_constants.ERROR):
-                LOG.info("COMPLETED POLLING for  %(operation)s network "
-                         "function for NF:%(network_function_id)s ",
-                         {'network_function_id': network_function_id,
-                          'operation': operation})
-                break
-            eventlet.sleep(5)
-            time_waited = time_waited + 5
+        LOG.info("STARTED WAITING for %(operation)s network "
+                 "function for NF:%(network_function_id)s ",
+                 {'operation': operation,
+                  'network_function_id': network_function_id})
+        network_function = self._wait_for_network_function_status(
+            context, network_function_id,
+            cfg.CONF.nfp_node_driver.service_create_timeout,
+            lambda nf: nf and nf['status'] in (nfp_constants.ACTIVE,
+                                               nfp_constants.ERROR))
+        if not network_function:
+            LOG.error("Failed to retrieve network function")
+            network_function = {'status': nfp_constants.ERROR}
 
         LOG.info("Got %(operation)s network function result for NF:"
                  "%(network_function_id)s with status:%(status)s",
@@ -877,11 +984,10 @@ class NFPNodeDriver(driver_base.NodeDriverBase):
     def _get_service_chain_specs(self, context):
         current_specs = context.relevant_specs
         for spec in current_specs:
-            filters = {'id': spec['nodes']}
-            nodes = context.sc_plugin.get_servicechain_nodes(
-                context.plugin_context, filters)
+            nodes = context.sc_plugin.get_cached_servicechain_nodes(
+                context.plugin_context, spec['nodes'])
             for node in nodes:
-                profile = context.sc_plugin.get_service_profile(
+                profile = context.sc_plugin.get_cached_service_profile(
                     context.plugin_context, node['service_profile_id'])
                 node['sc_service_profile'] = profile
             spec['sc_nodes'] = nodes
@@ -892,11 +998,10 @@ class NFPNodeDriver(driver_base.NodeDriverBase):
         current_specs = context.relevant_specs
         service_targets = []
         for spec in current_specs:
-            filters = {'id': spec['nodes']}
-            nodes = context.sc_plugin.get_servicechain_nodes(
-                context.plugin_context, filters)
+            nodes = context.sc_plugin.get_cached_servicechain_nodes(
+                context.plugin_context, spec['nodes'])
             for node in nodes:
-                profile = context.sc_plugin.get_service_profile(
+                profile = context.sc_plugin.get_cached_service_profile(
                     context.plugin_context, node['service_profile_id'])
                 if (profile['service_type'] != service_type and
                         profile['service_type'] in GATEWAY_PLUMBER_TYPE):
@@ -1019,10 +1124,9 @@ class NFPNodeDriver(driver_base.NodeDriverBase):
         for spec in current_specs:
             node_list.extend(spec['nodes'])
 
-        for node_id in node_list:
-            node_info = context.sc_plugin.get_servicechain_node(
-                context.plugin_context, node_id)
-            profile = context.sc_plugin.get_service_profile(
+        for node_info in context.sc_plugin.get_cached_servicechain_nodes(
+                context.plugin_context, node_list):
+            profile = context.sc_plugin.get_cached_service_profile(
                 context.plugin_context, node_info['service_profile_id'])
             service_type_list_in_chain.append(profile['service_type'])
 
@@ -1088,11 +1192,20 @@ class NFPNodeDriver(driver_base.NodeDriverBase):
             consuming_eps_details = context.gbp_plugin.get_external_policies(
                 context.plugin_context, filters={'id': consuming_ep_ids})
 
+        # The subnets of all the consumers are got at once
+        subnet_ids = [subnet_id for ptg in consuming_ptgs
+                      for subnet_id in ptg['subnets']]
+        subnets = {}
+        if subnet_ids:
+            subnets = dict((subnet['id'], subnet) for subnet in
+                           context.core_plugin.get_subnets(
+                               context.plugin_context,
+                               filters={'id': subnet_ids}))
         for ptg in consuming_ptgs:
-            subnet_ids = ptg['subnets']
-            subnets = context.core_plugin.get_subnets(
-                context.plugin_context, filters={'id': subnet_ids})
-            consuming_ptgs_details.append({'ptg': ptg, 'subnets': subnets})
+            consuming_ptgs_details.append(
+                {'ptg': ptg,
+                 'subnets': [subnets[subnet_id] for subnet_id in ptg['subnets']
+                             if subnet_id in subnets]})
 
         return consuming_ptgs_details, consuming_eps_details
 
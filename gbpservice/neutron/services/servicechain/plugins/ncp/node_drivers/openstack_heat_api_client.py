@@ -61,3 +61,6 @@ class HeatClient(object):
 
     def get(self, stack_id):
         return self.stacks.get(stack_id)
+
+    def list(self, stack_ids):
+        return self.stacks.list(filters={'id': stack_ids})
@@ -10,24 +10,36 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
+
+import eventlet
+from eventlet import greenpool
 from neutron.quota import resource_registry
+from neutron_lib import context as n_context
 from neutron_lib.plugins import constants as pconst
 from oslo_config import cfg
 from oslo_log import helpers as log
 from oslo_log import log as logging
 from oslo_utils import excutils
+from oslo_utils import timeutils
 
+from gbpservice.common import metrics
 from gbpservice.common import utils
 from gbpservice.neutron.db import api as db_api
 from gbpservice.neutron.db import servicechain_db
+from gbpservice.neutron.extensions import servicechain as schain
 from gbpservice.neutron.services.grouppolicy.common import constants as gp_cts
 from gbpservice.neutron.services.grouppolicy.common import utils as gutils
 from gbpservice.neutron.services.servicechain.plugins.ncp import (
     context as ctx)
 from gbpservice.neutron.services.servicechain.plugins.ncp import (
     exceptions as exc)
+from gbpservice.neutron.services.servicechain.plugins.ncp import (
+    graph_cache)
 from gbpservice.neutron.services.servicechain.plugins.ncp import (
     node_driver_manager as manager)
+from gbpservice.neutron.services.servicechain.plugins.ncp import (
+    pt_batcher)
 from gbpservice.neutron.services.servicechain.plugins import sharing
 
 LOG = logging.getLogger(__name__)
@@ -41,6 +53,22 @@ STATUS_DETAILS = 'status_details'
 STATUS_SET = set([STATUS, STATUS_DETAILS])
 
 
+def invalidates_graph_cache(f):
+    """Invalidate the spec graph cache around a change of the graph.
+
+    The cache is invalidated both before and after the change, so that
+    nothing read while the change is in progress outlives it.
+    """
+    @functools.wraps(f)
+    def wrapped(self, *args, **kwargs):
+        self.graph_cache.invalidate()
+        try:
+            return f(self, *args, **kwargs)
+        finally:
+            self.graph_cache.invalidate()
+    return wrapped
+
+
 class NodeCompositionPlugin(servicechain_db.ServiceChainDbPlugin,
                             sharing.SharingMixin):
 
@@ -57,6 +85,13 @@ class NodeCompositionPlugin(servicechain_db.ServiceChainDbPlugin,
         service_profile=servicechain_db.ServiceProfile)
     def __init__(self):
         self.driver_manager = manager.NodeDriverManager()
+        # Latencies of the node driver calls, keyed by (driver, method).
+        self.node_timings = metrics.HistogramRegistry()
+        self.graph_cache = graph_cache.ServiceChainGraphCache(
+            cfg.CONF.node_composition_plugin.graph_cache_ttl)
+        self.pt_batcher = pt_batcher.PolicyTargetBatcher(
+            cfg.CONF.node_composition_plugin.policy_target_notification_window,
+            self._update_chains_pts_modified)
         super(NodeCompositionPlugin, self).__init__()
         self.driver_manager.initialize()
         plumber_klass = cfg.CONF.node_composition_plugin.node_plumber
@@ -203,6 +238,7 @@ class NodeCompositionPlugin(servicechain_db.ServiceChainDbPlugin,
                 context, servicechain_instance_id)
 
     @log.log_method_call
+    @invalidates_graph_cache
     def create_servicechain_node(self, context, servicechain_node):
         # REVISIT: Consider adding ensure_tenant() call here
         with db_api.CONTEXT_WRITER.using(context):
@@ -213,6 +249,7 @@ class NodeCompositionPlugin(servicechain_db.ServiceChainDbPlugin,
         return result
 
     @log.log_method_call
+    @invalidates_graph_cache
     def update_servicechain_node(self, context, servicechain_node_id,
                                  servicechain_node):
         """Node Update.
@@ -263,6 +300,13 @@ class NodeCompositionPlugin(servicechain_db.ServiceChainDbPlugin,
                                   servicechain_node_id, fields)
 
     @log.log_method_call
+    @invalidates_graph_cache
+    def delete_servicechain_node(self, context, servicechain_node_id):
+        return super(NodeCompositionPlugin, self).delete_servicechain_node(
+            context, servicechain_node_id)
+
+    @log.log_method_call
+    @invalidates_graph_cache
     def create_servicechain_spec(self, context, servicechain_spec):
         # REVISIT: Consider adding ensure_tenant() call here
         with db_api.CONTEXT_WRITER.using(context):
@@ -273,6 +317,7 @@ class NodeCompositionPlugin(servicechain_db.ServiceChainDbPlugin,
         return result
 
     @log.log_method_call
+    @invalidates_graph_cache
     def update_servicechain_spec(self, context, servicechain_spec_id,
                                  servicechain_spec):
         with db_api.CONTEXT_WRITER.using(context):
@@ -299,6 +344,13 @@ class NodeCompositionPlugin(servicechain_db.ServiceChainDbPlugin,
                                   servicechain_spec_id, fields)
 
     @log.log_method_call
+    @invalidates_graph_cache
+    def delete_servicechain_spec(self, context, servicechain_spec_id):
+        return super(NodeCompositionPlugin, self).delete_servicechain_spec(
+            context, servicechain_spec_id)
+
+    @log.log_method_call
+    @invalidates_graph_cache
     def create_service_profile(self, context, service_profile):
         # REVISIT: Consider adding ensure_tenant() call here
         with db_api.CONTEXT_WRITER.using(context):
@@ -309,6 +361,7 @@ class NodeCompositionPlugin(servicechain_db.ServiceChainDbPlugin,
         return result
 
     @log.log_method_call
+    @invalidates_graph_cache
     def update_service_profile(self, context, service_profile_id,
                                service_profile):
         with db_api.CONTEXT_WRITER.using(context):
@@ -327,6 +380,47 @@ class NodeCompositionPlugin(servicechain_db.ServiceChainDbPlugin,
         return self._get_resource(context, 'service_profile',
                                   service_profile_id, fields)
 
+    @log.log_method_call
+    @invalidates_graph_cache
+    def delete_service_profile(self, context, service_profile_id):
+        return super(NodeCompositionPlugin, self).delete_service_profile(
+            context, service_profile_id)
+
+    def get_cached_servicechain_specs(self, context, servicechain_spec_ids):
+        """Return the servicechain specs with the given IDs, in order.
+
+        Reads go through the spec graph cache and are always made with admin
+        privileges. The specs don't carry their instances, which change
+        independently of the graph.
+        """
+        def reader(ids):
+            specs = super(NodeCompositionPlugin, self).get_servicechain_specs(
+                utils.admin_context(context), filters={'id': ids})
+            for spec in specs:
+                spec.pop('instances', None)
+            return specs
+        return self.graph_cache.get_resources(
+            'servicechain_spec', servicechain_spec_ids, reader)
+
+    def get_cached_servicechain_nodes(self, context, servicechain_node_ids):
+        """Return the servicechain nodes with the given IDs, in order."""
+        def reader(ids):
+            return super(NodeCompositionPlugin, self).get_servicechain_nodes(
+                utils.admin_context(context), filters={'id': ids})
+        return self.graph_cache.get_resources(
+            'servicechain_node', servicechain_node_ids, reader)
+
+    def get_cached_service_profile(self, context, service_profile_id):
+        """Return the service profile with the given ID."""
+        def reader(ids):
+            return super(NodeCompositionPlugin, self).get_service_profiles(
+                utils.admin_context(context), filters={'id': ids})
+        profiles = self.graph_cache.get_resources(
+            'service_profile', [service_profile_id], reader)
+        if not profiles:
+            raise schain.ServiceProfileNotFound(profile_id=service_profile_id)
+        return profiles[0]
+
     def update_chains_pt_added(self, context, policy_target, instance_id):
         """ Auto scaling function.
 
@@ -395,14 +489,26 @@ class NodeCompositionPlugin(servicechain_db.ServiceChainDbPlugin,
 
     def _update_chains_pt_modified(self, context, policy_target, instance_id,
                                    action):
+        if self.pt_batcher.window:
+            # The batch is notified after the request completes, with a
+            # context of its own.
+            batch_context = n_context.Context.from_dict(context.to_dict())
+            self.pt_batcher.add(batch_context, instance_id, action,
+                                policy_target)
+        else:
+            self._update_chains_pts_modified(context, instance_id, action,
+                                             [policy_target])
+
+    def _update_chains_pts_modified(self, context, instance_id, action,
+                                    policy_targets):
         updaters = self._get_scheduled_drivers(
             context, self.get_servicechain_instance(context, instance_id),
             'update')
         for update in updaters.values():
             try:
                 getattr(update['driver'],
-                        'update_policy_target_' + action)(
-                            update['context'], policy_target)
+                        'update_policy_targets_' + action)(
+                            update['context'], policy_targets)
             except exc.NodeDriverError as ex:
                 LOG.error("Node Update on policy target modification "
                           "failed, %s", ex.message)
@@ -446,9 +552,12 @@ class NodeCompositionPlugin(servicechain_db.ServiceChainDbPlugin,
         context = utils.admin_context(context)
         if not instance['servicechain_specs']:
             return []
-        specs = self.get_servicechain_spec(
-            context, instance['servicechain_specs'][0])
-        return self.get_servicechain_nodes(context, {'id': specs['nodes']})
+        specs = self.get_cached_servicechain_specs(
+            context, instance['servicechain_specs'][:1])
+        if not specs:
+            raise schain.ServiceChainSpecNotFound(
+                sc_spec_id=instance['servicechain_specs'][0])
+        return self.get_cached_servicechain_nodes(context, specs[0]['nodes'])
 
     def _get_node_instances(self, context, node):
         context = utils.admin_context(context)
@@ -468,7 +577,10 @@ class NodeCompositionPlugin(servicechain_db.ServiceChainDbPlugin,
         for node in nodes or []:
             node_context = ctx.get_node_driver_context(
                 self, context, instance, node)
-            driver = func(node_context)
+            if action == 'deploy':
+                driver = self._schedule_deploy(node_context)
+            else:
+                driver = func(node_context)
             if not driver:
                 raise exc.NoDriverAvailableForAction(action=action,
                                                      node_id=node['id'])
@@ -479,6 +591,18 @@ class NodeCompositionPlugin(servicechain_db.ServiceChainDbPlugin,
                 node_context)
         return result
 
+    def _schedule_deploy(self, node_context):
+        # Which driver validates the creation of a node only depends on the
+        # spec graph, so the choice is memoized along with it.
+        version = self.graph_cache.version
+        key = ('deploy', node_context.current_node['id'],
+               tuple(spec['id'] for spec in node_context.relevant_specs))
+        driver = self.driver_manager.schedule_deploy(
+            node_context, driver_name=self.graph_cache.get_memo(key))
+        if driver:
+            self.graph_cache.set_memo(key, driver.name, version)
+        return driver
+
     def _get_resource(self, context, resource_name, resource_id, fields=None):
         deployers = {}
         with db_api.CONTEXT_WRITER.using(context):
@@ -548,38 +672,112 @@ class NodeCompositionPlugin(servicechain_db.ServiceChainDbPlugin,
 
     def _deploy_servicechain_nodes(self, context, deployers):
         self.plumber.plug_services(context, list(deployers.values()))
-        for deploy in deployers.values():
-            driver = deploy['driver']
-            driver.create(deploy['context'])
+        self._call_on_nodes(context, deployers, 'create')
 
     def _update_servicechain_nodes(self, context, updaters):
-        for update in updaters.values():
-            driver = update['driver']
-            driver.update(update['context'])
+        self._call_on_nodes(context, updaters, 'update')
 
     def _destroy_servicechain_nodes(self, context, destroyers):
         # Actual node disruption
         try:
-            for destroy in destroyers.values():
-                driver = destroy['driver']
+            self._call_on_nodes(context, destroyers, 'delete',
+                                call=self._destroy_servicechain_node)
+        finally:
+            self.plumber.unplug_services(context, list(destroyers.values()))
+
+    def _destroy_servicechain_node(self, destroy):
+        driver = destroy['driver']
+        try:
+            driver.delete(destroy['context'])
+        except exc.NodeDriverError:
+            LOG.error("Node destroy failed, for node %s ",
+                      destroy['context'].current_node['id'])
+        except Exception as e:
+            if db_api.is_retriable(e):
+                with excutils.save_and_reraise_exception():
+                    LOG.debug(
+                        "Node driver '%(name)s' failed in"
+                        " %(method)s, operation will be retried",
+                        {'name': driver._name, 'method': 'delete'}
+                    )
+            LOG.exception(e)
+        finally:
+            self.driver_manager.clear_node_owner(destroy['context'])
+
+    def _call_on_nodes(self, context, nodes, method, call=None):
+        """Call a node driver method for each node of an instance.
+
+        The nodes are processed concurrently when parallel node deployment
+        is enabled and all their drivers support it, each with a plugin
+        context of its own. All the calls are waited for, and the first
+        failure in node order is then raised.
+        """
+        if not call:
+            def call(node):
+                getattr(node['driver'], method)(node['context'])
+        nodes = list(nodes.values())
+        if not self._run_nodes_concurrently(context, nodes):
+            for node in nodes:
+                self._timed_node_call(method, node, call)
+            return
+
+        conf = cfg.CONF.node_composition_plugin
+        pool = greenpool.GreenPool(conf.node_deployment_pool_size)
+        threads = []
+        for node in nodes:
+            node_context = n_context.Context.from_dict(context.to_dict())
+            node = dict(node, context=node['context'].clone(node_context))
+            threads.append(pool.spawn(self._timed_node_call, method, node,
+                                      call))
+        errors = []
+        timeout = eventlet.Timeout(conf.node_deployment_timeout)
+        try:
+            for thread in threads:
                 try:
-                    driver.delete(destroy['context'])
-                except exc.NodeDriverError:
-                    LOG.error("Node destroy failed, for node %s ",
-                              driver['context'].current_node['id'])
+                    thread.wait()
                 except Exception as e:
-                    if db_api.is_retriable(e):
-                        with excutils.save_and_reraise_exception():
-                            LOG.debug(
-                                "Node driver '%(name)s' failed in"
-                                " %(method)s, operation will be retried",
-                                {'name': driver._name, 'method': 'delete'}
-                            )
-                    LOG.exception(e)
-                finally:
-                    self.driver_manager.clear_node_owner(destroy['context'])
+                    errors.append(e)
+        except eventlet.Timeout as t:
+            if t is not timeout:
+                raise
+            for thread in threads:
+                thread.kill()
+            instance_id = nodes[0]['context'].instance['id']
+            LOG.error("Node %(method)s timed out for servicechain instance "
+                      "%(instance)s", {'method': method,
+                                       'instance': instance_id})
+            raise exc.NodeOperationTimeout(
+                method=method, instance_id=instance_id,
+                timeout=conf.node_deployment_timeout)
         finally:
-            self.plumber.unplug_services(context, list(destroyers.values()))
+            timeout.cancel()
+        for error in errors[1:]:
+            LOG.error("Node %(method)s failed: %(error)s",
+                      {'method': method, 'error': error})
+        if errors:
+            raise errors[0]
+
+    def _run_nodes_concurrently(self, context, nodes):
+        # Nodes processed in a transaction can't be processed concurrently,
+        # their operations would escape it.
+        return (cfg.CONF.node_composition_plugin.parallel_node_deployment and
+                len(nodes) > 1 and not context.session.is_active and
+                all(node['driver'].supports_concurrent_operations
+                    for node in nodes))
+
+    def _timed_node_call(self, method, node, call):
+        driver = node['driver']
+        start = timeutils.now()
+        try:
+            call(node)
+        finally:
+            elapsed = timeutils.now() - start
+            self.node_timings.observe((driver.name, method), elapsed)
+            LOG.debug("Node %(node)s %(method)s by driver %(driver)s took "
+                      "%(elapsed).3fs",
+                      {'node': node['context'].current_node['id'],
+                       'method': method, 'driver': driver.name,
+                       'elapsed': elapsed})
 
     def _validate_profile_update(self, context, original, updated):
         # Raise if the profile is in use by any instance
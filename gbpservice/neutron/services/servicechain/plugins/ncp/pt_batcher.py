@@ -0,0 +1,61 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import eventlet
+from oslo_log import log as logging
+
+LOG = logging.getLogger(__name__)
+
+
+class PolicyTargetBatcher(object):
+    """Accumulates the PT membership changes of servicechain instances.
+
+    The PTs added to and removed from the provider of an instance are
+    queued, and handed to flush(context, instance_id, action, policy_targets)
+    window seconds after the first of them was queued: the additions first,
+    then the removals.
+    """
+
+    ACTIONS = ('added', 'removed')
+
+    def __init__(self, window, flush):
+        self.window = window
+        self._flush = flush
+        # instance_id -> (context, timer, {action: [policy_target]})
+        self._pending = {}
+
+    def add(self, context, instance_id, action, policy_target):
+        if instance_id not in self._pending:
+            timer = eventlet.spawn_after(self.window, self._flush_instance,
+                                         instance_id)
+            self._pending[instance_id] = (
+                context, timer, dict((x, []) for x in self.ACTIONS))
+        self._pending[instance_id][2][action].append(policy_target)
+
+    def flush(self):
+        """Flush all the pending changes right away."""
+        for instance_id in list(self._pending):
+            self._pending[instance_id][1].cancel()
+            self._flush_instance(instance_id)
+
+    def _flush_instance(self, instance_id):
+        context, _, changes = self._pending.pop(instance_id, (None, None, {}))
+        for action in self.ACTIONS:
+            if changes.get(action):
+                try:
+                    self._flush(context, instance_id, action, changes[action])
+                except Exception:
+                    LOG.exception("Failed to notify %(count)s policy targets "
+                                  "%(action)s for servicechain instance "
+                                  "%(instance)s",
+                                  {'count': len(changes[action]),
+                                   'action': action, 'instance': instance_id})
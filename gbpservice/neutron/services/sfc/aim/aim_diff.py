@@ -0,0 +1,140 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import collections
+import copy
+
+from aim.api import resource as aim_resource
+from aim.api import service_graph as aim_sg
+
+# Children of the AIM resources created by the SFC mapping, for which a
+# cascade delete followed by the re-creation of the parent can be turned
+# into the removal of only the children that are no longer mapped.
+CHILDREN = {
+    aim_sg.DeviceCluster: (aim_sg.ConcreteDevice,
+                           aim_sg.ConcreteDeviceInterface,
+                           aim_sg.DeviceClusterInterface),
+    aim_sg.DeviceClusterContext: (aim_sg.DeviceClusterInterfaceContext,),
+    aim_sg.ServiceRedirectPolicy: (),
+    aim_sg.ServiceRedirectMonitoringPolicy: (),
+    aim_resource.Contract: (aim_resource.ContractSubject,),
+    aim_resource.ExternalNetwork: (aim_resource.ExternalSubnet,),
+}
+
+
+def _key(resource):
+    return resource.__class__, tuple(resource.identity)
+
+
+def _is_child(parent, resource):
+    identity = tuple(parent.identity)
+    return (resource.__class__ in CHILDREN.get(parent.__class__, ()) and
+            tuple(resource.identity)[:len(identity)] == identity)
+
+
+class AimMappingDiff(object):
+    """Diff between the existing and the desired SFC mapping in AIM.
+
+    Implements the subset of the AIM manager API used by the SFC mapping,
+    so that remapping a resource (deleting its AIM objects, then creating
+    them again) can run against it. The writes are only recorded, reads
+    reflect them. apply() then compares the resulting AIM objects with the
+    existing ones by identity, and only writes the ones that changed.
+    """
+
+    def __init__(self, aim_mgr):
+        self.aim = aim_mgr
+        self._desired = collections.OrderedDict()
+        self._deleted = collections.OrderedDict()
+        self._updates = collections.OrderedDict()
+
+    def _is_deleted(self, resource):
+        if _key(resource) in self._deleted:
+            return True
+        return any(cascade and _is_child(parent, resource)
+                   for parent, cascade in self._deleted.values())
+
+    def get(self, context, resource):
+        key = _key(resource)
+        if key in self._desired:
+            return copy.deepcopy(self._desired[key])
+        if self._is_deleted(resource):
+            return None
+        result = self.aim.get(context, resource)
+        if result and key in self._updates:
+            for attr, value in self._updates[key][1].items():
+                setattr(result, attr, value)
+        return result
+
+    def create(self, context, resource, overwrite=False):
+        key = _key(resource)
+        self._updates.pop(key, None)
+        self._desired[key] = copy.deepcopy(resource)
+        return copy.deepcopy(resource)
+
+    def update(self, context, resource, **attrs):
+        key = _key(resource)
+        if key in self._desired:
+            for attr, value in attrs.items():
+                setattr(self._desired[key], attr, value)
+        else:
+            self._updates.setdefault(key, (resource, {}))[1].update(attrs)
+
+    def delete(self, context, resource, cascade=False):
+        key = _key(resource)
+        self._desired.pop(key, None)
+        self._updates.pop(key, None)
+        if cascade:
+            for child_key in [k for k, v in self._desired.items()
+                              if _is_child(resource, v)]:
+                del self._desired[child_key]
+        self._deleted[key] = (resource, cascade)
+
+    def _stale_children(self, context, parent):
+        identity = tuple(parent.identity)
+        for klass in CHILDREN[parent.__class__]:
+            filters = dict(zip(list(klass.identity_attributes)[:len(identity)],
+                               identity))
+            for child in self.aim.find(context, klass, **filters):
+                if _key(child) not in self._desired:
+                    yield child
+
+    def apply(self, context):
+        """Write the changes to AIM."""
+        replaced = set()
+        for key, (resource, cascade) in self._deleted.items():
+            if key not in self._desired:
+                self.aim.delete(context, resource, cascade=cascade)
+            elif cascade and resource.__class__ in CHILDREN:
+                for child in self._stale_children(context, resource):
+                    self.aim.delete(context, child, cascade=True)
+            elif cascade:
+                # The children of the resource are not known, so when it
+                # changes it's replaced as a whole.
+                actual = self.aim.get(context, resource)
+                if actual and not self._desired[key].user_equal(actual):
+                    self.aim.delete(context, resource, cascade=True)
+                    replaced.add(key)
+        for key, resource in self._desired.items():
+            actual = None if key in replaced else self.aim.get(context,
+                                                               resource)
+            if not actual:
+                self.aim.create(context, resource)
+            elif not resource.user_equal(actual):
+                self.aim.create(context, resource, overwrite=True)
+        for key, (resource, attrs) in self._updates.items():
+            actual = self.aim.get(context, resource)
+            if actual:
+                changed = dict((attr, value) for attr, value in attrs.items()
+                               if getattr(actual, attr) != value)
+                if changed:
+                    self.aim.update(context, resource, **changed)
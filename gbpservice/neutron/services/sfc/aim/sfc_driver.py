@@ -10,6 +10,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import contextlib
 import hashlib
 
 from aim import aim_manager
@@ -25,6 +26,8 @@ from networking_sfc.extensions import sfc as sfc_ext
 from networking_sfc.services.sfc.common import context as sfc_ctx
 from networking_sfc.services.sfc.drivers import base
 from neutron.db import models_v2
+from neutron.plugins.ml2 import models as ml2_models
+from neutron_lib.api.definitions import portbindings
 from neutron_lib.callbacks import events
 from neutron_lib.callbacks import registry
 from neutron_lib import constants as n_constants
@@ -39,6 +42,7 @@ from gbpservice.neutron.db import api as db_api
 from gbpservice.neutron.plugins.ml2plus.drivers.apic_aim import apic_mapper
 from gbpservice.neutron.plugins.ml2plus.drivers.apic_aim import constants
 from gbpservice.neutron.services.grouppolicy.common import exceptions as exc
+from gbpservice.neutron.services.sfc.aim import aim_diff
 from gbpservice.neutron.services.sfc.aim import constants as sfc_cts
 from gbpservice.neutron.services.sfc.aim import exceptions
 
@@ -202,11 +206,15 @@ class SfcAIMDriver(SfcAIMDriverBase):
         self._validate_port_pair_group(context)
         # Remap Port Chain if needed
         if remap or self._should_regenerate_ppg(context):
-            for chain in self._get_chains_by_ppg_ids(context._plugin_context,
-                                                     [context.current['id']]):
-                c_ctx = sfc_ctx.PortChainContext(
-                    context._plugin, context._plugin_context, chain, chain)
-                self.update_port_chain_precommit(c_ctx, remap=True)
+            # The chains share the group's AIM objects, which are diffed
+            # once for all of them.
+            with self._aim_mapping_diff(context._plugin_context):
+                for chain in self._get_chains_by_ppg_ids(
+                        context._plugin_context, [context.current['id']]):
+                    c_ctx = sfc_ctx.PortChainContext(
+                        context._plugin, context._plugin_context, chain,
+                        chain)
+                    self.update_port_chain_precommit(c_ctx, remap=True)
 
     def delete_port_pair_group_precommit(self, context):
         # NOTE(ivar): DB layer prevents deletion when used by port chains
@@ -229,9 +237,10 @@ class SfcAIMDriver(SfcAIMDriverBase):
         if remap or self._should_regenerate_pc(context):
             o_flowcs, o_ppgs = self._get_pc_flowcs_and_ppgs(p_ctx,
                                                             context.original)
-            self._delete_port_chain_mapping(p_ctx, context.original, o_flowcs,
-                                            o_ppgs)
-            self._map_port_chain(p_ctx, context.current, flowcs, ppgs)
+            with self._aim_mapping_diff(p_ctx):
+                self._delete_port_chain_mapping(p_ctx, context.original,
+                                                o_flowcs, o_ppgs)
+                self._map_port_chain(p_ctx, context.current, flowcs, ppgs)
 
     def delete_port_chain_precommit(self, context):
         p_ctx = context._plugin_context
@@ -330,6 +339,7 @@ class SfcAIMDriver(SfcAIMDriverBase):
     def _map_port_pair_group(self, plugin_context, ppg, tenant):
         session = plugin_context.session
         aim_ctx = aim_context.AimContext(session)
+        aim_mgr = self._get_aim_manager(plugin_context)
         # Create Logical device model, container for all the PPG port pairs.
         dc = self._get_ppg_device_cluster(session, ppg, tenant)
         mp = self._get_ppg_monitoring_policy(session, ppg, tenant)
@@ -353,12 +363,12 @@ class SfcAIMDriver(SfcAIMDriverBase):
                                                      tenant)
         epbr = self._get_ppg_service_redirect_policy(session, ppg, EGRESS,
                                                      tenant)
-        self.aim.create(aim_ctx, dc)
+        aim_mgr.create(aim_ctx, dc)
         if mp:
             for pbr in [ipbr, epbr]:
                 pbr.monitoring_policy_tenant_name = mp.tenant_name
                 pbr.monitoring_policy_name = mp.name
-            self.aim.create(aim_ctx, mp)
+            aim_mgr.create(aim_ctx, mp)
         # For each port pair, create the corresponding Concrete Devices
         # (represented by the static path of each interface)
         ingress_cdis = []
@@ -373,14 +383,14 @@ class SfcAIMDriver(SfcAIMDriverBase):
             cd = aim_sg.ConcreteDevice(
                 tenant_name=dc.tenant_name, device_cluster_name=dc.name,
                 name=pp_id, display_name=pp_name)
-            self.aim.create(aim_ctx, cd)
+            aim_mgr.create(aim_ctx, cd)
             srhg = None
             if mp:
                 # Create health groups
                 srhg = aim_sg.ServiceRedirectHealthGroup(
                     tenant_name=dc.tenant_name, name=pp_id,
                     display_name=pp_name)
-                self.aim.create(aim_ctx, srhg)
+                aim_mgr.create(aim_ctx, srhg)
             for p, store in [(ingress_port, ingress_cdis),
                              (egress_port, egress_cdis)]:
                 p_id = self.name_mapper.port(session, p['id'])
@@ -399,7 +409,7 @@ class SfcAIMDriver(SfcAIMDriverBase):
                     device_cluster_name=cd.device_cluster_name,
                     device_name=cd.name, name=p_id, display_name=p_name,
                     path=path, host=host)
-                cdi = self.aim.create(aim_ctx, cdi)
+                cdi = aim_mgr.create(aim_ctx, cdi)
                 store.append((cdi, encap, p, srhg, pp_id))
 
         for i in range(len(ingress_cdis)):
@@ -422,29 +432,30 @@ class SfcAIMDriver(SfcAIMDriverBase):
                     destination['redirect_health_group_dn'] = esrhg.dn
                 epbr.destinations.append(destination)
 
-        self.aim.create(aim_ctx, internal_dci)
-        self.aim.create(aim_ctx, external_dci)
-        self.aim.create(aim_ctx, ipbr)
-        self.aim.create(aim_ctx, epbr)
+        aim_mgr.create(aim_ctx, internal_dci)
+        aim_mgr.create(aim_ctx, external_dci)
+        aim_mgr.create(aim_ctx, ipbr)
+        aim_mgr.create(aim_ctx, epbr)
 
     def _delete_port_pair_group_mapping(self, plugin_context, ppg, tenant):
         # Just delete cascade the DeviceCluster and PBR policies
         session = plugin_context.session
         aim_ctx = aim_context.AimContext(session)
+        aim_mgr = self._get_aim_manager(plugin_context)
         dc = self._get_ppg_device_cluster(session, ppg, tenant)
         mp = self._get_ppg_monitoring_policy(session, ppg, tenant)
-        self.aim.delete(aim_ctx, dc, cascade=True)
+        aim_mgr.delete(aim_ctx, dc, cascade=True)
         if mp:
-            self.aim.delete(aim_ctx, mp, cascade=True)
+            aim_mgr.delete(aim_ctx, mp, cascade=True)
             for pp in ppg['port_pairs']:
                 pp_id = self.name_mapper.port_pair(session, pp)
                 srhg = aim_sg.ServiceRedirectHealthGroup(
                     tenant_name=dc.tenant_name, name=pp_id)
-                self.aim.delete(aim_ctx, srhg)
+                aim_mgr.delete(aim_ctx, srhg)
         for prefix in [PBR_INGR_PREFIX, PBR_EGR_PREFIX]:
             pbr_id = self.name_mapper.port_pair_group(session, ppg['id'],
                                                       prefix=prefix)
-            self.aim.delete(
+            aim_mgr.delete(
                 aim_ctx, aim_sg.ServiceRedirectPolicy(
                     tenant_name=dc.tenant_name, name=pbr_id), cascade=True)
 
@@ -452,6 +463,7 @@ class SfcAIMDriver(SfcAIMDriverBase):
         # Create one DeviceClusterContext per PPG
         p_ctx = plugin_context
         aim_ctx = aim_context.AimContext(p_ctx.session)
+        aim_mgr = self._get_aim_manager(plugin_context)
         # For each flow classifier, there are as many DeviceClusterContext as
         # the number of nodes in the chain.
         p_tenants = set()
@@ -464,9 +476,9 @@ class SfcAIMDriver(SfcAIMDriverBase):
                 tenant_name=contract.tenant_name, contract_name=contract.name,
                 name=sg.name, service_graph_name=sg.name,
                 bi_filters=[self.aim_mech._any_filter_name])
-            if not self.aim.get(aim_ctx, contract):
-                self.aim.create(aim_ctx, contract)
-                self.aim.create(aim_ctx, subject)
+            if not aim_mgr.get(aim_ctx, contract):
+                aim_mgr.create(aim_ctx, contract)
+                aim_mgr.create(aim_ctx, subject)
             self._map_flow_classifier(p_ctx, flc, pc, p_tenant)
             # Map device clusters for each flow tenant
             if p_tenant not in p_tenants:
@@ -480,7 +492,7 @@ class SfcAIMDriver(SfcAIMDriverBase):
                         display_name=dc.display_name,
                         device_cluster_name=dc.name,
                         device_cluster_tenant_name=dc.tenant_name)
-                    dcc = self.aim.create(aim_ctx, dcc)
+                    dcc = aim_mgr.create(aim_ctx, dcc)
                     # Create device context interfaces.
                     left_bd, right_bd = self._get_ppg_left_right_bds(p_ctx,
                                                                      ppg)
@@ -501,21 +513,67 @@ class SfcAIMDriver(SfcAIMDriverBase):
                             bridge_domain_dn=bd.dn,
                             device_cluster_interface_dn=dci.dn,
                             service_redirect_policy_dn=pbr.dn)
-                        self.aim.create(aim_ctx, dcic)
+                        aim_mgr.create(aim_ctx, dcic)
                     sg.linear_chain_nodes.append(
                         {'name': dc.name, 'device_cluster_name': dc.name,
                          'device_cluster_tenant_name': dc.tenant_name})
                     # Unsync left-right EPGs
                     for epg in self._get_ppg_left_right_epgs(p_ctx, ppg):
-                        self.aim.update(aim_ctx, epg, sync=False)
+                        aim_mgr.update(aim_ctx, epg, sync=False)
                 # Create only once per tenant
-                self.aim.create(aim_ctx, sg)
+                aim_mgr.create(aim_ctx, sg)
                 p_tenants.add(p_tenant)
 
+    def _remap_port_pair_group(self, plugin_context, ppg):
+        """Remap a PPG in all the tenants of the chains using it.
+
+        Only the AIM objects owned by the PPG (device cluster, concrete
+        devices and redirect policies) are recreated, the ones of the chains
+        refer to them by name and are left untouched.
+        """
+        chains = self._get_chains_by_ppg_ids(plugin_context, [ppg['id']])
+        chain_resources = self._get_pcs_flowcs_and_ppgs(plugin_context,
+                                                        chains)
+        tenants = set()
+        for chain in chains:
+            for flowc in chain_resources[chain['id']][0]:
+                tenants.add(self._get_flowc_provider_group(
+                    plugin_context, flowc).tenant_name)
+        with self._aim_mapping_diff(plugin_context):
+            for tenant in tenants:
+                self._delete_port_pair_group_mapping(plugin_context, ppg,
+                                                     tenant)
+                self._map_port_pair_group(plugin_context, ppg, tenant)
+
+    def _get_aim_manager(self, plugin_context):
+        # Within a remap, the mapping is written to its diff.
+        return getattr(plugin_context, '_sfc_aim_diff', None) or self.aim
+
+    @contextlib.contextmanager
+    def _aim_mapping_diff(self, plugin_context):
+        """Remap resources writing only what changes to AIM.
+
+        The AIM objects deleted and created by the mapping methods called
+        within the block are diffed against the existing ones, and only the
+        differences are written once the block completes.
+        """
+        if getattr(plugin_context, '_sfc_aim_diff', None):
+            # Part of an outer remap, which applies the diff.
+            yield
+            return
+        diff = aim_diff.AimMappingDiff(self.aim)
+        plugin_context._sfc_aim_diff = diff
+        try:
+            yield
+        finally:
+            plugin_context._sfc_aim_diff = None
+        diff.apply(aim_context.AimContext(plugin_context.session))
+
     def _delete_port_chain_mapping(self, plugin_context, pc, flowcs, ppgs):
         p_ctx = plugin_context
         session = p_ctx.session
         aim_ctx = aim_context.AimContext(session)
+        aim_mgr = self._get_aim_manager(plugin_context)
         deleted_ppgs = set()
         for flc in flowcs:
             p_group = self._get_flowc_provider_group(plugin_context, flc)
@@ -528,14 +586,14 @@ class SfcAIMDriver(SfcAIMDriverBase):
             self._delete_flow_classifier_mapping(p_ctx, flc, pc, tenant)
             sg = self._get_pc_service_graph(p_ctx.session, pc, tenant)
             contract = self._get_flc_contract(p_group, sg)
-            self.aim.delete(aim_ctx, contract, cascade=True)
-            self.aim.delete(aim_ctx, sg, cascade=True)
+            aim_mgr.delete(aim_ctx, contract, cascade=True)
+            aim_mgr.delete(aim_ctx, sg, cascade=True)
             for ppg_id in pc['port_pair_groups']:
                 ppg_aid = self.name_mapper.port_pair_group(session, ppg_id)
                 dcc = aim_sg.DeviceClusterContext(
                     tenant_name=tenant, contract_name="any",
                     service_graph_name=sg.name, node_name=ppg_aid)
-                self.aim.delete(aim_ctx, dcc, cascade=True)
+                aim_mgr.delete(aim_ctx, dcc, cascade=True)
         processed_networks = set()
         # deleted ppgs contains all the ppgs' ID
         processed_ppgs = deleted_ppgs
@@ -565,7 +623,7 @@ class SfcAIMDriver(SfcAIMDriverBase):
                     # No chain associated to all the groups of this network
                     epg = self.aim_mech._get_epg_by_network_id(p_ctx.session,
                                                                net_id)
-                    self.aim.update(aim_ctx, epg, sync=True)
+                    aim_mgr.update(aim_ctx, epg, sync=True)
 
     def _map_flow_classifier(self, plugin_context, flowc, pc, tenant):
         """Map flowclassifier to AIM model
@@ -578,6 +636,7 @@ class SfcAIMDriver(SfcAIMDriverBase):
         :return:
         """
         aim_ctx = aim_context.AimContext(plugin_context.session)
+        aim_mgr = self._get_aim_manager(plugin_context)
         cons_group = self._map_flowc_consumer_group(plugin_context, flowc)
         prov_group = self._map_flowc_provider_group(plugin_context, flowc)
         sg = self._get_pc_service_graph(plugin_context.session, pc, tenant)
@@ -588,14 +647,15 @@ class SfcAIMDriver(SfcAIMDriverBase):
             cons_group.consumed_contract_names.append(contract.name)
         if contract.name not in prov_group.provided_contract_names:
             prov_group.provided_contract_names.append(contract.name)
-        self.aim.create(aim_ctx, cons_group, overwrite=True)
-        self.aim.create(aim_ctx, prov_group, overwrite=True)
+        aim_mgr.create(aim_ctx, cons_group, overwrite=True)
+        aim_mgr.create(aim_ctx, prov_group, overwrite=True)
 
     def _map_flowc_network_group(self, plugin_context, net, cidr, flowc,
                                  prefix):
         flc_aid = self._get_external_group_aim_name(plugin_context, flowc,
                                                     prefix)
         aim_ctx = aim_context.AimContext(plugin_context.session)
+        aim_mgr = self._get_aim_manager(plugin_context)
         cidr = netaddr.IPNetwork(cidr)
         l3out = self.aim_mech._get_svi_net_l3out(net)
         if l3out:
@@ -604,18 +664,18 @@ class SfcAIMDriver(SfcAIMDriverBase):
             ext_net = aim_resource.ExternalNetwork(
                 tenant_name=l3out.tenant_name, l3out_name=l3out.name,
                 name=flc_aid)
-            ext_net_db = self.aim.get(aim_ctx, ext_net)
+            ext_net_db = aim_mgr.get(aim_ctx, ext_net)
             if not ext_net_db:
-                ext_net_db = self.aim.create(aim_ctx, ext_net)
+                ext_net_db = aim_mgr.create(aim_ctx, ext_net)
             subnets = [str(cidr)] if cidr.prefixlen != 0 else DEFAULT_SUBNETS
             for sub in subnets:
                 ext_sub = aim_resource.ExternalSubnet(
                     tenant_name=ext_net.tenant_name,
                     l3out_name=ext_net.l3out_name,
                     external_network_name=ext_net.name, cidr=sub)
-                ext_sub_db = self.aim.get(aim_ctx, ext_sub)
+                ext_sub_db = aim_mgr.get(aim_ctx, ext_sub)
                 if not ext_sub_db:
-                    self.aim.create(aim_ctx, ext_sub)
+                    aim_mgr.create(aim_ctx, ext_sub)
             return ext_net_db
         else:
             return self.aim_mech._get_epg_by_network_id(plugin_context.session,
@@ -635,15 +695,16 @@ class SfcAIMDriver(SfcAIMDriverBase):
         flc_aid = self._get_external_group_aim_name(plugin_context, flowc,
                                                     prefix)
         aim_ctx = aim_context.AimContext(plugin_context.session)
+        aim_mgr = self._get_aim_manager(plugin_context)
         l3out = self.aim_mech._get_svi_net_l3out(net)
         ext_net = None
         if l3out:
             ext_net = aim_resource.ExternalNetwork(
                 tenant_name=l3out.tenant_name, l3out_name=l3out.name,
                 name=flc_aid)
-            epg = self.aim.get(aim_ctx, ext_net)
+            epg = aim_mgr.get(aim_ctx, ext_net)
         else:
-            epg = self.aim.get(aim_ctx, self.aim_mech._get_epg_by_network_id(
+            epg = aim_mgr.get(aim_ctx, self.aim_mech._get_epg_by_network_id(
                 plugin_context.session, net['id']))
         if epg:
             p_group = self._get_flowc_provider_group(plugin_context, flowc)
@@ -658,41 +719,96 @@ class SfcAIMDriver(SfcAIMDriverBase):
                 LOG.warning("Contract %(name)s not present in EPG %(epg)s",
                             {'name': contract.name, 'epg': epg})
             else:
-                epg = self.aim.create(aim_ctx, epg, overwrite=True)
+                epg = aim_mgr.create(aim_ctx, epg, overwrite=True)
             if (ext_net and not epg.consumed_contract_names and not
                     epg.provided_contract_names):
                 # Only remove external network if completely empty
-                self.aim.delete(aim_ctx, epg, cascade=True)
+                aim_mgr.delete(aim_ctx, epg, cascade=True)
 
     def _get_chains_by_classifier_id(self, plugin_context, flowc_id):
         context = plugin_context
         with db_api.CONTEXT_WRITER.using(context):
-            query = BAKERY(lambda s: s.query(
-                sfc_db.ChainClassifierAssoc))
-            query += lambda q: q.filter_by(
-                flowclassifier_id=sa.bindparam('flowc_id'))
-            chain_ids = [x.portchain_id for x in query(context.session).params(
-                flowc_id=flowc_id).all()]
-
+            chain_ids = self._get_chain_ids_by_classifier_ids(context,
+                                                              [flowc_id])
             return self.sfc_plugin.get_port_chains(plugin_context,
                                                    filters={'id': chain_ids})
 
+    def _get_chain_ids_by_classifier_ids(self, plugin_context, flowc_ids):
+        if not flowc_ids:
+            return []
+        query = BAKERY(lambda s: s.query(
+            sfc_db.ChainClassifierAssoc.portchain_id))
+        query += lambda q: q.filter(
+            sfc_db.ChainClassifierAssoc.flowclassifier_id.in_(
+                sa.bindparam('flowc_ids', expanding=True)))
+        query += lambda q: q.distinct()
+        return [x for x, in query(plugin_context.session).params(
+            flowc_ids=list(flowc_ids)).all()]
+
     def _get_chains_by_ppg_ids(self, plugin_context, ppg_ids):
         if not ppg_ids:
             return []
         context = plugin_context
         with db_api.CONTEXT_WRITER.using(context):
-            query = BAKERY(lambda s: s.query(
-                sfc_db.ChainGroupAssoc))
-            query += lambda q: q.filter(
-                sfc_db.ChainGroupAssoc.portpairgroup_id.in_(
-                    sa.bindparam('ppg_ids', expanding=True)))
-            chain_ids = [x.portchain_id for x in query(context.session).params(
-                ppg_ids=ppg_ids).all()]
-
+            chain_ids = self._get_chain_ids_by_ppg_ids(context, ppg_ids)
             return self.sfc_plugin.get_port_chains(plugin_context,
                                                    filters={'id': chain_ids})
 
+    def _get_chain_ids_by_ppg_ids(self, plugin_context, ppg_ids):
+        if not ppg_ids:
+            return []
+        query = BAKERY(lambda s: s.query(
+            sfc_db.ChainGroupAssoc.portchain_id))
+        query += lambda q: q.filter(
+            sfc_db.ChainGroupAssoc.portpairgroup_id.in_(
+                sa.bindparam('ppg_ids', expanding=True)))
+        query += lambda q: q.distinct()
+        return [x for x, in query(plugin_context.session).params(
+            ppg_ids=list(ppg_ids)).all()]
+
+    def _get_chains_by_network_id(self, plugin_context, network_id,
+                                  include_ppgs=True):
+        """Return the chains depending on a network.
+
+        These are the chains with a classifier on the network and, if
+        include_ppgs is set, the chains with a PPG having ports on it.
+        """
+        context = plugin_context
+        with db_api.CONTEXT_WRITER.using(context):
+            chain_ids = set(self._get_chain_ids_by_classifier_ids(
+                context, self.aim_flowc._get_classifiers_by_network_id(
+                    context, network_id)))
+            if include_ppgs:
+                chain_ids.update(self._get_chain_ids_by_ppg_ids(
+                    context, self._get_group_ids_by_network_ids(
+                        context, [network_id])))
+            if not chain_ids:
+                return []
+            return self.sfc_plugin.get_port_chains(
+                plugin_context, filters={'id': list(chain_ids)})
+
+    def _get_port_pairs_with_peer_state(self, plugin_context, port_id):
+        """Return the port pairs of a port along with their peer's state.
+
+        Returns (port pair DB object, peer VIF type, peer status) tuples,
+        retrieved by a single query. The list is empty for the ports not
+        member of any port pair.
+        """
+        query = BAKERY(lambda s: s.query(
+            sfc_db.PortPair, ml2_models.PortBinding.vif_type,
+            models_v2.Port.status))
+        query += lambda q: q.join(
+            models_v2.Port,
+            or_(sa.and_(sfc_db.PortPair.ingress == sa.bindparam('port_id'),
+                        models_v2.Port.id == sfc_db.PortPair.egress),
+                sa.and_(sfc_db.PortPair.egress == sa.bindparam('port_id'),
+                        models_v2.Port.id == sfc_db.PortPair.ingress)))
+        query += lambda q: q.outerjoin(
+            ml2_models.PortBinding,
+            sa.and_(ml2_models.PortBinding.port_id == models_v2.Port.id,
+                    ml2_models.PortBinding.status == n_constants.ACTIVE))
+        return query(plugin_context.session).params(port_id=port_id).all()
+
     def _get_groups_by_pair_id(self, plugin_context, pp_id):
         # NOTE(ivar): today, port pair can be associated only to one PPG
         context = plugin_context
@@ -709,7 +825,7 @@ class SfcAIMDriver(SfcAIMDriverBase):
         session = plugin_context.session
 
         query = BAKERY(lambda s: s.query(
-            sfc_db.PortPair))
+            sfc_db.PortPair.portpairgroup_id))
         query += lambda q: q.join(
             models_v2.Port,
             or_(models_v2.Port.id == sfc_db.PortPair.ingress,
@@ -717,9 +833,9 @@ class SfcAIMDriver(SfcAIMDriverBase):
         query += lambda q: q.filter(
             models_v2.Port.network_id.in_(
                 sa.bindparam('network_ids', expanding=True)))
-        return [x.portpairgroup_id for x in
-                query(session).params(
-                    network_ids=network_ids).all()]
+        query += lambda q: q.distinct()
+        return [x for x, in query(session).params(
+            network_ids=network_ids).all() if x]
 
     def _should_regenerate_pp(self, context):
         attrs = [INGRESS, EGRESS, 'name']
@@ -893,43 +1009,48 @@ class SfcAIMDriver(SfcAIMDriverBase):
             if c_bound and c_active and ((c_host != o_host) or
                                          (c_bound != o_bound) or
                                          (c_active != o_active)):
+                pps = self._get_port_pairs_with_peer_state(p_ctx, port_id)
+                if not pps:
+                    # Not a service port.
+                    return
                 LOG.debug("Update port pair for port %s", context.current)
-                pps = self.sfc_plugin.get_port_pairs(
-                    p_ctx, filters={'ingress': [port_id]})
-                pps.extend(self.sfc_plugin.get_port_pairs(
-                    p_ctx, filters={'egress': [port_id]}))
-                for pp in pps:
+                groups = {}
+                for pp, other_vif_type, other_status in pps:
                     # Only update if both ports are bound
-                    other = pp['ingress'] if pp['ingress'] != port_id else (
-                        pp['egress'])
-                    other = self.plugin.get_port(p_ctx, other)
-                    other_bound = self.aim_mech._is_port_bound(other)
-                    other_active = other.get(
-                        'status') == n_constants.PORT_STATUS_ACTIVE
+                    other_bound = (
+                        other_vif_type is not None and
+                        self.aim_mech._is_port_bound(
+                            {portbindings.VIF_TYPE: other_vif_type}))
+                    other_active = (
+                        other_status == n_constants.PORT_STATUS_ACTIVE)
                     if other_bound and other_active:
+                        pp = self.sfc_plugin._make_port_pair_dict(pp)
                         d_ctx = sfc_ctx.PortPairContext(self.sfc_plugin, p_ctx,
                                                         pp, pp)
-                        self.update_port_pair_precommit(d_ctx, remap=True)
+                        self._validate_port_pair(d_ctx)
+                        for group in self._get_groups_by_pair_id(p_ctx,
+                                                                 pp['id']):
+                            groups[group['id']] = group
+                # NOTE: binding a port doesn't change its network, so the
+                # chains using these groups don't need to be validated nor
+                # remapped, only the groups' own AIM objects.
+                for group in groups.values():
+                    g_ctx = sfc_ctx.PortPairGroupContext(
+                        self.sfc_plugin, p_ctx, group, group)
+                    self._validate_port_pair_group(g_ctx)
+                    self._remap_port_pair_group(p_ctx, group)
 
     @registry.receives(constants.GBP_NETWORK_EPG, [events.PRECOMMIT_UPDATE])
     @registry.receives(constants.GBP_NETWORK_VRF, [events.PRECOMMIT_UPDATE])
     def _handle_net_gbp_change(self, rtype, event, trigger, context,
                                network_id, **kwargs):
-        chains = {}
-        ppg_ids = self._get_group_ids_by_network_ids(context, [network_id])
-        flowc_ids = self.aim_flowc._get_classifiers_by_network_id(
-            context, network_id)
-        for flowc_id in flowc_ids:
-            for chain in self._get_chains_by_classifier_id(context,
-                                                           flowc_id):
-                chains[chain['id']] = chain
-        if rtype == constants.GBP_NETWORK_VRF:
-            # Don't need to check PPGs if the EPG is changing
-            for ppg_id in ppg_ids:
-                for chain in self._get_chains_by_ppg_ids(context, [ppg_id]):
-                    chains[chain['id']] = chain
-        for chain in chains.values():
-            flowcs, ppgs = self._get_pc_flowcs_and_ppgs(context, chain)
+        # Don't need to check PPGs if the EPG is changing
+        chains = self._get_chains_by_network_id(
+            context, network_id,
+            include_ppgs=(rtype == constants.GBP_NETWORK_VRF))
+        chain_resources = self._get_pcs_flowcs_and_ppgs(context, chains)
+        for chain in chains:
+            flowcs, ppgs = chain_resources[chain['id']]
             self._validate_port_chain(context, chain, flowcs, ppgs)
 
     @registry.receives(constants.GBP_NETWORK_LINK, [events.PRECOMMIT_UPDATE])
@@ -969,18 +1090,35 @@ class SfcAIMDriver(SfcAIMDriverBase):
             plugin_context, flowc['l7_parameters'][sfc_cts.LOGICAL_DST_NET])
 
     def _get_pc_flowcs_and_ppgs(self, plugin_context, pc):
-        flowcs = self.flowc_plugin.get_flow_classifiers(
-            plugin_context, filters={'id': pc['flow_classifiers']})
-        unordered_ppgs = self.sfc_plugin.get_port_pair_groups(
-            plugin_context, filters={'id': pc['port_pair_groups']})
-        # Keep order
-        ppgs = []
-        for ppg_id in pc['port_pair_groups']:
-            for ppg in unordered_ppgs:
-                if ppg['id'] == ppg_id:
-                    ppgs.append(ppg)
-                    break
-        return flowcs, ppgs
+        return self._get_pcs_flowcs_and_ppgs(plugin_context, [pc])[pc['id']]
+
+    def _get_pcs_flowcs_and_ppgs(self, plugin_context, pcs):
+        """Return the (flowcs, ppgs) of each chain, keyed by chain ID.
+
+        The resources of all the chains are retrieved at once, and the PPGs
+        are returned in chain order.
+        """
+        flowc_ids = set()
+        ppg_ids = set()
+        for pc in pcs:
+            flowc_ids.update(pc['flow_classifiers'])
+            ppg_ids.update(pc['port_pair_groups'])
+        flowcs = {}
+        if flowc_ids:
+            flowcs = dict(
+                (x['id'], x) for x in self.flowc_plugin.get_flow_classifiers(
+                    plugin_context, filters={'id': list(flowc_ids)}))
+        ppgs = {}
+        if ppg_ids:
+            ppgs = dict(
+                (x['id'], x) for x in self.sfc_plugin.get_port_pair_groups(
+                    plugin_context, filters={'id': list(ppg_ids)}))
+        return dict(
+            (pc['id'], ([flowcs[x] for x in pc['flow_classifiers']
+                         if x in flowcs],
+                        [ppgs[x] for x in pc['port_pair_groups']
+                         if x in ppgs]))
+            for pc in pcs)
 
     def _get_flowc_network_group(self, plugin_context, flowc, net, prefix):
         flc_aid = self._get_external_group_aim_name(plugin_context, flowc,
@@ -1009,15 +1147,17 @@ class SfcAIMDriver(SfcAIMDriverBase):
 
     def _map_flowc_provider_group(self, plugin_context, flowc):
         aim_ctx = aim_context.AimContext(plugin_context.session)
+        aim_mgr = self._get_aim_manager(plugin_context)
         net = self._get_flowc_dst_network(plugin_context, flowc)
-        return self.aim.get(aim_ctx, self._map_flowc_network_group(
+        return aim_mgr.get(aim_ctx, self._map_flowc_network_group(
             plugin_context, net, flowc['destination_ip_prefix'], flowc,
             FLOWC_DST))
 
     def _map_flowc_consumer_group(self, plugin_context, flowc):
         aim_ctx = aim_context.AimContext(plugin_context.session)
+        aim_mgr = self._get_aim_manager(plugin_context)
         net = self._get_flowc_src_network(plugin_context, flowc)
-        return self.aim.get(aim_ctx, self._map_flowc_network_group(
+        return aim_mgr.get(aim_ctx, self._map_flowc_network_group(
             plugin_context, net, flowc['source_ip_prefix'], flowc, FLOWC_SRC))
 
     def _get_flowc_provider_vrf(self, plugin_context, flowc):
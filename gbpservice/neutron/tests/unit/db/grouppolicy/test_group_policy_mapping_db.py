@@ -208,6 +208,66 @@ class TestMappedGroupResourceAttrs(GroupPolicyMappingDbTestCase):
                     self.assertEqual(webob.exc.HTTPNoContent.code,
                                      res.status_int)
 
+    def test_get_l3p_ids_from_router_ids(self):
+        ctx = nctx.get_admin_context()
+        with self.router() as router1:
+            with self.router() as router2:
+                with self.router() as router3:
+                    router_ids = [router1['router']['id'],
+                                  router2['router']['id'],
+                                  router3['router']['id']]
+                    l3p1 = self.create_l3_policy(
+                        routers=router_ids[:2])['l3_policy']
+                    l3p2 = self.create_l3_policy(
+                        routers=router_ids[2:])['l3_policy']
+                    self.assertEqual(
+                        {router_ids[0]: l3p1['id'],
+                         router_ids[1]: l3p1['id'],
+                         router_ids[2]: l3p2['id']},
+                        self._gbp_plugin.get_l3p_ids_from_router_ids(
+                            ctx, router_ids))
+                    self.assertEqual(
+                        {}, self._gbp_plugin.get_l3p_ids_from_router_ids(
+                            ctx, ['unknown']))
+                    for l3p in (l3p1, l3p2):
+                        self.delete_l3_policy(l3p['id'])
+
+    def test_subnet_reverse_lookups(self):
+        ctx = nctx.get_admin_context()
+        with self.subnet(cidr='10.10.1.0/24') as subnet1:
+            with self.subnet(cidr='10.10.2.0/24') as subnet2:
+                subnet_ids = [subnet1['subnet']['id'],
+                              subnet2['subnet']['id']]
+                l3p = self.create_l3_policy()['l3_policy']
+                l2p = self.create_l2_policy(
+                    l3_policy_id=l3p['id'])['l2_policy']
+                ptg1 = self.create_policy_target_group(
+                    l2_policy_id=l2p['id'],
+                    subnets=subnet_ids)['policy_target_group']
+                ptg2 = self.create_policy_target_group(
+                    l2_policy_id=l2p['id'],
+                    subnets=subnet_ids[1:])['policy_target_group']
+                self.assertEqual(
+                    [ptg1['id']],
+                    self._gbp_plugin._get_ptgs_for_subnet(ctx, subnet_ids[0]))
+                ptgs_by_subnet = self._gbp_plugin._get_ptgs_for_subnets(
+                    ctx, subnet_ids)
+                self.assertEqual([ptg1['id']], ptgs_by_subnet[subnet_ids[0]])
+                self.assertEqual(sorted([ptg1['id'], ptg2['id']]),
+                                 sorted(ptgs_by_subnet[subnet_ids[1]]))
+                self.assertEqual(
+                    sorted(subnet_ids + subnet_ids[1:]),
+                    sorted(self._gbp_plugin._get_l3p_subnet_ids(
+                        ctx, l3p['id'])))
+
+                self._gbp_plugin._remove_subnets_from_policy_target_groups(
+                    ctx, subnet_ids[1:])
+                self.assertEqual(
+                    {subnet_ids[0]: [ptg1['id']]},
+                    self._gbp_plugin._get_ptgs_for_subnets(ctx, subnet_ids))
+                for ptg in (ptg1, ptg2):
+                    self.delete_policy_target_group(ptg['id'])
+
     def test_create_delete_es_with_subnet(self):
         with self.subnet(cidr='10.10.1.0/24') as subnet:
             subnet_id = subnet['subnet']['id']
@@ -334,6 +334,76 @@ class NFPDBTestCase(SqlTestCase):
                               self.session,
                               port_id)
 
+    def test_get_network_function_context(self):
+        network_function_instance = self.create_network_function_instance()
+        nf_context = self.nfp_db.get_network_function_context(
+            self.session, network_function_instance['network_function_id'])
+        self.assertEqual(network_function_instance['id'],
+                         nf_context['network_function_instance']['id'])
+        self.assertEqual(
+            [network_function_instance['id']],
+            nf_context['network_function']['network_function_instances'])
+        self.assertEqual(
+            network_function_instance['network_function_device_id'],
+            nf_context['network_function_device']['id'])
+        self.assertEqual(
+            set(['myportid1', 'myportid2', 'myid1', 'myid1_ha_port']),
+            set(nf_context['port_infos']))
+        self.assertEqual(
+            self.nfp_db.get_port_info(self.session, 'myportid1'),
+            nf_context['port_infos']['myportid1'])
+
+    def test_get_network_function_context_without_instance(self):
+        network_function = self.create_network_function()
+        nf_context = self.nfp_db.get_network_function_context(
+            self.session, network_function['id'])
+        self.assertEqual(network_function['id'],
+                         nf_context['network_function']['id'])
+        self.assertIsNone(nf_context['network_function_instance'])
+        self.assertIsNone(nf_context['network_function_device'])
+        self.assertEqual({}, nf_context['port_infos'])
+        self.assertRaises(nfp_exc.NetworkFunctionNotFound,
+                          self.nfp_db.get_network_function_context,
+                          self.session, 'nonexisting')
+
+    def test_network_function_context_cache(self):
+        network_function_instance = self.create_network_function_instance()
+        network_function_id = network_function_instance['network_function_id']
+        cache = nfp_db.NetworkFunctionContextCache()
+        loader = mock.Mock(side_effect=lambda: (
+            self.nfp_db.get_network_function_context(
+                self.session, network_function_id)))
+        nf_context = cache.get(network_function_id, loader, 60)
+        self.assertEqual(nf_context,
+                         cache.get(network_function_id, loader, 60))
+        self.assertEqual(1, loader.call_count)
+
+        self.nfp_db.update_network_function_instance(
+            self.session, network_function_instance['id'],
+            {'status': 'ERROR'})
+        nf_context = cache.get(network_function_id, loader, 60)
+        self.assertEqual(2, loader.call_count)
+        self.assertEqual('ERROR',
+                         nf_context['network_function_instance']['status'])
+
+        cache.get(network_function_id, loader, 0)
+        self.assertEqual(3, loader.call_count)
+
+    def test_context_version_bumped_on_commit(self):
+        network_function_instance = self.create_network_function_instance()
+        network_function_id = network_function_instance['network_function_id']
+        version = nfp_db.NFPDbBase.get_context_version(network_function_id)
+        with self.session.begin(subtransactions=True):
+            self.nfp_db.update_network_function_instance(
+                self.session, network_function_instance['id'],
+                {'status': 'ERROR'})
+            self.assertEqual(
+                version,
+                nfp_db.NFPDbBase.get_context_version(network_function_id))
+        self.assertNotEqual(
+            version,
+            nfp_db.NFPDbBase.get_context_version(network_function_id))
+
     def create_network_function_device(self, attributes=None):
         if attributes is None:
             attributes = {
@@ -480,6 +550,60 @@ class NFPDBTestCase(SqlTestCase):
             self.session, filters=filters)
         self.assertEqual([], network_function_devices)
 
+    def test_get_shareable_network_function_devices(self):
+        attrs = {
+            'name': 'name',
+            'tenant_id': 'tenant_id',
+            'mgmt_ip_address': 'mgmt_ip_address',
+            'service_vendor': 'service_vendor',
+            'max_interfaces': 3,
+            'reference_count': 1,
+            'interfaces_in_use': 2,
+            'status': 'ACTIVE'
+        }
+        busy = self.create_network_function_device(attrs)
+        free = self.create_network_function_device(
+            dict(attrs, interfaces_in_use=0))
+        self.create_network_function_device(dict(attrs, status='ERROR'))
+        self.create_network_function_device(
+            dict(attrs, service_vendor='other'))
+
+        devices = self.nfp_db.get_shareable_network_function_devices(
+            self.session, 'tenant_id', 'service_vendor', 1)
+        self.assertEqual([free['id'], busy['id']],
+                         [device['id'] for device in devices])
+        devices = self.nfp_db.get_shareable_network_function_devices(
+            self.session, 'tenant_id', 'service_vendor', 2)
+        self.assertEqual([free['id']], [device['id'] for device in devices])
+        devices = self.nfp_db.get_shareable_network_function_devices(
+            self.session, 'other_tenant', 'service_vendor', 1)
+        self.assertEqual([], devices)
+
+    def test_update_network_function_device_count(self):
+        network_function_device = self.create_network_function_device()
+        nfd_id = network_function_device['id']
+        self.nfp_db.increment_network_function_device_count(
+            self.session, nfd_id, 'interfaces_in_use', 2)
+        self.nfp_db.decrement_network_function_device_count(
+            self.session, nfd_id, 'reference_count')
+        network_function_device = self.nfp_db.get_network_function_device(
+            self.session, nfd_id)
+        self.assertEqual(3, network_function_device['interfaces_in_use'])
+        self.assertEqual(1, network_function_device['reference_count'])
+        self.assertRaises(nfp_exc.NetworkFunctionDeviceNotFound,
+                          self.nfp_db.increment_network_function_device_count,
+                          self.session, 'nonexisting', 'reference_count')
+
+    def test_after_commit(self):
+        callback = mock.Mock()
+        with self.session.begin(subtransactions=True):
+            with self.session.begin(subtransactions=True):
+                self.nfp_db._after_commit(self.session, callback, 'nf')
+            self.assertFalse(callback.called)
+        callback.assert_called_once_with('nf')
+        self.nfp_db._after_commit(self.session, callback, 'nf')
+        self.assertEqual(2, callback.call_count)
+
     def test_update_network_function_device(self):
         attrs = {
             'name': 'name',
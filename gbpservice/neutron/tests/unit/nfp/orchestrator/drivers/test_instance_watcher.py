@@ -0,0 +1,101 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+import unittest2
+
+from gbpservice.nfp.orchestrator.drivers import instance_watcher
+
+
+class InstanceStatusWatcherTestCase(unittest2.TestCase):
+
+    def setUp(self):
+        super(InstanceStatusWatcherTestCase, self).setUp()
+        self.nova = mock.MagicMock()
+        self.nova.get_instances.return_value = [
+            {'id': 'vm1', 'status': 'BUILD'},
+            {'id': 'vm2', 'status': 'ACTIVE'}]
+        self.nova.get_instance.side_effect = Exception('Not found')
+
+    def _get_status(self, watcher, now, instance_id, tenant_id='tenant'):
+        with mock.patch.object(instance_watcher.time, 'time',
+                               return_value=now):
+            return watcher.get_status('token', tenant_id, instance_id)
+
+    def test_statuses_listed_once_per_interval(self):
+        watcher = instance_watcher.InstanceStatusWatcher(self.nova, 10)
+        self.assertEqual('BUILD', self._get_status(watcher, 1000, 'vm1'))
+        self.assertEqual('ACTIVE', self._get_status(watcher, 1000, 'vm2'))
+        # Not listed, got individually rather than deemed deleted
+        self.assertRaises(Exception, self._get_status, watcher, 1000, 'vm3')
+        self.nova.get_instance.assert_called_once_with(
+            'token', 'tenant', 'vm3')
+        self.nova.get_instances.assert_called_once_with(
+            'token', filters={'tenant_id': 'tenant'}, limit=-1)
+
+        self.nova.get_instances.return_value = [
+            {'id': 'vm1', 'status': 'ACTIVE'}]
+        self.assertEqual('ACTIVE', self._get_status(watcher, 1010, 'vm1'))
+        self.assertRaises(Exception, self._get_status, watcher, 1010, 'vm2')
+        self.assertEqual(2, self.nova.get_instances.call_count)
+
+        # Listed before being asked for, got individually
+        self.nova.get_instance.side_effect = None
+        self.nova.get_instance.return_value = {'id': 'vm4',
+                                               'status': 'BUILD'}
+        self.assertEqual('BUILD', self._get_status(watcher, 1015, 'vm4'))
+        self.nova.get_instance.assert_called_with('token', 'tenant', 'vm4')
+        self.assertEqual(2, self.nova.get_instances.call_count)
+
+        # Each tenant has its own listing
+        self._get_status(watcher, 1015, 'vm5', tenant_id='other_tenant')
+        self.nova.get_instances.assert_called_with(
+            'token', filters={'tenant_id': 'other_tenant'}, limit=-1)
+
+    def test_unwatched_instances_pruned(self):
+        self.nova.get_instance.side_effect = None
+        self.nova.get_instance.return_value = {'id': 'vm6',
+                                               'status': 'BUILD'}
+        watcher = instance_watcher.InstanceStatusWatcher(self.nova, 10)
+        self._get_status(watcher, 1000, 'vm1')
+        self._get_status(watcher, 1000, 'vm2')
+        self._get_status(watcher, 1000, 'vm6', tenant_id='other_tenant')
+        self._get_status(watcher, 1050, 'vm1')
+        self._get_status(watcher, 1101, 'vm1')
+        self.assertEqual(['vm1'], list(watcher._watched))
+        self.assertEqual(['tenant'], list(watcher._listings))
+
+    @mock.patch.object(instance_watcher.InstanceStatusWatcher,
+                       '_start_listener')
+    def test_statuses_from_notifications(self, start_listener):
+        watcher = instance_watcher.InstanceStatusWatcher(
+            self.nova, 10, notifications=True)
+        endpoint = instance_watcher.InstanceNotificationEndpoint(watcher)
+        # Not waited on, ignored
+        endpoint.info({}, 'compute', 'compute.instance.update',
+                      {'instance_id': 'vm3', 'state': 'active'}, {})
+
+        self.assertEqual('BUILD', watcher.get_status('token', 'tenant', 'vm1'))
+        self.assertTrue(start_listener.called)
+        self.nova.get_instances.reset_mock()
+        endpoint.info({}, 'compute', 'compute.instance.update',
+                      {'instance_id': 'vm1', 'state': 'active'}, {})
+        self.assertEqual('ACTIVE',
+                         watcher.get_status('token', 'tenant', 'vm1'))
+        endpoint.info({}, 'compute', 'compute.instance.delete.end',
+                      {'instance_id': 'vm1', 'state': 'active'}, {})
+        self.assertIsNone(watcher.get_status('token', 'tenant', 'vm1'))
+        self.assertFalse(self.nova.get_instances.called)
+        self.assertEqual({}, watcher._notified)
+        self.assertNotIn('vm1', watcher._watched)
+        self.assertRaises(Exception, watcher.get_status, 'token', 'tenant',
+                          'vm3')
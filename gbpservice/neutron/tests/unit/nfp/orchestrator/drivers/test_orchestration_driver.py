@@ -25,6 +25,8 @@ from gbpservice.nfp.orchestrator.drivers import (
 
 
 cfg.CONF.import_group('keystone_authtoken', 'keystonemiddleware.auth_token')
+cfg.CONF.import_group('device_orchestrator',
+                      'gbpservice.nfp.orchestrator.modules')
 OPENSTACK_DRIVER_CLASS_PATH = ('gbpservice.nfp.orchestrator'
                                '.openstack.openstack_driver')
 NFP_GBP_NETWORK_DRIVER_CLASS_PATH = ('gbpservice.nfp.orchestrator'
@@ -124,6 +126,65 @@ class OrchestrationDriverTestCase(unittest2.TestCase):
                  ' create_network_function_device call'
                  ' is not a dictionary'))
 
+    def test_create_network_function_device_no_hotplug_calls(self):
+        driver = orchestration_driver.OrchestrationDriver(
+            cfg.CONF,
+            supports_device_sharing=True,
+            supports_hotplug=False,
+            max_interfaces=8)
+        network_handler = driver.network_handlers['gbp']
+        driver._update_provider_metadata_fast = mock.MagicMock(
+            return_value={'supports_hotplug': False})
+        network_handler.create_port = mock.MagicMock(
+            return_value={'id': '1', 'port_id': '2'})
+        network_handler.get_port_ids = mock.MagicMock(
+            return_value={'3': '7', '4': '8', '5': '9'})
+        network_handler.get_port_id = mock.MagicMock()
+        network_handler.set_promiscuos_mode = mock.MagicMock()
+        network_handler.set_promiscuos_mode_fast = mock.MagicMock()
+        network_handler.get_neutron_port_details = mock.MagicMock(
+            return_value=(1, 2, 3, 4, {'port': {}}, {'subnet': {}}))
+        driver.compute_handler_nova.get_image_id = mock.MagicMock(
+            return_value='6')
+        driver.compute_handler_nova.create_instance = mock.MagicMock(
+            return_value='10')
+
+        device_data = {'service_details': {'device_type': 'nova',
+                                           'service_type': 'firewall',
+                                           'service_vendor': 'vyos',
+                                           'network_mode': 'gbp'},
+                       'name': 'FIREWALL.vyos.1.2',
+                       'volume_support': None,
+                       'volume_size': None,
+                       'management_network_info': {'id': '2'},
+                       'interfaces_to_attach': [],
+                       'ports': [{'id': '4',
+                                  'port_model': 'gbp',
+                                  'port_classification': 'consumer'},
+                                 {'id': '3',
+                                  'port_model': 'gbp',
+                                  'port_classification': 'provider'},
+                                 {'id': '5',
+                                  'port_model': 'gbp',
+                                  'port_classification': 'consumer'}],
+                       'token': 'token',
+                       'admin_tenant_id': 'admin_tenant_id'}
+        self.assertIsInstance(
+            driver.create_network_function_device(device_data), dict)
+
+        # The PTs of all the ports are resolved with a single lookup
+        network_handler.get_port_ids.assert_called_once_with(
+            'token', ['3', '4', '5'])
+        self.assertFalse(network_handler.get_port_id.called)
+        self.assertFalse(network_handler.set_promiscuos_mode.called)
+        self.assertEqual(
+            ['7', '8', '9'],
+            [call[0][1] for call in
+             network_handler.set_promiscuos_mode_fast.call_args_list])
+        self.assertEqual(
+            [{'port': '2'}, {'port': '7'}, {'port': '8'}, {'port': '9'}],
+            driver.compute_handler_nova.create_instance.call_args[0][4])
+
     def test_delete_network_function_device(self):
         driver = orchestration_driver.OrchestrationDriver(
             cfg.CONF,
@@ -171,8 +232,9 @@ class OrchestrationDriverTestCase(unittest2.TestCase):
             return_value='8')
         driver.identity_handler.get_keystone_creds = mock.MagicMock(
             return_value=(None, None, 'admin', None))
-        driver.compute_handler_nova.get_instance = mock.MagicMock(
-            return_value={'status': 'ACTIVE'})
+        driver.compute_handler_nova.get_instances = mock.MagicMock(
+            return_value=[{'id': '1', 'status': 'ACTIVE'},
+                          {'id': '2', 'status': 'BUILD'}])
 
         device_data = {'id': '1',
                        'service_details': {'device_type': 'xyz',
@@ -190,6 +252,20 @@ class OrchestrationDriverTestCase(unittest2.TestCase):
         self.assertEqual(
             driver.get_network_function_device_status(device_data), 'ACTIVE')
 
+        # The statuses of the other devices come from the same listing
+        device_data['id'] = '2'
+        self.assertEqual(
+            driver.get_network_function_device_status(device_data), 'BUILD')
+        # The others are got individually, and are deleted if not found
+        driver.compute_handler_nova.get_instance = mock.MagicMock(
+            side_effect=Exception('Not found'))
+        device_data['id'] = '3'
+        self.assertIsNone(
+            driver.get_network_function_device_status(device_data))
+        driver.compute_handler_nova.get_instances.assert_called_once_with(
+            device_data['token'],
+            filters={'tenant_id': device_data['tenant_id']}, limit=-1)
+
     def test_plug_network_function_device_interfaces(self):
         driver = orchestration_driver.OrchestrationDriver(
             cfg.CONF,
@@ -275,6 +351,60 @@ class OrchestrationDriverTestCase(unittest2.TestCase):
             device_data),
             msg='')
 
+    def test_unplug_network_function_device_interfaces_calls(self):
+        driver = orchestration_driver.OrchestrationDriver(
+            cfg.CONF,
+            supports_device_sharing=True,
+            supports_hotplug=False,
+            max_interfaces=8)
+        network_handler = driver.network_handlers['gbp']
+        network_handler.network_handler = mock.MagicMock()
+        gbp_cli = network_handler.network_handler
+        gbp_cli.get_policy_target_groups.return_value = [{'id': 'ptg2'}]
+        gbp_cli.get_l2_policys.return_value = [
+            {'id': 'l2p1', 'description': 'Implicitly created L2 policy'},
+            {'id': 'l2p3', 'description': ''}]
+        driver._update_provider_metadata_fast = mock.MagicMock(
+            return_value={})
+        driver._delete_port = mock.MagicMock()
+        driver.compute_handler_nova.detach_interface = mock.MagicMock()
+
+        device_data = {'id': '1',
+                       'tenant_id': 'tenant_id',
+                       'token': 'token',
+                       'service_details': {'device_type': 'nova',
+                                           'service_type': 'firewall',
+                                           'service_vendor': 'vyos',
+                                           'network_mode': 'gbp'},
+                       'ports': [{'id': 'pt1',
+                                  'port_model': 'gbp',
+                                  'port_classification': 'provider'},
+                                 {'id': 'pt2',
+                                  'port_model': 'gbp',
+                                  'port_classification': 'consumer'}],
+                       'provider': {
+                           'pt': [{'id': 'pt1', 'port_id': 'port1'}],
+                           'ptg': [{'id': 'ptg1', 'l2_policy_id': 'l2p1'}]},
+                       'consumer': {
+                           'pt': [{'id': 'pt2', 'port_id': 'port2'}],
+                           'ptg': [{'id': 'ptg2', 'l2_policy_id': 'l2p2'},
+                                   {'id': 'ptg3', 'l2_policy_id': 'l2p3'}]}}
+
+        self.assertTrue(driver.unplug_network_function_device_interfaces(
+            device_data))
+        self.assertEqual(
+            ['port1', 'port2'],
+            [call[0][3] for call in
+             driver.compute_handler_nova.detach_interface.call_args_list])
+        # The PTGs and L2 policies are looked up with a call each
+        gbp_cli.get_policy_target_groups.assert_called_once_with(
+            'token', filters={'id': ['ptg1', 'ptg2', 'ptg3']})
+        gbp_cli.get_l2_policys.assert_called_once_with(
+            'token', filters={'id': ['l2p1', 'l2p3']})
+        self.assertFalse(gbp_cli.get_policy_target_group.called)
+        self.assertFalse(gbp_cli.get_l2_policy.called)
+        gbp_cli.delete_l2_policy.assert_called_once_with('token', 'l2p1')
+
     def test_get_network_function_device_healthcheck_info(self):
         driver = orchestration_driver.OrchestrationDriver(
             cfg.CONF,
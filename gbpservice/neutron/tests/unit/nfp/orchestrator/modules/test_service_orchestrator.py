@@ -149,6 +149,16 @@ class NSORpcHandlerTestCase(NSOModuleTestCase):
             mock_handle_policy_target_removed.assert_called_once_with(
                 "context", "network_function_id", "policy_target")
 
+    @mock.patch.object(nso.ServiceOrchestrator,
+                       "handle_policy_target_added")
+    def test_rpc_policy_targets_added_notification(
+            self, mock_handle_policy_target_added):
+        with mock.patch.object(identity_client, "Client"):
+            self.rpc_handler.policy_targets_added_notification(
+                "context", "network_function_id", ["pt1", "pt2"])
+            mock_handle_policy_target_added.assert_called_once_with(
+                "context", "network_function_id", "pt2")
+
     @mock.patch.object(
         nso.ServiceOrchestrator, "handle_consumer_ptg_added")
     def test_rpc_consumer_ptg_added_notification(
@@ -187,24 +197,8 @@ class ServiceOrchestratorTestCase(NSOModuleTestCase):
                     'heat_config',
                     'template')))
 
-    @mock.patch.object(
-        openstack_driver.KeystoneClient, "get_admin_tenant_id")
-    @mock.patch.object(
-        openstack_driver.KeystoneClient, "get_admin_token")
-    @mock.patch.object(
-        openstack_driver.GBPClient, "get_service_profile")
-    @mock.patch.object(
-        nso.ServiceOrchestrator, "_create_event")
-    @mock.patch.object(
-        nso.NSOConfiguratorRpcApi, "create_network_function_user_config")
-    def test_create_network_function(self, mock_rpc, mock_create_event,
-                                     mock_get_service_profile,
-                                     mock_get_admin_token,
-                                     mock_get_admin_tenant_id):
-        (self.service_orchestrator.db_handler.
-            update_node_instance_network_function_map) = mock.MagicMock(
-                return_value=None)
-        network_function_info = {
+    def _get_network_function_info(self):
+        return {
             'tenant_id': 'tenant_id',
             'service_chain_id': 'sc_instance_id',
             'service_id': 'sc_node_id',
@@ -231,6 +225,25 @@ class ServiceOrchestratorTestCase(NSOModuleTestCase):
             'service_config': None,
             'network_function_mode': 'gbp'
         }
+
+    @mock.patch.object(
+        openstack_driver.KeystoneClient, "get_admin_tenant_id")
+    @mock.patch.object(
+        openstack_driver.KeystoneClient, "get_admin_token")
+    @mock.patch.object(
+        openstack_driver.GBPClient, "get_service_profile")
+    @mock.patch.object(
+        nso.ServiceOrchestrator, "_create_event")
+    @mock.patch.object(
+        nso.NSOConfiguratorRpcApi, "create_network_function_user_config")
+    def test_create_network_function(self, mock_rpc, mock_create_event,
+                                     mock_get_service_profile,
+                                     mock_get_admin_token,
+                                     mock_get_admin_tenant_id):
+        (self.service_orchestrator.db_handler.
+            update_node_instance_network_function_map) = mock.MagicMock(
+                return_value=None)
+        network_function_info = self._get_network_function_info()
         transport.parse_service_flavor_string = mock.MagicMock(
             return_value={'device_type': 'None',
                           'service_vendor': 'vyos'})
@@ -246,6 +259,81 @@ class ServiceOrchestratorTestCase(NSOModuleTestCase):
         self.assertIsNone(service_config)
         self.assertEqual(network_function, db_network_function)
 
+    @mock.patch.object(
+        openstack_driver.KeystoneClient, "get_admin_tenant_id")
+    @mock.patch.object(
+        openstack_driver.KeystoneClient, "get_admin_token")
+    @mock.patch.object(
+        openstack_driver.GBPClient, "get_service_profile")
+    @mock.patch.object(
+        nso.NSOConfiguratorRpcApi, "create_network_function_user_config")
+    def test_create_network_function_base_mode_fast_path(
+            self, mock_rpc, mock_get_service_profile, mock_get_admin_token,
+            mock_get_admin_tenant_id):
+        cfg.CONF.set_override('base_mode_fast_path', True,
+                              group='orchestrator')
+        (self.service_orchestrator.db_handler.
+            update_node_instance_network_function_map) = mock.MagicMock(
+                return_value=None)
+        transport.parse_service_flavor_string = mock.MagicMock(
+            return_value={'device_type': 'None',
+                          'service_vendor': 'vyos'})
+        config_driver = self.service_orchestrator.config_driver
+        config_driver.parse_template_config_string = mock.MagicMock(
+            return_value=('heat_config', '{}'))
+        self.controller.new_event.side_effect = (
+            lambda **kwargs: NFP_EVENT(**kwargs))
+        config_driver.apply_config = mock.Mock(return_value='stack_id')
+        config_driver.is_config_complete = mock.Mock(
+            return_value=nfp_constants.COMPLETED)
+        mock_handle_event = mock.Mock(
+            wraps=self.service_orchestrator.handle_event)
+        self.service_orchestrator.handle_event = mock_handle_event
+        network_function = self.service_orchestrator.create_network_function(
+            self.context, self._get_network_function_info())
+
+        # Nothing goes through the configurator, the heat config result
+        # is posted right away.
+        self.assertFalse(mock_rpc.called)
+        self.assertEqual(1, self.controller.post_event.call_count)
+        event = self.controller.post_event.call_args[0][0]
+        self.assertEqual('CHECK_HEAT_CONFIG_RESULT', event.id)
+        self.assertEqual(network_function['id'],
+                         event.data['network_function_id'])
+        self.assertTrue(event.data['nfp_context']['base_mode'])
+        self.assertFalse(mock_handle_event.called)
+
+        # Its worker applies the config in-process, and only yields to
+        # poll the heat stack.
+        self.service_orchestrator.handle_event(event)
+        self.assertEqual(
+            ['CHECK_HEAT_CONFIG_RESULT', 'APPLY_USER_CONFIG_BASEMODE'],
+            [call[0][0].id for call in mock_handle_event.call_args_list])
+        self.assertEqual(1, self.controller.post_event.call_count)
+        config_driver.apply_config.assert_called_once_with(mock.ANY)
+        network_function_details = config_driver.apply_config.call_args[0][0]
+        self.assertEqual(network_function['id'],
+                         network_function_details['network_function']['id'])
+        self.assertEqual(1, self.controller.poll_event.call_count)
+        poll_event = self.controller.poll_event.call_args[0][0]
+        self.assertEqual('APPLY_USER_CONFIG_IN_PROGRESS', poll_event.id)
+
+        # The controller hands the polled event its context
+        poll_event.context = nfp_context.get()
+        self.assertEqual(
+            nso.STOP_POLLING,
+            self.service_orchestrator.handle_poll_event(poll_event))
+        config_driver.is_config_complete.assert_called_once_with(
+            'stack_id', network_function['tenant_id'], mock.ANY)
+        self.controller.event_complete.assert_called_once_with(poll_event)
+        self.assertEqual(2, mock_handle_event.call_count)
+        self.assertEqual(1, self.controller.post_event.call_count)
+        self.assertEqual(1, self.controller.poll_event.call_count)
+        db_network_function = self.nfp_db.get_network_function(
+            self.session, network_function['id'])
+        self.assertEqual(nfp_constants.ACTIVE, db_network_function['status'])
+        self.assertEqual('stack_id', db_network_function['config_policy_id'])
+
     def test_validate_create_service_input(self):
         network_function = {}
         self.assertRaises(
@@ -24,6 +24,7 @@ import unittest2
 from gbpclient.v2_0 import client as gbp_client
 from gbpservice.neutron.tests.unit.nfp.orchestrator import mock_dicts
 from gbpservice.nfp.core import log as nfp_logging
+from gbpservice.nfp.lib import nfp_exceptions
 from gbpservice.nfp.orchestrator.config_drivers import (
     heat_client as heat_client)
 from gbpservice.nfp.orchestrator.config_drivers import heat_driver
@@ -143,6 +144,10 @@ class TestHeatDriver(unittest2.TestCase):
         self.assertEqual(resource_owner_tenant_id,
                          expected_resource_owner_tenant_id)
 
+    def _get_subnets(self, token, filters=None):
+        subnet = self.mock_dict.subnets_info['subnets'][0]
+        return [dict(subnet, id=subnet_id) for subnet_id in filters['id']]
+
     def mock_objects(self):
         with mock.patch.object(identity_client, "Client"):
             self.heat_driver_obj = heat_driver.HeatDriver(cfg.CONF)
@@ -154,8 +159,10 @@ class TestHeatDriver(unittest2.TestCase):
                 return_value=self.mock_dict.port_info)
             self.heat_driver_obj.neutron_client.get_floating_ips = (
                 mock.MagicMock(return_value=self.mock_dict.fip))
+            self.heat_driver_obj.neutron_client.get_ports = mock.MagicMock(
+                return_value=[self.mock_dict.port_info['port']])
             self.heat_driver_obj.neutron_client.get_subnets = mock.MagicMock(
-                return_value=self.mock_dict.subnets_info['subnets'])
+                side_effect=self._get_subnets)
             self.heat_driver_obj.neutron_client.get_subnet = mock.MagicMock(
                 return_value=self.mock_dict.subnet_info)
             self.heat_driver_obj.gbp_client.get_external_policies = (
@@ -225,16 +232,29 @@ class TestHeatDriver(unittest2.TestCase):
         result = self.heat_driver_obj._is_service_target(policy_target)
         self.assertEqual(result, expected_result)
 
-    @mock.patch.object(neutron_client.Client, "show_port")
+    @mock.patch.object(neutron_client.Client, "list_ports")
     @mock.patch.object(gbp_client.Client, "list_policy_targets")
-    def test_get_member_ips(self, list_pt_mock_obj, show_port_mock_obj):
+    def test_get_member_ips(self, list_pt_mock_obj, list_ports_mock_obj):
         list_pt_mock_obj.return_value = self.mock_dict.policy_targets
-        show_port_mock_obj.return_value = self.mock_dict.port_info
+        list_ports_mock_obj.return_value = {
+            'ports': [self.mock_dict.port_info['port']]}
         auth_token = "81273djs138"
         expected_member_ips = ['42.0.0.13']
         member_ips = self.heat_driver_obj._get_member_ips(
             auth_token, self.mock_dict.provider_ptg)
         self.assertEqual(member_ips, expected_member_ips)
+        list_ports_mock_obj.assert_called_once_with(
+            id=['dde7d849-4c7c-4b48-8c21-f3f52c646fbe'])
+
+    @mock.patch.object(neutron_client.Client, "list_ports")
+    @mock.patch.object(gbp_client.Client, "list_policy_targets")
+    def test_get_member_ips_port_not_found(self, list_pt_mock_obj,
+                                           list_ports_mock_obj):
+        list_pt_mock_obj.return_value = self.mock_dict.policy_targets
+        list_ports_mock_obj.return_value = {'ports': []}
+        self.assertRaises(nfp_exceptions.NeutronException,
+                          self.heat_driver_obj._get_member_ips,
+                          "81273djs138", self.mock_dict.provider_ptg)
 
     def test_modify_fw_resources_name(self):
         is_template_aws_version = False
@@ -297,12 +317,13 @@ class TestHeatDriver(unittest2.TestCase):
         self.heat_driver_obj.delete_config(stack_id, '1627')
         heat_delete_mock_obj.assert_called_once_with(stack_id)
 
+    @mock.patch.object(heat_client.HeatClient, 'list', return_value=[])
     @mock.patch.object(heat_client.HeatClient, 'get')
     @mock.patch.object(identity_client, "Client")
     @mock.patch.object(v2, "Password")
     @mock.patch.object(session.Session, "get_token")
     def test_is_config_complete(self, mock_session, mock_v2, mock_obj,
-            heat_get_mock_obj):
+            heat_get_mock_obj, heat_list_mock_obj):
         mock_session.return_value = True
         keystone_client = mock_obj.return_value
         keystone_client.tenants.find().id = '8ae6701128994ab281dde6b92207bb19'
@@ -321,10 +342,11 @@ class TestHeatDriver(unittest2.TestCase):
             stack_id, tenant_id, self.mock_dict.network_function_details)
         self.assertEqual(status, expected_status)
 
+    @mock.patch.object(heat_client.HeatClient, 'list', return_value=[])
     @mock.patch.object(heat_client.HeatClient, 'get')
     @mock.patch.object(identity_client, "Client")
     def test_is_config_delete_complete(self, identity_mock_obj,
-                                       heat_get_mock_obj):
+                                       heat_get_mock_obj, heat_list_mock_obj):
         stack_id = '70754fdd-0325-4856-8a39-f171b65617d6'
         tenant_id = '8ae6701128994ab281dde6b92207bb19'
         self.heat_driver_obj._assign_admin_user_to_project = mock.Mock(
@@ -341,6 +363,48 @@ class TestHeatDriver(unittest2.TestCase):
                                                                 tenant_id)
         self.assertEqual(status, expected_status)
 
+    @mock.patch.object(heat_client.HeatClient, 'list')
+    @mock.patch.object(heat_client.HeatClient, 'get')
+    def test_stack_statuses_listed_once(self, heat_get_mock_obj,
+                                        heat_list_mock_obj):
+        tenant_id = '8ae6701128994ab281dde6b92207bb19'
+        stack_ids = ['stack1', 'stack2']
+        nfp_logging.get_logging_context = mock.Mock(
+            return_value={'auth_token': '7fd6701128994ab281ccb6b92207bb15'})
+        heat_get_mock_obj.return_value = MockStackObject('CREATE_IN_PROGRESS')
+        stacks = []
+        for stack_id in stack_ids:
+            stack = MockStackObject('CREATE_IN_PROGRESS')
+            stack.id = stack_id
+            stacks.append(stack)
+        heat_list_mock_obj.return_value = stacks
+        poller = self.heat_driver_obj.stack_poller
+        for stack_id in stack_ids:
+            status = self.heat_driver_obj.is_config_delete_complete(
+                stack_id, tenant_id)
+            self.assertEqual('IN_PROGRESS', status)
+        # stack2 started being waited on after the listing
+        self.assertEqual(1, heat_get_mock_obj.call_count)
+        poller._listings.clear()
+        for stack in stacks:
+            stack.stack_status = 'DELETE_COMPLETE'
+        for stack_id in stack_ids:
+            status = self.heat_driver_obj.is_config_delete_complete(
+                stack_id, tenant_id)
+            self.assertEqual('COMPLETED', status)
+        self.assertEqual(1, heat_get_mock_obj.call_count)
+        self.assertEqual(2, heat_list_mock_obj.call_count)
+        heat_list_mock_obj.assert_called_with(
+            filters={'id': stack_ids})
+        self.assertEqual({}, poller._watched[tenant_id])
+
+    def test_get_heat_client_reused(self):
+        nfp_logging.get_logging_context = mock.Mock(
+            return_value={'auth_token': '7fd6701128994ab281ccb6b92207bb15'})
+        tenant_id = '8ae6701128994ab281dde6b92207bb19'
+        self.assertIs(self.heat_driver_obj._get_heat_client(tenant_id),
+                      self.heat_driver_obj._get_heat_client(tenant_id))
+
     def test_get_site_conn_keys(self):
         is_template_aws_version = False
         resource_name = 'OS::Neutron::IPsecSiteConnection'
@@ -393,6 +457,24 @@ class TestHeatDriver(unittest2.TestCase):
         self.assertEqual(
             stack_template['resources']['sc_firewall_policy'],
             copy.deepcopy(self.mock_dict.updated_template_sc_firewall_policy))
+        # The subnets of the provider and of all the consumers are got in
+        # two calls, none individually.
+        self.assertEqual(
+            2, self.heat_driver_obj.neutron_client.get_subnets.call_count)
+        self.assertFalse(self.heat_driver_obj.neutron_client.get_subnet.called)
+
+    def test_update_firewall_template_subnet_not_found(self):
+        self.mock_objects()
+        # The subnets of the provider are found, not those of the consumers
+        self.heat_driver_obj.neutron_client.get_subnets.side_effect = [
+            self._get_subnets(
+                None, filters={'id': self.mock_dict.provider_ptg['subnets']}),
+            []]
+        stack_template = copy.deepcopy(self.mock_dict.DEFAULT_FW_CONFIG)
+        self.assertRaises(nfp_exceptions.NeutronException,
+                          self.heat_driver_obj._update_firewall_template,
+                          'adakjiq', self.mock_dict.provider_ptg,
+                          stack_template)
 
     @mock.patch.object(neutron_client.Client, "list_networks")
     def test_create_node_config_data_vpn(self, mock_list_networks):
@@ -436,6 +518,8 @@ class TestHeatDriver(unittest2.TestCase):
                 provider_port, mgmt_ip))
         self.assertEqual(stack_template['resources']['sc_firewall_policy'],
                          self.mock_dict.updated_sc_firewall_policy)
+        self.assertEqual(
+            1, self.heat_driver_obj.get_render_metrics()['update']['renders'])
 
     @mock.patch.object(heat_client.HeatClient, "delete")
     @mock.patch.object(heat_client.HeatClient, "update")
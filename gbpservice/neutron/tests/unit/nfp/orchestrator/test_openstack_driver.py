@@ -43,6 +43,23 @@ class SampleData(unittest2.TestCase):
         self.TENANT_NAME = 'admin'
         self.USERNAME = 'admin'
 
+    def setUp(self):
+        super(SampleData, self).setUp()
+        openstack_driver.CLIENT_POOL.reset()
+
+    def _assert_nova_client(self, mock_obj):
+        mock_obj.assert_called_once_with('2', session=mock.ANY, auth=mock.ANY)
+        auth = mock_obj.call_args[1]['auth'].get_cache_id_elements()
+        self.assertEqual(self.AUTH_TOKEN, auth['token'])
+        self.assertEqual(self.TENANT_ID, auth['project_id'])
+        self.assertEqual(self.AUTH_URL, auth['auth_url'])
+
+    def _assert_neutron_client(self, mock_obj):
+        mock_obj.assert_called_once_with(session=mock.ANY, auth=mock.ANY)
+        auth = mock_obj.call_args[1]['auth']
+        self.assertEqual(self.AUTH_TOKEN, auth.get_token(None))
+        self.assertEqual(self.ENDPOINT_URL, auth.get_endpoint(None))
+
 
 @mock.patch.object(identity_client, "Client")
 class TestKeystoneClient(SampleData):
@@ -52,6 +69,7 @@ class TestKeystoneClient(SampleData):
         self.keystone_obj = openstack_driver.KeystoneClient(cfg.CONF)
 
     def setUp(self):
+        super(TestKeystoneClient, self).setUp()
         cfg.CONF.set_override('admin_user',
                               'neutron',
                               group='nfp_keystone_authtoken')
@@ -90,6 +108,20 @@ class TestKeystoneClient(SampleData):
                                         tenant_name=self.TENANT_NAME,
                                         username=self.USERNAME)
 
+    @mock.patch.object(v2, "Password")
+    @mock.patch.object(session.Session, "get_token")
+    def test_get_admin_token_reuses_auth(self, mock_session, mock_v2,
+                                         mock_obj):
+        self.keystone_obj.get_admin_token()
+        self.keystone_obj.get_admin_token()
+        mock_v2.assert_called_once_with(auth_url=self.AUTH_URL,
+                                        password='neutron_pass',
+                                        tenant_name='service',
+                                        username='neutron')
+        self.assertEqual(2, mock_session.call_count)
+        for call in mock_session.call_args_list:
+            self.assertEqual(mock_v2.return_value, call[1]['auth'])
+
     @mock.patch.object(v2, "Password")
     @mock.patch.object(session.Session, "get_token")
     def test_get_tenant_id(self, mock_session, mock_v2, mock_obj):
@@ -117,9 +149,7 @@ class TestNovaClient(SampleData):
                                             self.TENANT_ID,
                                             self.IMAGE_NAME)
         self.assertTrue(retval)
-        mock_obj.assert_called_once_with('2', auth_token=self.AUTH_TOKEN,
-                                         tenant_id=self.TENANT_ID,
-                                         auth_url=self.AUTH_URL)
+        self._assert_nova_client(mock_obj)
 
     def test_get_flavor_id(self, mock_obj):
         instance = mock_obj.return_value
@@ -138,9 +168,24 @@ class TestNovaClient(SampleData):
                                             self.TENANT_ID,
                                             self.INSTANCE_ID)
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with('2', auth_token=self.AUTH_TOKEN,
-                                         tenant_id=self.TENANT_ID,
-                                         auth_url=self.AUTH_URL)
+        self._assert_nova_client(mock_obj)
+
+    def test_client_pool_bounded(self, mock_obj):
+        pool = openstack_driver.CLIENT_POOL
+        for i in range(openstack_driver.MAX_POOLED_CLIENTS + 10):
+            self.nova_obj.get_instance('token%d' % i, self.TENANT_ID,
+                                       self.INSTANCE_ID)
+        self.assertEqual(openstack_driver.MAX_POOLED_CLIENTS,
+                         len(pool._clients))
+        self.assertEqual({}, pool._auths)
+        self.assertEqual(1, len(pool._sessions))
+        # The least recently used clients are the ones dropped
+        self.nova_obj.get_instance('token0', self.TENANT_ID,
+                                   self.INSTANCE_ID)
+        self.assertEqual(openstack_driver.MAX_POOLED_CLIENTS + 11,
+                         mock_obj.call_count)
+        self.assertEqual('token0', mock_obj.call_args[1][
+            'auth'].get_cache_id_elements()['token'])
 
     def test_get_keypair(self, mock_obj):
         instance = mock_obj.return_value
@@ -149,9 +194,7 @@ class TestNovaClient(SampleData):
                                            self.TENANT_ID,
                                            "keypair_name")
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with('2', auth_token=self.AUTH_TOKEN,
-                                         tenant_id=self.TENANT_ID,
-                                         auth_url=self.AUTH_URL)
+        self._assert_nova_client(mock_obj)
 
     def test_attach_interface(self, mock_obj):
         instance = mock_obj.return_value
@@ -163,9 +206,7 @@ class TestNovaClient(SampleData):
                                                     self.INSTANCE_ID,
                                                     "port_id")
             self.assertTrue(retval)
-            mock_obj.assert_called_once_with('2', auth_token=self.AUTH_TOKEN,
-                                             tenant_id=self.TENANT_ID,
-                                             auth_url=self.AUTH_URL)
+            self._assert_nova_client(mock_obj)
 
     def test_detach_interface(self, mock_obj):
         instance = mock_obj.return_value
@@ -178,9 +219,7 @@ class TestNovaClient(SampleData):
                                                     "port_id")
 
             self.assertTrue(retval)
-            mock_obj.assert_called_once_with('2', auth_token=self.AUTH_TOKEN,
-                                             tenant_id=self.TENANT_ID,
-                                             auth_url=self.AUTH_URL)
+            self._assert_nova_client(mock_obj)
 
     def test_delete_instance(self, mock_obj):
         instance = mock_obj.return_value
@@ -191,9 +230,7 @@ class TestNovaClient(SampleData):
                                                    self.INSTANCE_ID)
 
             self.assertIsNone(retval)
-            mock_obj.assert_called_once_with('2', auth_token=self.AUTH_TOKEN,
-                                             tenant_id=self.TENANT_ID,
-                                             auth_url=self.AUTH_URL)
+            self._assert_nova_client(mock_obj)
 
     def test_get_instances(self, mock_obj):
         instance = mock_obj.return_value
@@ -201,9 +238,7 @@ class TestNovaClient(SampleData):
         retval = self.nova_obj.get_instances(self.AUTH_TOKEN,
                                              {'tenant_id': self.TENANT_ID})
         self.assertIsNotNone(retval)
-        mock_obj.assert_called_once_with('2', auth_token=self.AUTH_TOKEN,
-                                         tenant_id=self.TENANT_ID,
-                                         auth_url=self.AUTH_URL)
+        self._assert_nova_client(mock_obj)
 
     def test_create_instance(self, mock_obj):
         instance = mock_obj.return_value
@@ -229,9 +264,7 @@ class TestNovaClient(SampleData):
                                                    )
 
             self.assertEqual(retval, obj1)
-            mock_obj.assert_called_once_with('2', auth_token=self.AUTH_TOKEN,
-                                             tenant_id=self.TENANT_ID,
-                                             auth_url=self.AUTH_URL)
+            self._assert_nova_client(mock_obj)
 
 
 @mock.patch.object(neutron_client, "Client")
@@ -247,8 +280,7 @@ class TestNeutronClient(SampleData):
         retval = self.neutron_obj.get_floating_ip(
             self.AUTH_TOKEN, 'floatingip_id')
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_get_floating_ips(self, mock_obj):
         instance = mock_obj.return_value
@@ -258,8 +290,29 @@ class TestNeutronClient(SampleData):
         retval = self.neutron_obj.get_floating_ips(self.AUTH_TOKEN,
                                                    **filters)
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
+
+    def test_client_reused(self, mock_obj):
+        self.neutron_obj.get_port(self.AUTH_TOKEN, self.PORT_ID)
+        self.neutron_obj.get_ports(self.AUTH_TOKEN)
+        self._assert_neutron_client(mock_obj)
+        self.neutron_obj.get_port('other_token', self.PORT_ID)
+        self.assertEqual(2, mock_obj.call_count)
+        auth = mock_obj.call_args[1]['auth']
+        self.assertEqual('other_token', auth.get_token(None))
+        self.assertEqual(self.ENDPOINT_URL, auth.get_endpoint(None))
+
+    @mock.patch.object(session.Session, "request")
+    def test_client_metrics(self, mock_request, mock_obj):
+        sess = openstack_driver.CLIENT_POOL.get_session(self.ENDPOINT_URL)
+        sess.request('/v2.0/ports', 'GET',
+                     endpoint_filter={'service_type': 'network'})
+        mock_request.side_effect = ValueError
+        self.assertRaises(ValueError, sess.request, '/v2.0/ports', 'GET',
+                          endpoint_filter={'service_type': 'network'})
+        metrics = openstack_driver.CLIENT_POOL.get_metrics()
+        self.assertEqual(2, metrics['network']['calls'])
+        self.assertEqual(1, metrics['network']['errors'])
 
     def test_get_port(self, mock_obj):
         instance = mock_obj.return_value
@@ -267,8 +320,7 @@ class TestNeutronClient(SampleData):
         retval = self.neutron_obj.get_port(self.AUTH_TOKEN,
                                            self.PORT_ID)
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_get_ports(self, mock_obj):
         instance = mock_obj.return_value
@@ -276,16 +328,14 @@ class TestNeutronClient(SampleData):
         retval = self.neutron_obj.get_ports(self.AUTH_TOKEN,
                                             {})
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_get_subnets(self, mock_obj):
         instance = mock_obj.return_value
         obj = instance.list_subnets().get('subnets', [])
         retval = self.neutron_obj.get_subnets(self.AUTH_TOKEN, {})
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_get_pools(self, mock_obj):
         instance = mock_obj.return_value
@@ -293,8 +343,7 @@ class TestNeutronClient(SampleData):
         retval = self.neutron_obj.get_pools(self.AUTH_TOKEN,
                                             {})
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_get_vip(self, mock_obj):
         instance = mock_obj.return_value
@@ -302,8 +351,7 @@ class TestNeutronClient(SampleData):
         retval = self.neutron_obj.get_vip(self.AUTH_TOKEN,
                                           'vip_id')
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_get_subnet(self, mock_obj):
         instance = mock_obj.return_value
@@ -311,8 +359,7 @@ class TestNeutronClient(SampleData):
         retval = self.neutron_obj.get_subnet(self.AUTH_TOKEN,
                                              'subnet_id')
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_delete_floatingip(self, mock_obj):
         instance = mock_obj.return_value
@@ -320,8 +367,7 @@ class TestNeutronClient(SampleData):
         retval = self.neutron_obj.delete_floatingip(self.AUTH_TOKEN,
                                                     'floatingip_id')
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_update_port(self, mock_obj):
         instance = mock_obj.return_value
@@ -329,8 +375,7 @@ class TestNeutronClient(SampleData):
         retval = self.neutron_obj.update_port(self.AUTH_TOKEN,
                                               'port_id')
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_get_floating_ips_for_ports(self, mock_obj):
         instance = mock_obj.return_value
@@ -338,8 +383,7 @@ class TestNeutronClient(SampleData):
         retval = self.neutron_obj.get_floating_ips_for_ports(
             self.AUTH_TOKEN)
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_disassociate_floating_ip(self, mock_obj):
         instance = mock_obj.return_value
@@ -347,8 +391,7 @@ class TestNeutronClient(SampleData):
         retval = self.neutron_obj.disassociate_floating_ip(self.AUTH_TOKEN,
                                                            'floatingip_id')
         self.assertIsNone(retval)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_associate_floating_ip(self, mock_obj):
         instance = mock_obj.return_value
@@ -357,8 +400,7 @@ class TestNeutronClient(SampleData):
                                                         'floatingip_id',
                                                         'port_id')
         self.assertIsNone(retval)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_list_ports(self, mock_obj):
         instance = mock_obj.return_value
@@ -366,8 +408,7 @@ class TestNeutronClient(SampleData):
         retval = self.neutron_obj.list_ports(self.AUTH_TOKEN,
                                              'port_ids=[]')
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_list_subnets(self, mock_obj):
         instance = mock_obj.return_value
@@ -375,8 +416,7 @@ class TestNeutronClient(SampleData):
         retval = self.neutron_obj.list_subnets(self.AUTH_TOKEN,
                                                'subnet_ids=[]')
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_create_port(self, mock_obj):
         instance = mock_obj.return_value
@@ -385,8 +425,7 @@ class TestNeutronClient(SampleData):
                                               self.TENANT_ID,
                                               'net_id')
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_delete_port(self, mock_obj):
         instance = mock_obj.return_value
@@ -394,8 +433,7 @@ class TestNeutronClient(SampleData):
         retval = self.neutron_obj.delete_port(self.AUTH_TOKEN,
                                               'port_id')
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
 
 @mock.patch.object(gbp_client, "Client")
@@ -410,8 +448,7 @@ class TestGBPClient(SampleData):
         obj = instance.list_policy_target_groups()['policy_target_groups']
         retval = self.gbp_obj.get_policy_target_groups(self.AUTH_TOKEN, {})
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_get_policy_target_group(self, mock_obj):
         instance = mock_obj.return_value
@@ -420,8 +457,7 @@ class TestGBPClient(SampleData):
         retval = self.gbp_obj.get_policy_target_group(self.AUTH_TOKEN,
                                                       'ptg_id', {})
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_update_policy_target_group(self, mock_obj):
         instance = mock_obj.return_value
@@ -432,8 +468,7 @@ class TestGBPClient(SampleData):
             'ptg_id',
             'policy_target_group_info')
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_update_policy_target(self, mock_obj):
         instance = mock_obj.return_value
@@ -444,8 +479,7 @@ class TestGBPClient(SampleData):
                                                    'policy_target_id',
                                                    'updated_pt')
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_create_policy_target(self, mock_obj):
         instance = mock_obj.return_value
@@ -456,8 +490,7 @@ class TestGBPClient(SampleData):
                                                    'policy_target_group_id',
                                                    'name', port_id=None)
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_create_policy_target_group(self, mock_obj):
         instance = mock_obj.return_value
@@ -469,8 +502,7 @@ class TestGBPClient(SampleData):
             'name',
             l2_policy_id=None)
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_delete_policy_target(self, mock_obj):
         instance = mock_obj.return_value
@@ -478,8 +510,7 @@ class TestGBPClient(SampleData):
         retval = self.gbp_obj.delete_policy_target(self.AUTH_TOKEN,
                                                    'policy_target_id')
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_delete_policy_target_group(self, mock_obj):
         instance = mock_obj.return_value
@@ -488,8 +519,7 @@ class TestGBPClient(SampleData):
             self.AUTH_TOKEN,
             'policy_target_group_id')
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_create_l2_policy(self, mock_obj):
         instance = mock_obj.return_value
@@ -499,8 +529,7 @@ class TestGBPClient(SampleData):
                                                'name',
                                                l3_policy_id=None)
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_delete_l2_policy(self, mock_obj):
         instance = mock_obj.return_value
@@ -508,8 +537,7 @@ class TestGBPClient(SampleData):
         retval = self.gbp_obj.delete_l2_policy(self.AUTH_TOKEN,
                                                'l2_policy_id')
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_get_l2_policys(self, mock_obj):
         instance = mock_obj.return_value
@@ -517,8 +545,7 @@ class TestGBPClient(SampleData):
         retval = self.gbp_obj.get_l2_policys(self.AUTH_TOKEN,
                                              filters={})
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_get_l2_policy(self, mock_obj):
         instance = mock_obj.return_value
@@ -528,8 +555,7 @@ class TestGBPClient(SampleData):
                                             'policy_id',
                                             filters={})
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_create_network_service_policy(self, mock_obj):
         instance = mock_obj.return_value
@@ -539,8 +565,7 @@ class TestGBPClient(SampleData):
             self.AUTH_TOKEN,
             'network_service_policy_info')
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_get_network_service_policies(self, mock_obj):
         instance = mock_obj.return_value
@@ -549,8 +574,7 @@ class TestGBPClient(SampleData):
         retval = self.gbp_obj.get_network_service_policies(self.AUTH_TOKEN,
                                                            filters={})
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_get_external_policies(self, mock_obj):
         instance = mock_obj.return_value
@@ -558,8 +582,7 @@ class TestGBPClient(SampleData):
         retval = self.gbp_obj.get_external_policies(self.AUTH_TOKEN,
                                                     filters={})
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_get_policy_rule_sets(self, mock_obj):
         instance = mock_obj.return_value
@@ -567,8 +590,7 @@ class TestGBPClient(SampleData):
         retval = self.gbp_obj.get_policy_rule_sets(self.AUTH_TOKEN,
                                                    filters={})
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_get_policy_actions(self, mock_obj):
         instance = mock_obj.return_value
@@ -576,8 +598,7 @@ class TestGBPClient(SampleData):
         retval = self.gbp_obj.get_policy_actions(self.AUTH_TOKEN,
                                                  filters={})
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_get_policy_rules(self, mock_obj):
         instance = mock_obj.return_value
@@ -585,8 +606,7 @@ class TestGBPClient(SampleData):
         retval = self.gbp_obj.get_policy_rules(self.AUTH_TOKEN,
                                                filters={})
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_create_l3_policy(self, mock_obj):
         instance = mock_obj.return_value
@@ -595,8 +615,7 @@ class TestGBPClient(SampleData):
         retval = self.gbp_obj.create_l3_policy(self.AUTH_TOKEN,
                                                'l3_policy_info')
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_get_l3_policy(self, mock_obj):
         instance = mock_obj.return_value
@@ -606,8 +625,7 @@ class TestGBPClient(SampleData):
                                             'policy_id',
                                             filters={})
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_get_l3_policies(self, mock_obj):
         instance = mock_obj.return_value
@@ -615,8 +633,7 @@ class TestGBPClient(SampleData):
         retval = self.gbp_obj.get_l3_policies(self.AUTH_TOKEN,
                                               filters={})
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_get_policy_targets(self, mock_obj):
         instance = mock_obj.return_value
@@ -624,8 +641,7 @@ class TestGBPClient(SampleData):
         retval = self.gbp_obj.get_policy_targets(self.AUTH_TOKEN,
                                                  filters={})
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_list_pt(self, mock_obj):
         instance = mock_obj.return_value
@@ -633,8 +649,7 @@ class TestGBPClient(SampleData):
         retval = self.gbp_obj.list_pt(self.AUTH_TOKEN,
                                       filters={})
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_get_policy_target(self, mock_obj):
         instance = mock_obj.return_value
@@ -644,8 +659,7 @@ class TestGBPClient(SampleData):
                                                 'pt_id',
                                                 filters={})
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_get_service_profile(self, mock_obj):
         instance = mock_obj.return_value
@@ -654,8 +668,7 @@ class TestGBPClient(SampleData):
         retval = self.gbp_obj.get_service_profile(self.AUTH_TOKEN,
                                                   'service_profile_id')
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_get_servicechain_node(self, mock_obj):
         instance = mock_obj.return_value
@@ -664,8 +677,7 @@ class TestGBPClient(SampleData):
         retval = self.gbp_obj.get_servicechain_node(self.AUTH_TOKEN,
                                                     'node_id')
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
 
     def test_get_servicechain_instance(self, mock_obj):
         instance = mock_obj.return_value
@@ -674,5 +686,4 @@ class TestGBPClient(SampleData):
         retval = self.gbp_obj.get_servicechain_instance(self.AUTH_TOKEN,
                                                         'instance_id')
         self.assertEqual(retval, obj)
-        mock_obj.assert_called_once_with(token=self.AUTH_TOKEN,
-                                         endpoint_url=self.ENDPOINT_URL)
+        self._assert_neutron_client(mock_obj)
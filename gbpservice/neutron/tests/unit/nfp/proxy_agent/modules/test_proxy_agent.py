@@ -52,6 +52,16 @@ class ConfigAgentProxyTestCase(unittest2.TestCase):
             mock_send.side_effect = self._post
             self.manager.create_network_function_config(self.context, _data)
 
+    def test_request_pending_notification(self):
+        _data = {'info': {'context': {'request_id': 'req1'}}}
+        import_send = self.import_lib + '.send_request_to_configurator'
+        with mock.patch(import_send) as mock_send, mock.patch(
+                'eventlet.spawn'):
+            mock_send.side_effect = self._post
+            self.manager.create_network_function_device_config(
+                self.context, _data)
+        self.assertIn('req1', self.manager._pending_requests._pending)
+
     def test_delete_network_function_config(self):
         _data = "data"
         import_send = self.import_lib + '.send_request_to_configurator'
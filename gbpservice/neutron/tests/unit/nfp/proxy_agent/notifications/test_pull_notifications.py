@@ -46,12 +46,13 @@ class PullNotificationTestCase(unittest2.TestCase):
         self.import_lib = 'gbpservice.nfp.lib.transport'
         self.import_cast = 'oslo_messaging.rpc.client._CallContext.cast'
 
-    def _resp_base_structure(self, requester):
+    def _resp_base_structure(self, requester, request_id=None):
         response_data = [{
             'info': {
                 'context': {
                     'neutron_context': self.context,
-                    'requester': requester}
+                    'requester': requester,
+                    'request_id': request_id}
             }}]
         return response_data
 
@@ -96,3 +97,23 @@ class PullNotificationTestCase(unittest2.TestCase):
             mock_get.side_effect = self._resp_data_ndo
             mock_cast.side_effect = self._cast
             self.p_notification.pull_notifications(self.ev)
+
+    def test_pending_requests(self):
+        import_get = self.import_lib + '.get_response_from_configurator'
+        pending = pull.PendingRequests(self.p_notification, timeout=60)
+        with mock.patch('eventlet.spawn') as mock_spawn, mock.patch(
+                import_get) as mock_get, mock.patch(self.import_cast):
+            for request_id in ['req1', 'req2']:
+                pending.add({'info': {'context': {'request_id': request_id}}})
+            # Requests without a request id aren't waited on
+            pending.add('data')
+            mock_spawn.assert_called_once_with(pending._run)
+            self.assertEqual(set(['req1', 'req2']), set(pending._pending))
+
+            mock_get.return_value = self._resp_base_structure(
+                'device_orch', 'req1')
+            pending.pull()
+            self.assertEqual(['req2'], list(pending._pending))
+            mock_get.return_value = []
+            pending.pull(now=pending._pending['req2'] + 61)
+            self.assertEqual({}, pending._pending)
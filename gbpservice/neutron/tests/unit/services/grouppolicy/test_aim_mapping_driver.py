@@ -2970,6 +2970,33 @@ class TestPolicyTarget(AIMBaseTestCase,
         res = req.get_response(self.api)
         self.assertEqual(webob.exc.HTTPNotFound.code, res.status_int)
 
+    def test_policy_target_bulk_create_implicit_ports(self):
+        ptg = self.create_policy_target_group(
+            name="ptg1")['policy_target_group']
+        data = {'policy_targets': [
+            {'policy_target': {'name': 'pt%s' % i,
+                               'tenant_id': self._tenant_id,
+                               'policy_target_group_id': ptg['id']}}
+            for i in range(3)]}
+        with mock.patch.object(self._plugin, 'create_port_bulk',
+                               wraps=self._plugin.create_port_bulk) as bulk:
+            req = self.new_create_request(
+                'policy_targets', data, self.fmt)
+            res = req.get_response(self.ext_api)
+            self.assertEqual(webob.exc.HTTPCreated.code, res.status_int)
+            pts = self.deserialize(self.fmt, res)['policy_targets']
+            self.assertEqual(1, bulk.call_count)
+        self.assertEqual(['pt0', 'pt1', 'pt2'], [pt['name'] for pt in pts])
+        port_ids = [pt['port_id'] for pt in pts]
+        self.assertEqual(3, len(set(port_ids)))
+        for pt in pts:
+            port = self._plugin.get_port(self._context, pt['port_id'])
+            self.assertEqual(1, len(port['security_groups']))
+            self.delete_policy_target(pt['id'], expected_res_status=204)
+            req = self.new_show_request('ports', pt['port_id'], fmt=self.fmt)
+            res = req.get_response(self.api)
+            self.assertEqual(webob.exc.HTTPNotFound.code, res.status_int)
+
     def test_policy_target_segmentation_label_update(self):
         if 'apic_segmentation_label' not in self._extension_drivers:
             self.skipTest("apic_segmentation_label ED not configured")
@@ -12,6 +12,7 @@
 
 import os
 
+import mock
 from neutron.common import config as neutron_config  # noqa
 
 from gbpservice.neutron.services.grouppolicy import config
@@ -43,6 +44,29 @@ class ExtensionDriverTestBase(test_plugin.GroupPolicyPluginTestCase):
 
 class ExtensionDriverTestCase(ExtensionDriverTestBase):
 
+    def test_list_with_fields_calls_owning_extension_drivers(self):
+        self.create_policy_target(pt_extension="abc")
+        driver = self._gbp_plugin.extension_manager.ordered_ext_drivers[0]
+        with mock.patch.object(
+                driver.obj, 'extend_policy_target_dict',
+                wraps=driver.obj.extend_policy_target_dict) as extend:
+            res = self._list('policy_targets',
+                             query_params='fields=id&fields=name')
+            self.assertFalse(extend.called)
+            self.assertEqual(set(['id', 'name']),
+                             set(res['policy_targets'][0]))
+
+            res = self._list('policy_targets',
+                             query_params='fields=id&fields=pt_extension')
+            self.assertTrue(extend.called)
+            self.assertEqual("abc", res['policy_targets'][0]['pt_extension'])
+
+            extend.reset_mock()
+            res = self._list('policy_targets',
+                             query_params='fields=id&pt_extension=abc')
+            self.assertTrue(extend.called)
+            self.assertEqual(1, len(res['policy_targets']))
+
     def test_pt_attr(self):
         # Test create with default value.
         pt = self.create_policy_target()
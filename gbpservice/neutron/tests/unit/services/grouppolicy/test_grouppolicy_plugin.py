@@ -18,10 +18,14 @@ from oslo_config import cfg
 from oslo_log import log as logging
 import webob.exc
 
+from gbpservice.common import metrics
 from gbpservice.neutron.db.grouppolicy import group_policy_mapping_db as gpmdb
 from gbpservice.neutron.extensions import group_policy as gpolicy
+from gbpservice.neutron.services.grouppolicy.common import instrumentation
 from gbpservice.neutron.services.grouppolicy import config
 from gbpservice.neutron.services.grouppolicy.drivers import dummy_driver
+from gbpservice.neutron.services.grouppolicy import (
+    group_policy_driver_api as api)
 from gbpservice.neutron.services.grouppolicy import plugin as gplugin
 from gbpservice.neutron.tests.unit.db.grouppolicy import (
     test_group_policy_db as tgpdb)
@@ -198,6 +202,61 @@ class TestGroupPolicyPluginDrivers(GroupPolicyPluginTestBase):
         finally:
             manager.ordered_policy_drivers = drivers
 
+    def test_hook_drivers_skip_non_overriding_drivers(self):
+        manager = self.plugin.policy_driver_manager
+        drivers = manager.ordered_policy_drivers
+        reverse_drivers = manager.reverse_ordered_policy_drivers
+        hook_drivers = manager.hook_drivers
+
+        class BaseDriver(api.PolicyDriver):
+
+            def initialize(self):
+                pass
+
+        class PTDriver(BaseDriver):
+
+            def create_policy_target_precommit(self, context):
+                pass
+
+        fake, base, pt = mock.Mock(), mock.Mock(), mock.Mock()
+        fake.obj = FakeDriver()
+        base.obj = BaseDriver()
+        pt.obj = PTDriver()
+        try:
+            manager.ordered_policy_drivers = [fake, base, pt]
+            manager.reverse_ordered_policy_drivers = [pt, base, fake]
+            manager._register_hook_drivers()
+            self.assertEqual(
+                [fake, pt],
+                manager.hook_drivers['create_policy_target_precommit'])
+            self.assertEqual(
+                [fake, pt],
+                manager.hook_drivers['create_policy_target_bulk_precommit'])
+            self.assertEqual(
+                [fake],
+                manager.hook_drivers['create_policy_target_postcommit'])
+            self.assertEqual(
+                [fake],
+                manager.hook_drivers['delete_policy_target_precommit'])
+        finally:
+            manager.ordered_policy_drivers = drivers
+            manager.reverse_ordered_policy_drivers = reverse_drivers
+            manager.hook_drivers = hook_drivers
+
+    def test_driver_timings(self):
+        manager = self.plugin.policy_driver_manager
+        self.assertEqual({}, manager.get_driver_timings())
+        self.addCleanup(setattr, manager, 'driver_timings', None)
+        manager.driver_timings = metrics.HistogramRegistry()
+        self.create_policy_target_group()
+        timings = manager.get_driver_timings()
+        self.assertEqual(
+            1, timings['dummy']['create_policy_target_group_precommit'][
+                'count'])
+        self.assertEqual(
+            1, timings['dummy']['create_policy_target_group_postcommit'][
+                'count'])
+
 
 class TestL3Policy(GroupPolicyPluginTestCase):
 
@@ -370,6 +429,31 @@ class TestL3Policy(GroupPolicyPluginTestCase):
 
 class TestL2Policy(GroupPolicyPluginTestCase):
 
+    def test_create_l2_policy_bulk(self):
+        l3p = self.create_l3_policy()['l3_policy']
+        data = {'l2_policies': [
+            {'l2_policy': {'name': 'l2p%s' % i,
+                           'tenant_id': self._tenant_id,
+                           'l3_policy_id': l3p['id']}}
+            for i in range(2)]}
+        manager = self._gbp_plugin.policy_driver_manager
+        with mock.patch.object(
+                manager, 'create_l2_policy_postcommit',
+                side_effect=[None, gpolicy.L3PolicyNotFound(
+                    l3_policy_id='x')]) as post:
+            req = self.new_create_request('l2_policies', data, self.fmt)
+            res = req.get_response(self.ext_api)
+        # Created one by one, the first one being deleted on failure
+        self.assertEqual(404, res.status_int)
+        self.assertEqual(2, post.call_count)
+        self.assertEqual([], self._list('l2_policies')['l2_policies'])
+
+        req = self.new_create_request('l2_policies', data, self.fmt)
+        res = req.get_response(self.ext_api)
+        self.assertEqual(201, res.status_int)
+        l2ps = self.deserialize(self.fmt, res)['l2_policies']
+        self.assertEqual(['l2p0', 'l2p1'], [l2p['name'] for l2p in l2ps])
+
     def test_shared_l2_policy_create(self):
         l3p = self.create_l3_policy(shared=True)['l3_policy']
         # Verify Default False
@@ -564,6 +648,31 @@ class TestPolicyClassifier(GroupPolicyPluginTestCase):
 
 class TestPolicyTargetGroup(GroupPolicyPluginTestCase):
 
+    def test_list_ptgs_with_column_fields_skips_dict_creation(self):
+        l2p = self.create_l2_policy()['l2_policy']
+        ptgs = [self.create_policy_target_group(
+            name='ptg%s' % i, l2_policy_id=l2p['id'])['policy_target_group']
+            for i in range(20)]
+        with mock.patch.object(
+                self._gbp_plugin, '_make_policy_target_group_dict',
+                wraps=self._gbp_plugin._make_policy_target_group_dict) as make:
+            res = self._list('policy_target_groups',
+                             query_params='fields=id&fields=name&'
+                                          'fields=tenant_id')
+            self.assertFalse(make.called)
+            self.assertEqual(
+                sorted([(ptg['id'], ptg['name'], ptg['tenant_id'])
+                        for ptg in ptgs]),
+                sorted([(ptg['id'], ptg['name'], ptg['tenant_id'])
+                        for ptg in res['policy_target_groups']]))
+
+            # Association attributes need the full resource dict.
+            res = self._list('policy_target_groups',
+                             query_params='fields=id&fields=policy_targets')
+            self.assertEqual(20, make.call_count)
+            self.assertEqual([[]] * 20, [ptg['policy_targets'] for ptg in
+                                         res['policy_target_groups']])
+
     def test_delete_ptg_with_unused_pt(self):
         ctx = context.get_admin_context()
         ptg = self.create_policy_target_group()['policy_target_group']
@@ -729,6 +838,63 @@ class TestPolicyTargetGroup(GroupPolicyPluginTestCase):
                          res['NeutronError']['type'])
 
 
+class TestPolicyTargetGroupBulk(GroupPolicyPluginTestCase):
+
+    def test_create_policy_target_group_bulk(self):
+        data = {'policy_target_groups': [
+            {'policy_target_group': {'name': 'ptg%s' % i,
+                                     'tenant_id': self._tenant_id}}
+            for i in range(2)]}
+        manager = self._gbp_plugin.policy_driver_manager
+        with mock.patch.object(
+                manager, 'create_policy_target_group_bulk_postcommit') as post:
+            req = self.new_create_request('policy_target_groups',
+                                          data, self.fmt)
+            res = req.get_response(self.ext_api)
+        self.assertEqual(201, res.status_int)
+        ptgs = self.deserialize(self.fmt, res)['policy_target_groups']
+        self.assertEqual(['ptg0', 'ptg1'], [ptg['name'] for ptg in ptgs])
+        self.assertEqual(1, post.call_count)
+        self.assertEqual(2, len(post.call_args[0][0]))
+
+
+class TestInstrumentation(GroupPolicyPluginTestCase):
+
+    def setUp(self):
+        cfg.CONF.set_override('api_instrumentation', True,
+                              group='group_policy')
+        self.addCleanup(setattr, instrumentation, '_recorder', None)
+        super(TestInstrumentation, self).setUp()
+
+    def test_operations_recorded(self):
+        recorder = instrumentation.get_recorder()
+        self.assertIsNotNone(recorder)
+        ptg = self.create_policy_target_group()['policy_target_group']
+        self.show_policy_target_group(ptg['id'])
+        operations = recorder.snapshot()
+        create = operations['create_policy_target_group']
+        for phase in (instrumentation.PHASE_TOTAL, instrumentation.PHASE_DB,
+                      instrumentation.PHASE_PRECOMMIT,
+                      instrumentation.PHASE_POSTCOMMIT):
+            self.assertEqual(1, create['latency'][phase]['count'])
+        self.assertEqual(1, create['db_statements']['count'])
+        self.assertTrue(create['db_statements']['sum'] > 0)
+        self.assertIn('get_policy_target_group', operations)
+
+    def test_slow_operation_profiled(self):
+        recorder = instrumentation.get_recorder()
+        recorder.slow_threshold = 0
+        recorder.profile_sample_rate = 1
+        recorder.profile_dir = '/profiles'
+        with mock.patch('cProfile.Profile') as profile:
+            self.create_policy_target_group()
+        paths = [call[0][0] for call in
+                 profile.return_value.dump_stats.call_args_list]
+        self.assertEqual(
+            1, len([path for path in paths if path.startswith(
+                '/profiles/create_policy_target_group-')]))
+
+
 class TestExternalSegment(GroupPolicyPluginTestCase):
 
     def test_shared_es_create(self):
@@ -952,6 +1118,51 @@ class TestPolicyTarget(GroupPolicyPluginTestCase):
     def test_cross_tenant_fails(self):
         self._test_cross_tenant()
 
+    def _create_policy_targets_bulk(self, ptg_id, count,
+                                    expected_res_status=201):
+        data = {'policy_targets': [
+            {'policy_target': {'name': 'pt%s' % i,
+                               'tenant_id': self._tenant_id,
+                               'policy_target_group_id': ptg_id}}
+            for i in range(count)]}
+        req = self.new_create_request('policy_targets', data,
+                                      self.fmt)
+        res = req.get_response(self.ext_api)
+        self.assertEqual(expected_res_status, res.status_int)
+        return self.deserialize(self.fmt, res)
+
+    def test_create_policy_target_bulk(self):
+        self.assertTrue(self._gbp_plugin.policy_driver_manager.
+                        native_bulk_support)
+        ptg = self.create_policy_target_group()['policy_target_group']
+        manager = self._gbp_plugin.policy_driver_manager
+        with mock.patch.object(
+                manager, 'create_policy_target_bulk_precommit') as pre, \
+                mock.patch.object(
+                    manager, 'create_policy_target_bulk_postcommit') as post:
+            pts = self._create_policy_targets_bulk(
+                ptg['id'], 3)['policy_targets']
+        self.assertEqual(['pt0', 'pt1', 'pt2'], [pt['name'] for pt in pts])
+        self.assertEqual(1, pre.call_count)
+        self.assertEqual([pt['id'] for pt in pts],
+                         [ctx.current['id'] for ctx in pre.call_args[0][0]])
+        self.assertEqual(1, post.call_count)
+        ptg = self.show_policy_target_group(ptg['id'])['policy_target_group']
+        self.assertEqual(sorted([pt['id'] for pt in pts]),
+                         sorted(ptg['policy_targets']))
+
+    def test_create_policy_target_bulk_postcommit_failure(self):
+        ptg = self.create_policy_target_group()['policy_target_group']
+        manager = self._gbp_plugin.policy_driver_manager
+        with mock.patch.object(
+                manager, 'create_policy_target_bulk_postcommit',
+                side_effect=gpolicy.PolicyTargetNotFound(
+                    policy_target_id='x')):
+            self._create_policy_targets_bulk(ptg['id'], 2,
+                                             expected_res_status=404)
+        self.assertEqual([], self._list('policy_targets')[
+            'policy_targets'])
+
     def test_cross_tenant_admin(self):
         self._test_cross_tenant(True)
 
@@ -3285,6 +3285,41 @@ class TestServiceChain(ResourceMappingTestCase):
                 args, kwargs = call
                 self.assertIn(args[1], new_instance_ids)
 
+    def test_rule_update_only_updates_changed_chains(self):
+        scs_id = self._create_servicechain_spec()
+        action_id, classifier_id, policy_rule_id = (
+            self._create_tcp_redirect_rule("20:90", scs_id))
+        prs = self.create_policy_rule_set(
+            name="c1", policy_rules=[policy_rule_id])['policy_rule_set']
+        provider_ptg_id, _ = self._create_provider_consumer_ptgs(prs['id'])
+        sc_instance = self._list(SERVICECHAIN_INSTANCES)[
+            'servicechain_instances'][0]
+
+        allow_action = self.create_policy_action(
+            action_type='allow')['policy_action']
+        with mock.patch.object(
+                servicechain_db.ServiceChainDbPlugin,
+                'update_servicechain_instance') as sc_instance_update:
+            # The chain's spec and classifier don't change
+            self.update_policy_rule(
+                policy_rule_id, expected_res_status=200,
+                policy_actions=[action_id, allow_action['id']])
+            self.assertEqual([], sc_instance_update.call_args_list)
+
+            classifier = self.create_policy_classifier(
+                protocol='TCP', port_range="80",
+                direction='bi')['policy_classifier']
+            sc_instance_update.return_value = {'id': sc_instance['id']}
+            self.update_policy_rule(
+                policy_rule_id, expected_res_status=200,
+                policy_classifier_id=classifier['id'])
+            instance_data = {'servicechain_instance': {
+                'classifier_id': classifier['id'],
+                'servicechain_specs': [scs_id]}}
+            self._check_call_list(
+                [mock.call(mock.ANY, sc_instance['id'], instance_data)],
+                sc_instance_update.call_args_list)
+
     # This test is being skipped because the NCP plugin does not support
     # multiple servicechain_specs per servicechain_instance
     @unittest2.skip('skipping')
@@ -15,6 +15,7 @@ import copy
 import itertools
 
 import heatclient
+from heatclient import exc as heat_exc
 import mock
 from neutron_lib.api.definitions import external_net
 from neutron_lib import context as neutron_context
@@ -144,6 +145,9 @@ class HeatNodeDriverTestCase(
         config.cfg.CONF.set_override('stack_action_wait_time',
                                      STACK_ACTION_WAIT_TIME,
                                      group='heat_node_driver')
+        # The stack status poller is run explicitly by the tests.
+        config.cfg.CONF.set_override('stack_status_poll_interval', 0,
+                                     group='heat_node_driver')
         mock.patch(heatclient.__name__ + ".client.Client",
                    new=MockHeatClient).start()
         super(HeatNodeDriverTestCase, self).setUp(
@@ -547,7 +551,16 @@ class TestServiceChainInstance(HeatNodeDriverTestCase):
                                         node['id'],
                                         name='newname',
                                         expected_res_status=200)
-                # Name update should not update stack ??
+                # The stack template is unchanged by a name update
+                self.assertFalse(stack_update.called)
+                # A template change does
+                lb_config = copy.deepcopy(self.DEFAULT_LB_CONFIG_DICT)
+                lb_config['Resources']['test_listener']['Properties'][
+                    'protocol_port'] = 8080
+                self.update_servicechain_node(
+                                        node['id'],
+                                        config=jsonutils.dumps(lb_config),
+                                        expected_res_status=200)
                 stack_update.assert_called_once_with(
                                     mock.ANY, mock.ANY, mock.ANY)
 
@@ -611,6 +624,98 @@ class TestServiceChainInstance(HeatNodeDriverTestCase):
                                                 expected_res_status=204)
                     stack_delete.assert_called_once_with(mock.ANY)
 
+    def test_stack_status_resolved_by_tracker(self):
+        stack_id = uuidutils.generate_uuid()
+        with mock.patch.object(heatClient.HeatClient,
+                               'create') as stack_create:
+            stack_create.return_value = {'stack': {'id': stack_id}}
+            self._create_simple_service_chain()
+        tracker = self.plugin.driver_manager.ordered_drivers[
+            0].obj._stack_tracker
+        self.assertTrue(tracker.is_tracked(stack_id))
+
+        def get_stack():
+            context = neutron_context.get_admin_context()
+            return context.session.query(
+                heat_node_driver.ServiceNodeInstanceStack).filter_by(
+                    stack_id=stack_id).one()
+
+        self.assertEqual(heat_node_driver.STATUS_BUILD, get_stack().status)
+
+        # Stacks still in progress stay pending.
+        stack = mock.Mock(id=stack_id, stack_status='CREATE_IN_PROGRESS')
+        with mock.patch.object(heatClient.HeatClient, 'list') as stack_list:
+            stack_list.return_value = [stack]
+            tracker._poll()
+            stack_list.assert_called_once_with([stack_id])
+        self.assertTrue(tracker.is_tracked(stack_id))
+        self.assertEqual(heat_node_driver.STATUS_BUILD, get_stack().status)
+
+        stack.stack_status = 'CREATE_COMPLETE'
+        with mock.patch.object(heatClient.HeatClient, 'list') as stack_list:
+            stack_list.return_value = [stack]
+            tracker._poll()
+        self.assertFalse(tracker.is_tracked(stack_id))
+        self.assertEqual(heat_node_driver.STATUS_ACTIVE, get_stack().status)
+
+    def test_stack_updated_while_listed(self):
+        stack_id = uuidutils.generate_uuid()
+        with mock.patch.object(heatClient.HeatClient,
+                               'create') as stack_create:
+            stack_create.return_value = {'stack': {'id': stack_id}}
+            self._create_simple_service_chain()
+        driver = self.plugin.driver_manager.ordered_drivers[0].obj
+        tracker = driver._stack_tracker
+        context = neutron_context.get_admin_context()
+
+        def get_stack():
+            return context.session.query(
+                heat_node_driver.ServiceNodeInstanceStack).filter_by(
+                    stack_id=stack_id).one()
+
+        def update_stack(stack_ids):
+            # An update of the stack runs while its create is listed
+            driver._set_node_instance_stacks_pending(
+                context.session, [get_stack()], 'new_hash')
+            tracker.track(context, [stack_id])
+            return [mock.Mock(id=stack_id, stack_status='CREATE_COMPLETE')]
+
+        with mock.patch.object(heatClient.HeatClient, 'list') as stack_list:
+            stack_list.side_effect = update_stack
+            tracker._poll()
+        # The completed create neither resolves the update nor untracks it
+        self.assertTrue(tracker.is_tracked(stack_id))
+        context.session.expire_all()
+        self.assertEqual(heat_node_driver.STATUS_BUILD, get_stack().status)
+        self.assertEqual('new_hash', get_stack().config_hash)
+
+        with mock.patch.object(heatClient.HeatClient, 'list') as stack_list:
+            stack_list.return_value = [
+                mock.Mock(id=stack_id, stack_status='UPDATE_COMPLETE')]
+            tracker._poll()
+        self.assertFalse(tracker.is_tracked(stack_id))
+        context.session.expire_all()
+        self.assertEqual(heat_node_driver.STATUS_ACTIVE, get_stack().status)
+
+    def test_stack_tracker_token_expired(self):
+        stack_id = uuidutils.generate_uuid()
+        with mock.patch.object(heatClient.HeatClient,
+                               'create') as stack_create:
+            stack_create.return_value = {'stack': {'id': stack_id}}
+            self._create_simple_service_chain()
+        tracker = self.plugin.driver_manager.ordered_drivers[
+            0].obj._stack_tracker
+        with mock.patch.object(heatClient.HeatClient, 'list') as stack_list:
+            stack_list.side_effect = heat_exc.HTTPUnauthorized()
+            tracker._poll()
+        self.assertFalse(tracker.is_tracked(stack_id))
+
+        # Reading the status tracks the stack again, with a new client.
+        sc_instance = self._list('servicechain_instances')[
+            'servicechain_instances'][0]
+        self.show_servicechain_instance(sc_instance['id'])
+        self.assertTrue(tracker.is_tracked(stack_id))
+
     def test_stack_not_found_ignored(self):
         mock.patch(heatclient.__name__ + ".client.Client",
                    new=MockHeatClientDeleteNotFound).start()
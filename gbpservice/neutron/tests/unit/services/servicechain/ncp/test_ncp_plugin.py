@@ -13,6 +13,7 @@
 
 import webob.exc
 
+import eventlet
 import mock
 from neutron.common import config
 from neutron_lib import context as n_context
@@ -354,6 +355,90 @@ class NodeCompositionPluginTestCase(
         self.assertEqual(1, deploy.call_count)
         self.assertEqual(3, destroy.call_count)
 
+    def test_create_service_chain_parallel(self):
+        cfg.CONF.set_override('parallel_node_deployment', True,
+                              group='node_composition_plugin')
+        self.driver.supports_concurrent_operations = True
+        deploy = self.driver.create = mock.Mock()
+        destroy = self.driver.delete = mock.Mock()
+
+        self._create_simple_service_chain(3)
+        self.assertEqual(3, deploy.call_count)
+        self.assertEqual(0, destroy.call_count)
+        # Every node is deployed with a plugin context of its own
+        plugin_contexts = set(id(call[0][0].plugin_context)
+                              for call in deploy.call_args_list)
+        self.assertEqual(3, len(plugin_contexts))
+        timings = self.sc_plugin.node_timings.get(
+            (self.driver.name, 'create'))
+        self.assertEqual(3, timings.count)
+
+    def test_create_service_chain_parallel_fails(self):
+        cfg.CONF.set_override('parallel_node_deployment', True,
+                              group='node_composition_plugin')
+        self.driver.supports_concurrent_operations = True
+        deploy = self.driver.create = mock.Mock()
+        destroy = self.driver.delete = mock.Mock()
+
+        deploy.side_effect = [None, Exception, None]
+
+        try:
+            self._create_simple_service_chain(3)
+        except Exception:
+            pass
+
+        # All the nodes are attempted, then rolled back
+        self.assertEqual(3, deploy.call_count)
+        self.assertEqual(3, destroy.call_count)
+
+    def test_parallel_node_operation_timeout(self):
+        cfg.CONF.set_override('parallel_node_deployment', True,
+                              group='node_composition_plugin')
+        cfg.CONF.set_override('node_deployment_timeout', 1,
+                              group='node_composition_plugin')
+        self.driver.supports_concurrent_operations = True
+        self.driver.create = mock.Mock(
+            side_effect=lambda context: eventlet.sleep(10))
+        destroy = self.driver.delete = mock.Mock()
+
+        try:
+            self._create_simple_service_chain(2)
+        except Exception:
+            pass
+
+        self.assertEqual(2, destroy.call_count)
+
+    def test_graph_cache_memoizes_deploy_scheduling(self):
+        self.sc_plugin.graph_cache.ttl = 60
+        validate_create = self.driver.validate_create = mock.Mock()
+        deploy = self.driver.create = mock.Mock()
+
+        _, _, prs = self._create_simple_service_chain()
+        self.create_policy_target_group(
+            provided_policy_rule_sets={prs['id']: ''})
+        # Both instances are deployed, but the node is validated once
+        self.assertEqual(2, deploy.call_count)
+        self.assertEqual(1, validate_create.call_count)
+
+    def test_graph_cache_invalidated_on_graph_change(self):
+        self.sc_plugin.graph_cache.ttl = 60
+        validate_create = self.driver.validate_create = mock.Mock()
+
+        prof = self._create_service_profile(
+            service_type='LOADBALANCERV2',
+            vendor=self.SERVICE_PROFILE_VENDOR)['service_profile']
+        node_id = self.create_servicechain_node(
+            service_profile_id=prof['id'],
+            config=self.DEFAULT_LB_CONFIG)['servicechain_node']['id']
+        _, _, prs = self._create_chain_with_nodes([node_id])
+        version = self.sc_plugin.graph_cache.version
+        self.update_servicechain_node(node_id, description='changed')
+        self.assertNotEqual(version, self.sc_plugin.graph_cache.version)
+
+        self.create_policy_target_group(
+            provided_policy_rule_sets={prs['id']: ''})
+        self.assertEqual(2, validate_create.call_count)
+
     def test_update_node_fails(self):
         validate_update = self.driver.validate_update = mock.Mock()
 
@@ -568,6 +653,28 @@ class NodeCompositionPluginTestCase(
         self.assertEqual(1, rem.call_count)
         rem.assert_called_with(mock.ANY, pt)
 
+    def test_relevant_ptg_update_batched(self):
+        self.sc_plugin.pt_batcher.window = 60
+        add = self.driver.update_policy_targets_added = mock.Mock()
+        rem = self.driver.update_policy_targets_removed = mock.Mock()
+
+        provider, _, _ = self._create_simple_service_chain()
+        pts = [self.create_policy_target(
+            policy_target_group_id=provider['id'])['policy_target']
+            for x in range(3)]
+        self.delete_policy_target(pts[0]['id'])
+        # Nothing is notified until the window expires
+        self.assertFalse(add.called)
+        self.assertFalse(rem.called)
+
+        self.sc_plugin.pt_batcher.flush()
+        self.assertEqual(1, add.call_count)
+        self.assertEqual([pt['id'] for pt in pts],
+                         [pt['id'] for pt in add.call_args[0][1]])
+        self.assertEqual(1, rem.call_count)
+        self.assertEqual([pts[0]['id']],
+                         [pt['id'] for pt in rem.call_args[0][1]])
+
     def test_irrelevant_ptg_update(self):
         add = self.driver.update_policy_target_added = mock.Mock()
         rem = self.driver.update_policy_target_removed = mock.Mock()
@@ -11,6 +11,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import eventlet
 import mock
 from neutron_lib.plugins import constants
 from oslo_serialization import jsonutils
@@ -199,6 +200,40 @@ class NFPNodeDriverTestCase(
         for driver in mgr.ordered_drivers:
             self.assertTrue(driver.obj.initialized)
 
+    def test_wait_woken_up_by_status_notification(self):
+        config.cfg.CONF.set_override('service_status_poll_interval', 600,
+                                     group='nfp_node_driver')
+        driver = self.plugin.driver_manager.ordered_drivers[0].obj
+        context = mock.Mock()
+        with mock.patch.object(driver, '_start_status_listener'), \
+                mock.patch.object(nfp_node_driver.NFPClientApi,
+                                  'get_network_function') as get_nf:
+            get_nf.side_effect = [{'id': 'nf', 'status': 'PENDING_CREATE'},
+                                  {'id': 'nf', 'status': 'ACTIVE'}]
+            waiter = eventlet.spawn(
+                driver._wait_for_network_function_operation_completion,
+                context, 'nf', 'create')
+            eventlet.sleep(0)
+            nfp_node_driver.NFPNodeDriverCallbacks(
+            ).network_function_status_changed(mock.ANY, 'nf', 'ACTIVE')
+            with eventlet.Timeout(5):
+                waiter.wait()
+        self.assertEqual(2, get_nf.call_count)
+
+    def test_status_registry_waiters(self):
+        registry = nfp_node_driver.NetworkFunctionStatusRegistry()
+        first = registry.watch('nf')
+        second = registry.watch('nf')
+        registry.unwatch('nf', first)
+        registry.notify('nf', 'ACTIVE')
+        self.assertFalse(first.ready())
+        self.assertEqual('ACTIVE', registry.wait(second, 0))
+        # Only the next status change is notified
+        third = registry.watch('nf')
+        registry.unwatch('nf', third)
+        registry.notify('nf', 'ERROR')
+        self.assertIsNone(registry.wait(third, 0))
+
     def _nfp_create_profiled_servicechain_node(
             self, service_type=constants.LOADBALANCERV2, shared_profile=False,
             profile_tenant_id=None, profile_id=None,
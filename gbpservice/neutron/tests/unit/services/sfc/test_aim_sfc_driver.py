@@ -11,6 +11,9 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import contextlib
+
 import mock
 
 from aim.api import infra as aim_infra
@@ -21,6 +24,7 @@ from networking_sfc.extensions import sfc as sfc_ext
 from networking_sfc.services.flowclassifier.common import config as flc_cfg
 from networking_sfc.services.flowclassifier import driver_manager as fc_driverm
 from networking_sfc.services.sfc.common import config as sfc_cfg
+from networking_sfc.services.sfc.common import context as sfc_ctx
 from networking_sfc.services.sfc import driver_manager as sfc_driverm
 from neutron.db.models import l3 as l3_db
 from neutron_lib.callbacks import exceptions as c_exc
@@ -597,6 +601,26 @@ class TestAIMServiceFunctionChainingBase(test_aim_base.AIMBaseTestCase):
         req = self.new_delete_request('networks', network_id)
         return req.get_response(self.api)
 
+    @contextlib.contextmanager
+    def _count_aim_writes(self):
+        """Count the AIM writes of the SFC driver, by method and type."""
+        writes = collections.Counter()
+        aim = self.sfc_driver.aim
+
+        def counted(method):
+            original = getattr(aim, method)
+
+            def call(context, resource, *args, **kwargs):
+                writes[(method, type(resource).__name__)] += 1
+                return original(context, resource, *args, **kwargs)
+            return call
+
+        with mock.patch.object(aim, 'create', new=counted('create')):
+            with mock.patch.object(aim, 'update', new=counted('update')):
+                with mock.patch.object(aim, 'delete',
+                                       new=counted('delete')):
+                    yield writes
+
 
 class TestPortPair(TestAIMServiceFunctionChainingBase):
 
@@ -1081,6 +1105,40 @@ class TestPortChain(TestAIMServiceFunctionChainingBase):
             ppg['id'], port_pairs=pps)['port_pair_group']
         self._verify_pc_mapping(pc)
 
+    def test_pc_remap_unchanged_no_aim_writes(self):
+        fc = self._create_simple_flowc(src_svi=self.src_svi,
+                                       dst_svi=self.dst_svi)
+        ppg = self._create_simple_ppg(pairs=2)
+        pc = self.create_port_chain(port_pair_groups=[ppg['id']],
+                                    flow_classifiers=[fc['id']],
+                                    expected_res_status=201)['port_chain']
+        c_ctx = sfc_ctx.PortChainContext(self.sfc_plugin, self._ctx, pc, pc)
+        with self._count_aim_writes() as writes:
+            with db_api.CONTEXT_WRITER.using(self._ctx):
+                self.sfc_driver.update_port_chain_precommit(c_ctx,
+                                                            remap=True)
+        self.assertEqual({}, dict(writes))
+        self._verify_pc_mapping(pc)
+
+    def test_ppg_update_aim_writes(self):
+        fc = self._create_simple_flowc(src_svi=self.src_svi,
+                                       dst_svi=self.dst_svi)
+        ppg = self._create_simple_ppg(pairs=2)
+        pc = self.create_port_chain(port_pair_groups=[ppg['id']],
+                                    flow_classifiers=[fc['id']],
+                                    expected_res_status=201)['port_chain']
+        pps = ppg['port_pairs']
+        with self._count_aim_writes() as writes:
+            self.update_port_pair_group(ppg['id'], port_pairs=[pps[0]])
+        # Only the removed port pair's device goes, the chain's objects
+        # are left untouched.
+        self.assertEqual(1, writes[('delete', 'ConcreteDevice')])
+        for resource_type in ['DeviceCluster', 'ServiceGraph', 'Contract',
+                              'DeviceClusterContext']:
+            self.assertEqual(0, writes[('create', resource_type)])
+            self.assertEqual(0, writes[('delete', resource_type)])
+        self._verify_pc_mapping(pc)
+
     def test_flowc_update(self):
         fc = self._create_simple_flowc(src_svi=self.src_svi,
                                        dst_svi=self.dst_svi)
@@ -1309,6 +1367,83 @@ class TestPortChain(TestAIMServiceFunctionChainingBase):
         verify_port_in_host(eprt, 'h2')
         self._verify_pc_mapping(pc)
 
+    def test_port_pair_device_migration_remaps_group_only(self):
+        ppg = self._create_simple_ppg(pairs=1)
+        pp = self.show_port_pair(ppg['port_pairs'][0])['port_pair']
+        fc = self._create_simple_flowc(src_svi=self.src_svi,
+                                       dst_svi=self.dst_svi)
+        pc = self.create_port_chain(port_pair_groups=[ppg['id']],
+                                    flow_classifiers=[fc['id']],
+                                    expected_res_status=201)['port_chain']
+        iprt = self._unbind_port(pp['ingress'])['port']
+        self._plugin.update_port_status(self._ctx, iprt['id'], 'BUILD')
+        self._bind_port_to_host(iprt['id'], 'h2')
+        with mock.patch.object(self.sfc_driver, '_map_port_chain') as map_pc:
+            with mock.patch.object(
+                    self.sfc_driver, '_remap_port_pair_group',
+                    wraps=self.sfc_driver._remap_port_pair_group) as remap:
+                self._plugin.update_port_status(self._ctx, iprt['id'],
+                                                'ACTIVE')
+        self.assertFalse(map_pc.called)
+        self.assertEqual(1, remap.call_count)
+        self.assertEqual(ppg['id'], remap.call_args[0][1]['id'])
+        self._verify_pc_mapping(pc)
+
+    def test_port_bound_non_service_port(self):
+        net = self._make_network(self.fmt, 'net1', True)
+        self._make_subnet(self.fmt, net, '192.168.0.1', '192.168.0.0/24')
+        port = self._make_port(self.fmt, net['network']['id'])['port']
+        self._bind_port_to_host(port['id'], 'h1')
+        with mock.patch.object(self.sfc_driver,
+                               '_validate_port_pair') as validate:
+            self._plugin.update_port_status(self._ctx, port['id'], 'ACTIVE')
+        self.assertFalse(validate.called)
+
+    def test_get_port_pairs_with_peer_state(self):
+        ppg = self._create_simple_ppg(pairs=1)
+        pp = self.show_port_pair(ppg['port_pairs'][0])['port_pair']
+        self._plugin.update_port_status(self._ctx, pp['egress'], 'BUILD')
+        with db_api.CONTEXT_READER.using(self._ctx):
+            pps = self.sfc_driver._get_port_pairs_with_peer_state(
+                self._ctx, pp['ingress'])
+            self.assertEqual(1, len(pps))
+            pp_db, vif_type, status = pps[0]
+            self.assertEqual(pp['id'], pp_db.id)
+            self.assertTrue(self.aim_mech._is_port_bound(
+                {'binding:vif_type': vif_type}))
+            self.assertEqual('BUILD', status)
+            pps = self.sfc_driver._get_port_pairs_with_peer_state(
+                self._ctx, pp['egress'])
+            self.assertEqual(pp['id'], pps[0][0].id)
+            self.assertEqual('ACTIVE', pps[0][2])
+
+    def test_get_chains_by_network_id(self):
+        fc = self._create_simple_flowc(src_svi=self.src_svi,
+                                       dst_svi=self.dst_svi)
+        ppg1 = self._create_simple_ppg(pairs=2)
+        ppg2 = self._create_simple_ppg(pairs=1)
+        pc1 = self.create_port_chain(port_pair_groups=[ppg1['id']],
+                                     flow_classifiers=[fc['id']],
+                                     expected_res_status=201)['port_chain']
+        pp = self.show_port_pair(ppg1['port_pairs'][0])['port_pair']
+        ppg_net = self._get_port_network(pp['ingress'])['id']
+        src_net = fc['l7_parameters']['logical_source_network']
+        with db_api.CONTEXT_WRITER.using(self._ctx):
+            chains = self.sfc_driver._get_chains_by_network_id(self._ctx,
+                                                               src_net)
+            self.assertEqual([pc1['id']], [x['id'] for x in chains])
+            chains = self.sfc_driver._get_chains_by_network_id(self._ctx,
+                                                               ppg_net)
+            self.assertEqual([pc1['id']], [x['id'] for x in chains])
+            self.assertEqual([], self.sfc_driver._get_chains_by_network_id(
+                self._ctx, ppg_net, include_ppgs=False))
+            pcs_resources = self.sfc_driver._get_pcs_flowcs_and_ppgs(
+                self._ctx, chains)
+        flowcs, ppgs = pcs_resources[pc1['id']]
+        self.assertEqual([fc['id']], [x['id'] for x in flowcs])
+        self.assertEqual([ppg1['id']], [x['id'] for x in ppgs])
+        self.assertNotIn(ppg2['id'], [x['id'] for x in ppgs])
+
     # Enable once fixed on the SVI side.
     def _test_pc_mapping_default_sub_ipv6(self):
         fc = self._create_simple_flowc(src_svi=self.src_svi,
@@ -54,6 +54,8 @@ PENDING_UPDATE = "PENDING_UPDATE"
 PENDING_DELETE = "PENDING_DELETE"
 ERROR = "ERROR"
 BUILD = "BUILD"
+# Notified when a network function is deleted.
+DELETED = "DELETED"
 
 NFP_STATUS = [ACTIVE, PENDING_CREATE, PENDING_UPDATE, PENDING_DELETE, ERROR]
 DEVICE_ORCHESTRATOR = "device_orch"
@@ -125,11 +127,16 @@ CHECK_USER_CONFIG_COMPLETE_SPACING = 10
 CHECK_USER_CONFIG_COMPLETE_MAXRETRY = 40
 
 PULL_NOTIFICATIONS_SPACING = 10
+# While requests to the configurator are pending, their notifications are
+# pulled at that spacing, for at most that timeout.
+PENDING_NOTIFICATIONS_SPACING = 1
+PENDING_NOTIFICATIONS_TIMEOUT = 120
 
 # nfp_node_deriver_config
 # all units in sec.
 SERVICE_CREATE_TIMEOUT = 1500
 SERVICE_DELETE_TIMEOUT = 600
+SERVICE_STATUS_POLL_INTERVAL = 5
 
 # heat stack creation timeout
 STACK_ACTION_WAIT_TIME = 300
@@ -45,6 +45,13 @@ class NFPGBPNetworkDriver(neutron_nd.NFPNeutronNetworkDriver):
                 self.network_handler.get_policy_target, token, port_id)
         return pt['port_id']
 
+    def get_port_ids(self, token, port_ids):
+        with nfp_ctx_mgr.GBPContextManager as gcm:
+            pts = gcm.retry(
+                self.network_handler.get_policy_targets, token,
+                filters={'id': list(port_ids)})
+        return dict((pt['id'], pt['port_id']) for pt in pts)
+
     def update_port(self, token, port_id, port):
         with nfp_ctx_mgr.GBPContextManager as gcm:
             pt = gcm.retry(
@@ -32,6 +32,9 @@ class NFPNetworkDriverBase(object):
     def get_port_id(self, token, port_id):
         pass
 
+    def get_port_ids(self, token, port_ids):
+        pass
+
     def get_port_details(self, token, port_id):
         pass
 
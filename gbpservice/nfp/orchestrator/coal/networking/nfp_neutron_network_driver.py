@@ -42,6 +42,9 @@ class NFPNeutronNetworkDriver(ndb.NFPNetworkDriverBase):
     def get_port_id(self, token, port_id):
         return port_id
 
+    def get_port_ids(self, token, port_ids):
+        return dict((port_id, port_id) for port_id in port_ids)
+
     def update_port(self, token, port_id, port):
         with nfp_ctx_mgr.NeutronContextManager as ncm:
             port = ncm.retry(self.neutron_client.update_port,
@@ -95,5 +98,8 @@ class NFPNeutronNetworkDriver(ndb.NFPNetworkDriverBase):
                       security_groups=[],
                       port_security_enabled=port_security)
 
+    def set_promiscuos_mode_fast(self, token, port_id, enable_port_security):
+        self.set_promiscuos_mode(token, port_id, enable_port_security)
+
     def get_service_profile(self, token, service_profile_id):
         return {}
@@ -68,3 +68,6 @@ class HeatClient(object):
 
     def get(self, stack_id):
         return self.stacks.get(stack_id)
+
+    def list(self, filters=None):
+        return self.stacks.list(filters=filters)
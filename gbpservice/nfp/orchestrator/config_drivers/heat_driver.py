@@ -11,7 +11,9 @@
 # under the License.
 
 import ast
+import collections
 import copy
+import functools
 import time
 
 from heatclient import exc as heat_exc
@@ -30,7 +32,10 @@ from gbpservice.nfp.core import log as nfp_logging
 from gbpservice.nfp.lib import nfp_context_manager as nfp_ctx_mgr
 from gbpservice.nfp.lib import transport
 from gbpservice.nfp.orchestrator.config_drivers.heat_client import HeatClient
+from gbpservice.nfp.orchestrator.config_drivers import stack_status
 from gbpservice.nfp.orchestrator.db import nfp_db as nfp_db
+from gbpservice.nfp.orchestrator.openstack.openstack_driver import (
+    CLIENT_POOL)
 from gbpservice.nfp.orchestrator.openstack.openstack_driver import (
     KeystoneClient)
 from gbpservice.nfp.orchestrator.openstack.openstack_driver import (
@@ -38,6 +43,8 @@ from gbpservice.nfp.orchestrator.openstack.openstack_driver import (
 from gbpservice.nfp.orchestrator.openstack.openstack_driver import GBPClient
 
 
+STACK_ACTION_RETRY_WAIT = 5  # Retry after every 5 seconds
+
 HEAT_DRIVER_OPTS = [
     cfg.StrOpt('svc_management_ptg_name',
                default='svc_management_ptg',
@@ -64,6 +71,12 @@ HEAT_DRIVER_OPTS = [
                        "used by heat_driver")),
     cfg.StrOpt('internet_out_network_name', default=None,
                help=_("Public external network name")),
+    cfg.IntOpt('stack_status_interval',
+               default=STACK_ACTION_RETRY_WAIT,
+               help=_("Seconds for which the statuses of the stacks of a "
+                      "tenant, listed with a single heat call, are shared "
+                      "by the network functions waiting on them. 0 gets "
+                      "the stacks one by one")),
 ]
 
 cfg.CONF.register_opts(HEAT_DRIVER_OPTS,
@@ -79,13 +92,33 @@ SVC_MGMT_PTG_NAME = (
 
 STACK_ACTION_WAIT_TIME = (
     cfg.CONF.heat_driver.stack_action_wait_time)
-STACK_ACTION_RETRY_WAIT = 5  # Retry after every 5 seconds
 APIC_OWNED_RES = 'apic_owned_res_'
 INTERNET_OUT_EXT_NET_NAME = cfg.CONF.heat_driver.internet_out_network_name
 
 LOG = nfp_logging.getLogger(__name__)
 
 
+def _metered_render(operation):
+    """Accounts the time taken to render the stack templates."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            start = time.time()
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                elapsed = time.time() - start
+                stats = self.render_metrics[operation]
+                stats['renders'] += 1
+                stats['time'] += elapsed
+                stats['max_time'] = max(stats['max_time'], elapsed)
+                LOG.debug("Rendered the %(operation)s stack template in "
+                          "%(elapsed).3f seconds",
+                          {'operation': operation, 'elapsed': elapsed})
+        return wrapper
+    return decorator
+
+
 class HeatDriver(object):
 
     def __init__(self, config):
@@ -104,6 +137,15 @@ class HeatDriver(object):
             self.v2client, "admin", keystone_version)
         self.heat_role = self._get_role_by_name(
             self.v2client, "heat_stack_owner", keystone_version)
+        self.stack_poller = stack_status.StackStatusPoller(
+            cfg.CONF.heat_driver.stack_status_interval)
+        self.render_metrics = collections.defaultdict(
+            lambda: {'renders': 0, 'time': 0.0, 'max_time': 0.0})
+
+    def get_render_metrics(self):
+        """Returns the count and latency of the stack template renders."""
+        return dict((operation, dict(stats))
+                    for operation, stats in self.render_metrics.items())
 
     def _resource_owner_tenant_id(self):
         with nfp_ctx_mgr.KeystoneContextManager as kcm:
@@ -212,13 +254,17 @@ class HeatDriver(object):
         if timeout_seconds:
             timeout_mins = timeout_mins + 1
         try:
-            heat_client = HeatClient(
-                self.keystone_conf.admin_user,
-                tenant_id,
-                cfg.CONF.heat_driver.heat_uri,
-                self.keystone_conf.admin_password,
-                auth_token=auth_token,
-                timeout_mins=timeout_mins)
+            # The clients, and with them their connections, are kept per
+            # tenant and token.
+            heat_client = CLIENT_POOL.get_client(
+                ('heat', tenant_id, auth_token, timeout_mins),
+                lambda: HeatClient(
+                    self.keystone_conf.admin_user,
+                    tenant_id,
+                    cfg.CONF.heat_driver.heat_uri,
+                    self.keystone_conf.admin_password,
+                    auth_token=auth_token,
+                    timeout_mins=timeout_mins))
         except Exception:
             LOG.exception("Failed to create heatclient object")
             return None
@@ -395,6 +441,13 @@ class HeatDriver(object):
         else:
             return False
 
+    def _check_all_found(self, resource, ids, found):
+        missing = [resource_id for resource_id in ids
+                   if resource_id not in found]
+        if missing:
+            raise Exception("%s(s) %s not found" % (
+                resource, ', '.join(missing)))
+
     def _get_member_ips(self, auth_token, ptg):
         member_addresses = []
         if ptg.get("policy_targets"):
@@ -405,15 +458,22 @@ class HeatDriver(object):
                     filters={'id': ptg.get("policy_targets")})
         else:
             return member_addresses
-        for policy_target in policy_targets:
-            if not self._is_service_target(policy_target):
-                port_id = policy_target.get("port_id")
-                if port_id:
-                    with nfp_ctx_mgr.NeutronContextManager as ncm:
-                        port = ncm.retry(self.neutron_client.get_port,
-                                         auth_token, port_id)['port']
-                    ip_address = port.get('fixed_ips')[0].get("ip_address")
-                    member_addresses.append(ip_address)
+        port_ids = [policy_target['port_id']
+                    for policy_target in policy_targets
+                    if (policy_target.get('port_id') and
+                        not self._is_service_target(policy_target))]
+        if not port_ids:
+            return member_addresses
+        # The ports of all the members are got at once, a missing one fails
+        # the render as its individual lookup did.
+        with nfp_ctx_mgr.NeutronContextManager as ncm:
+            ports = dict((port['id'], port) for port in ncm.retry(
+                self.neutron_client.get_ports,
+                auth_token, filters={'id': port_ids}))
+            self._check_all_found('Port', port_ids, ports)
+        for port_id in port_ids:
+            ip_address = ports[port_id].get('fixed_ips')[0].get("ip_address")
+            member_addresses.append(ip_address)
         return member_addresses
 
     def _generate_lbv2_member_template(self, is_template_aws_version,
@@ -678,6 +738,20 @@ class HeatDriver(object):
                     self.gbp_client.get_policy_target_groups,
                     auth_token, filters)
 
+            # The subnets of all the consumers are got at once
+            subnet_ids = [subnet_id for consumer in consumer_ptgs_details
+                          if not consumer['proxied_group_id']
+                          for subnet_id in consumer['subnets']]
+            consumer_subnets = {}
+            if subnet_ids:
+                with nfp_ctx_mgr.NeutronContextManager as ncm:
+                    consumer_subnets = dict(
+                        (subnet['id'], subnet) for subnet in ncm.retry(
+                            self.neutron_client.get_subnets,
+                            auth_token, filters={'id': subnet_ids}))
+                    self._check_all_found('Subnet', subnet_ids,
+                                          consumer_subnets)
+
             # Revisit(Magesh): What is the name updated below ?? FW or Rule?
             # This seems to have no effect in UTs
             for consumer in consumer_ptgs_details:
@@ -685,9 +759,7 @@ class HeatDriver(object):
                     continue
                 fw_template_properties.update({'name': consumer['id'][:3]})
                 for subnet_id in consumer['subnets']:
-                    with nfp_ctx_mgr.NeutronContextManager as ncm:
-                        subnet = ncm.retry(self.neutron_client.get_subnet,
-                                           auth_token, subnet_id)['subnet']
+                    subnet = consumer_subnets[subnet_id]
                     if subnet['name'].startswith(APIC_OWNED_RES):
                         continue
 
@@ -878,6 +950,7 @@ class HeatDriver(object):
         nf_desc = self._get_resource_desc(nfp_context, service_details)
         return nf_desc
 
+    @_metered_render('create')
     def _create_node_config_data(self, auth_token, tenant_id,
                                  service_chain_node, service_chain_instance,
                                  provider, provider_port, consumer,
@@ -1036,6 +1109,7 @@ class HeatDriver(object):
                       " or has been disassociated Manually")
             return None
 
+    @_metered_render('update')
     def _update_node_config(self, auth_token, tenant_id, service_profile,
                             service_chain_node, service_chain_instance,
                             provider, consumer_port, network_function,
@@ -1517,7 +1591,8 @@ class HeatDriver(object):
         if not heatclient:
             return failure_status
         with nfp_ctx_mgr.HeatContextManager as hcm:
-            stack = hcm.retry(heatclient.get, stack_id)
+            stack = hcm.retry(self.stack_poller.get, heatclient, tenant_id,
+                              stack_id)
             if stack.stack_status == 'DELETE_FAILED':
                 return failure_status
             elif stack.stack_status == 'CREATE_COMPLETE':
@@ -1550,7 +1625,8 @@ class HeatDriver(object):
         if not heatclient:
             return failure_status
         with nfp_ctx_mgr.HeatContextManager as hcm:
-            stack = hcm.retry(heatclient.get, stack_id)
+            stack = hcm.retry(self.stack_poller.get, heatclient,
+                              provider_tenant_id, stack_id)
         if stack.stack_status == 'DELETE_FAILED':
             return failure_status
         elif stack.stack_status == 'CREATE_COMPLETE':
@@ -1580,7 +1656,8 @@ class HeatDriver(object):
         if not heatclient:
             return failure_status
         with nfp_ctx_mgr.HeatContextManager as hcm:
-            stack = hcm.retry(heatclient.get, stack_id)
+            stack = hcm.retry(self.stack_poller.get, heatclient, tenant_id,
+                              stack_id)
             if stack.stack_status == 'DELETE_FAILED':
                 return failure_status
             elif stack.stack_status == 'CREATE_COMPLETE':
@@ -0,0 +1,79 @@
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+from collections import defaultdict
+import threading
+import time
+
+from gbpservice.nfp.core import log as nfp_logging
+
+LOG = nfp_logging.getLogger(__name__)
+
+IN_PROGRESS_STATUSES = ['CREATE_IN_PROGRESS', 'UPDATE_IN_PROGRESS',
+                        'DELETE_IN_PROGRESS']
+# Stacks not asked for during that many intervals are no longer listed
+WATCH_INTERVALS = 10
+
+
+class StackStatusPoller(object):
+    """Status of the heat stacks that the network functions wait on.
+
+    Rather than every network function getting its own stack at each poll,
+    the stacks being waited on in a tenant are listed with a single call at
+    most once per interval, and the status of each stack is taken from that
+    listing. Stacks missing from it, deleted or created since, are got
+    individually, as are the stacks listed before they started being
+    waited on, whose listed status may be the one of a former operation.
+    """
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._locks = defaultdict(threading.Lock)
+        # tenant_id -> (time listed, {stack_id: stack})
+        self._listings = {}
+        # tenant_id -> {stack_id: [time first asked for, last asked for]}
+        self._watched = defaultdict(dict)
+
+    def _get_listing(self, heatclient, tenant_id):
+        # The network functions waiting while the stacks are being listed
+        # get the result of that listing.
+        with self._locks[tenant_id]:
+            listed_at, stacks = self._listings.get(tenant_id, (0, {}))
+            now = time.time()
+            if now - listed_at >= self.interval:
+                watched = self._watched[tenant_id]
+                for stack_id, (_, asked_at) in list(watched.items()):
+                    if now - asked_at > self.interval * WATCH_INTERVALS:
+                        del watched[stack_id]
+                stacks = {}
+                if watched:
+                    stacks = dict(
+                        (stack.id, stack) for stack in heatclient.list(
+                            filters={'id': sorted(watched)}))
+                listed_at = now
+                self._listings[tenant_id] = (listed_at, stacks)
+            return listed_at, stacks
+
+    def get(self, heatclient, tenant_id, stack_id):
+        """Returns the stack, as of the last listing of the tenant."""
+        if not self.interval:
+            return heatclient.get(stack_id)
+        now = time.time()
+        watch = self._watched[tenant_id].setdefault(stack_id, [now, now])
+        watch[1] = now
+        listed_at, stacks = self._get_listing(heatclient, tenant_id)
+        stack = stacks.get(stack_id) if listed_at >= watch[0] else None
+        if stack is None:
+            stack = heatclient.get(stack_id)
+        if stack.stack_status not in IN_PROGRESS_STATUSES:
+            self._watched[tenant_id].pop(stack_id, None)
+        return stack
@@ -11,8 +11,14 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import collections
+import copy
+import time
+
 from oslo_serialization import jsonutils
 from oslo_utils import uuidutils
+from sqlalchemy import event as sa_event
+from sqlalchemy import orm
 from sqlalchemy.orm import exc
 
 from gbpservice.nfp.common import exceptions as nfp_exc
@@ -23,12 +29,52 @@ from gbpservice.nfp.core import log as nfp_logging
 
 LOG = nfp_logging.getLogger(__name__)
 
+# Version key of the network function devices, which are shared by NFs
+DEVICES_VERSION = 'devices'
+
 
 class NFPDbBase(common_db_mixin.CommonDbMixin):
 
+    # Bumped on the changes to the network functions, their instances and
+    # the devices, made by this process, see NetworkFunctionContextCache.
+    context_versions = collections.defaultdict(int)
+
     def __init__(self, *args, **kwargs):
         super(NFPDbBase, self).__init__(*args, **kwargs)
 
+    @classmethod
+    def _bump_context_version(cls, session, key):
+        """Bumps the version of key once the transaction of session commits.
+
+        Bumping it before, a context read from the uncommitted state would
+        be cached against the new version.
+        """
+        def _bump():
+            cls.context_versions[key] += 1
+        if key:
+            cls._after_commit(session, _bump)
+
+    @staticmethod
+    def _after_commit(session, callback, *args):
+        """Calls callback once the transaction of the session commits.
+
+        Right away when the session has no transaction in progress. If the
+        transaction is rolled back instead, callback is called on the next
+        commit of the session.
+        """
+        if session.transaction is None:
+            callback(*args)
+            return
+
+        def _callback(session):
+            callback(*args)
+        sa_event.listen(session, 'after_commit', _callback, once=True)
+
+    @classmethod
+    def get_context_version(cls, network_function_id):
+        return (cls.context_versions[network_function_id],
+                cls.context_versions[DEVICES_VERSION])
+
     def create_network_function(self, session, network_function):
         with session.begin(subtransactions=True):
             network_function_db = nfp_db_model.NetworkFunction(
@@ -71,6 +117,7 @@ class NFPDbBase(common_db_mixin.CommonDbMixin):
                         network_function_db['service_id'],
                         network_function_db['service_chain_id'],
                         updated_network_function_map)
+        self._bump_context_version(session, network_function_id)
         return self._make_network_function_dict(network_function_db)
 
     def delete_network_function(self, session, network_function_id):
@@ -81,6 +128,7 @@ class NFPDbBase(common_db_mixin.CommonDbMixin):
             # deleting sc-node-instance-nf entry
             self.delete_node_instance_network_function_map(
                  session, network_function_id)
+        self._bump_context_version(session, network_function_id)
 
     def get_network_function(self, session, network_function_id, fields=None):
         service = self._get_network_function(session, network_function_id)
@@ -140,6 +188,8 @@ class NFPDbBase(common_db_mixin.CommonDbMixin):
             session.add(network_function_instance_db)
             self._set_port_info_for_nfi(session, network_function_instance_db,
                                         network_function_instance)
+        self._bump_context_version(
+            session, network_function_instance_db.network_function_id)
         return self._make_network_function_instance_dict(
             network_function_instance_db)
 
@@ -167,6 +217,8 @@ class NFPDbBase(common_db_mixin.CommonDbMixin):
                     updated_network_function_instance, is_update=True)
             network_function_instance_db.update(
                 updated_network_function_instance)
+        self._bump_context_version(
+            session, network_function_instance_db.network_function_id)
         return self._make_network_function_instance_dict(
             network_function_instance_db)
 
@@ -178,6 +230,8 @@ class NFPDbBase(common_db_mixin.CommonDbMixin):
             for port in network_function_instance_db.port_info:
                 self.delete_port_info(session, port['data_port_id'])
             session.delete(network_function_instance_db)
+        self._bump_context_version(
+            session, network_function_instance_db.network_function_id)
 
     def get_network_function_instance(self, session,
                                       network_function_instance_id,
@@ -391,8 +445,9 @@ class NFPDbBase(common_db_mixin.CommonDbMixin):
             updated_network_function_device[
                 'monitoring_port_id'] = monitoring_port_id
 
-            return self._make_network_function_device_dict(
-                network_function_device_db)
+        self._bump_context_version(session, DEVICES_VERSION)
+        return self._make_network_function_device_dict(
+            network_function_device_db)
 
     def delete_network_function_device(self, session,
                                        network_function_device_id):
@@ -411,6 +466,7 @@ class NFPDbBase(common_db_mixin.CommonDbMixin):
                     session,
                     network_function_device_db.monitoring_port_network)
             session.delete(network_function_device_db)
+        self._bump_context_version(session, DEVICES_VERSION)
 
     def get_network_function_device(self, session, network_function_device_id,
                                     fields=None):
@@ -432,35 +488,111 @@ class NFPDbBase(common_db_mixin.CommonDbMixin):
                                     marker_obj=marker_obj,
                                     page_reverse=page_reverse)
 
+    def get_shareable_network_function_devices(self, session, tenant_id,
+                                               service_vendor,
+                                               interfaces_needed,
+                                               status='ACTIVE', limit=None):
+        """Returns the devices with interfaces_needed interfaces free.
+
+        The devices are looked up on the sharing index, least loaded first.
+        Meant for the orchestration drivers that share devices, none of the
+        drivers in tree does yet.
+        """
+        nfd = nfp_db_model.NetworkFunctionDevice
+        query = self._model_query(session, nfd).filter(
+            nfd.project_id == tenant_id,
+            nfd.service_vendor == service_vendor,
+            nfd.status == status,
+            nfd.interfaces_in_use + interfaces_needed <=
+            nfd.max_interfaces).order_by(nfd.interfaces_in_use)
+        if limit:
+            query = query.limit(limit)
+        return [self._make_network_function_device_dict(device)
+                for device in query]
+
+    def _update_network_function_device_count(self, session,
+                                              network_function_device_id,
+                                              field_name, delta):
+        # A single UPDATE, so that the concurrent updates of the count
+        # don't overwrite each other.
+        nfd = nfp_db_model.NetworkFunctionDevice
+        column = getattr(nfd, field_name)
+        with session.begin(subtransactions=True):
+            updated = session.query(nfd).filter(
+                nfd.id == network_function_device_id).update(
+                    {column: column + delta},
+                    synchronize_session='evaluate')
+        if not updated:
+            raise nfp_exc.NetworkFunctionDeviceNotFound(
+                network_function_device_id=network_function_device_id)
+        self._bump_context_version(session, DEVICES_VERSION)
+
     def increment_network_function_device_count(self, session,
                                                 network_function_device_id,
                                                 field_name,
                                                 updated_value=1):
-        with session.begin(subtransactions=True):
-            network_function_device = self._get_network_function_device(
-                session, network_function_device_id)
-            value = network_function_device[field_name]
-            value += updated_value
-            update_device = (
-                {field_name: value})
-            self.update_network_function_device(session,
-                                                network_function_device_id,
-                                                update_device)
+        self._update_network_function_device_count(
+            session, network_function_device_id, field_name, updated_value)
 
     def decrement_network_function_device_count(self, session,
                                                 network_function_device_id,
                                                 field_name,
                                                 updated_value=1):
-        with session.begin(subtransactions=True):
-            network_function_device = self._get_network_function_device(
-                session, network_function_device_id)
-            value = network_function_device[field_name]
-            value -= updated_value
-            update_device = (
-                {field_name: value})
-            self.update_network_function_device(session,
-                                                network_function_device_id,
-                                                update_device)
+        self._update_network_function_device_count(
+            session, network_function_device_id, field_name, -updated_value)
+
+    def get_network_function_context(self, session, network_function_id):
+        """Returns a network function with its instance and device.
+
+        The network function, its instances and their devices are read
+        with a single joined query, and the port infos of the instance and
+        the device with one more, as 'port_infos' by port ID.
+        """
+        nf_model = nfp_db_model.NetworkFunction
+        nfi_model = nfp_db_model.NetworkFunctionInstance
+        nfd_model = nfp_db_model.NetworkFunctionDevice
+        rows = (session.query(nf_model, nfd_model).
+                outerjoin(nf_model.network_function_instances).
+                outerjoin(nfi_model.port_info).
+                outerjoin(nfd_model, nfd_model.id ==
+                          nfi_model.network_function_device_id).
+                options(orm.contains_eager(
+                    nf_model.network_function_instances).contains_eager(
+                        nfi_model.port_info)).
+                filter(nf_model.id == network_function_id).all())
+        if not rows:
+            raise nfp_exc.NetworkFunctionNotFound(
+                network_function_id=network_function_id)
+        network_function_db = rows[0][0]
+        devices = dict((nfd.id, nfd) for _, nfd in rows if nfd)
+
+        nf_context = {
+            'network_function': self._make_network_function_dict(
+                network_function_db),
+            'network_function_instance': None,
+            'network_function_device': None,
+            'port_infos': {}}
+        if not network_function_db.network_function_instances:
+            return nf_context
+        # Assuming single network_function_instance
+        nfi_db = network_function_db.network_function_instances[0]
+        nf_context['network_function_instance'] = (
+            self._make_network_function_instance_dict(nfi_db))
+        port_ids = [port['data_port_id'] for port in nfi_db.port_info]
+        nfd_db = devices.get(nfi_db.network_function_device_id)
+        if nfd_db:
+            nf_context['network_function_device'] = (
+                self._make_network_function_device_dict(nfd_db))
+            port_ids += [port_id for port_id in (nfd_db.mgmt_port_id,
+                                                 nfd_db.monitoring_port_id)
+                         if port_id]
+        if port_ids:
+            port_infos = session.query(nfp_db_model.PortInfo).filter(
+                nfp_db_model.PortInfo.id.in_(port_ids))
+            nf_context['port_infos'] = dict(
+                (port_info.id, self._make_port_info_dict(port_info, None))
+                for port_info in port_infos)
+        return nf_context
 
     def get_port_info(self, session, port_id, fields=None):
         port_info = self._get_port_info(session, port_id)
@@ -670,6 +802,7 @@ class NFPDbBase(common_db_mixin.CommonDbMixin):
                 return None, None
 
     def get_providers_for_gateway(self, session, _id):
+        # Looked up on the gateway_ptg index
         svc_gw = nfp_db_model.ServiceGatewayDetails
         try:
             with session.begin(subtransactions=True):
@@ -776,3 +909,32 @@ class NFPDbBase(common_db_mixin.CommonDbMixin):
                     session.delete(sc_node_instance_ns_map)
         except exc.NoResultFound:
             return None
+
+
+class NetworkFunctionContextCache(object):
+    """LRU cache of the network function contexts, by NF ID.
+
+    The entries are stamped with the versions of their NF and of the
+    devices when they were read, and are used while these are unchanged.
+    The changes made by the other NFP processes don't bump the versions
+    of this one, so the entries also expire after ttl seconds.
+    """
+
+    def __init__(self, size=1024):
+        self.size = size
+        self._entries = collections.OrderedDict()
+
+    def get(self, network_function_id, loader, ttl):
+        if not ttl:
+            return loader()
+        version = NFPDbBase.get_context_version(network_function_id)
+        entry = self._entries.pop(network_function_id, None)
+        if entry and entry[0] == version and time.time() - entry[1] < ttl:
+            self._entries[network_function_id] = entry
+            return copy.deepcopy(entry[2])
+        nf_context = loader()
+        self._entries[network_function_id] = (
+            version, time.time(), copy.deepcopy(nf_context))
+        while len(self._entries) > self.size:
+            self._entries.popitem(last=False)
+        return nf_context
@@ -121,6 +121,13 @@ class NetworkFunctionDevice(BASE, model_base.HasId, model_base.HasProject,
                             HasStatusDescription):
     """Represents the Network Function Device"""
     __tablename__ = 'nfp_network_function_devices'
+    # Covers the lookups of the devices that can be shared, least loaded
+    # first.
+    __table_args__ = (
+        sa.Index('ix_nfp_network_function_devices_sharing',
+                 'project_id', 'service_vendor', 'status',
+                 'interfaces_in_use'),
+    )
 
     name = sa.Column(sa.String(255))
     description = sa.Column(sa.String(255))
@@ -151,6 +158,10 @@ class ClusterInfo(BASE, model_base.HasId, model_base.HasProject):
     cluster and optional.
     """
     __tablename__ = 'nfd_cluster_mapping_info'
+    __table_args__ = (
+        sa.Index('ix_nfd_cluster_mapping_info_nfd_id',
+                 'network_function_device_id'),
+    )
     network_function_device_id = sa.Column(sa.String(36), nullable=False)
     cluster_group = sa.Column(sa.Integer(), nullable=True)
     virtual_ip = sa.Column(sa.String(36), nullable=True)
@@ -160,6 +171,9 @@ class ClusterInfo(BASE, model_base.HasId, model_base.HasProject):
 
 class ServiceGatewayDetails(BASE, model_base.HasId):
     __tablename__ = 'nfp_service_gateway_info'
+    __table_args__ = (
+        sa.Index('ix_nfp_service_gateway_info_gateway_ptg', 'gateway_ptg'),
+    )
     network_function_id = sa.Column(sa.String(36), sa.ForeignKey(
         'nfp_network_functions.id', ondelete='CASCADE'), nullable=False,
         primary_key=True)
@@ -0,0 +1,158 @@
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from collections import defaultdict
+import os
+import threading
+import time
+
+from oslo_config import cfg
+import oslo_messaging
+
+from gbpservice.nfp.core import log as nfp_logging
+
+LOG = nfp_logging.getLogger(__name__)
+
+# Instances not asked for during that many intervals are forgotten
+WATCH_INTERVALS = 10
+
+# Nova instance vm_state to the server status reported by the API
+VM_STATE_STATUS = {
+    'active': 'ACTIVE',
+    'error': 'ERROR',
+    'building': 'BUILD',
+    'deleted': None,
+}
+
+
+class InstanceNotificationEndpoint(object):
+    filter_rule = oslo_messaging.NotificationFilter(
+        event_type=r'^compute\.instance\.(update|delete\.end)$')
+
+    def __init__(self, watcher):
+        self._watcher = watcher
+
+    def info(self, ctxt, publisher_id, event_type, payload, metadata):
+        instance_id = payload.get('instance_id')
+        state = payload.get('state')
+        if not instance_id or not state:
+            return None
+        if event_type == 'compute.instance.delete.end':
+            state = 'deleted'
+        self._watcher.set_status(
+            instance_id, VM_STATE_STATUS.get(state, state.upper()))
+        return oslo_messaging.NotificationResult.HANDLED
+
+
+class InstanceStatusWatcher(object):
+    """Status of the Nova instances that the NFP devices are waiting on.
+
+    Rather than every device polling Nova for its own instance, the
+    instances of a tenant are listed, all the pages of them, with a single
+    get_instances call at most once per interval while some are waited
+    on, and the status of each device is taken from that listing. The
+    instances missing from it, deleted or created since, are got
+    individually, as are the instances listed before they started being
+    waited on. When notifications are enabled, the statuses carried by the
+    compute.instance notifications are used as soon as they arrive.
+    """
+
+    def __init__(self, nova, interval, notifications=False):
+        self.nova = nova
+        self.interval = interval
+        self.notifications = notifications
+        self._listener_pid = None
+        self._locks = defaultdict(threading.Lock)
+        # tenant_id -> (time listed, {instance_id: status})
+        self._listings = {}
+        # instance_id -> status, from the notifications, of the instances
+        # that were asked for
+        self._notified = {}
+        # instance_id -> [tenant_id, time first asked for, last asked for]
+        self._watched = {}
+
+    def _start_listener(self):
+        # Started in each of the NFP workers, as they keep their own
+        # statuses, hence a pool per worker.
+        if self._listener_pid == os.getpid():
+            return
+        self._listener_pid = os.getpid()
+        self._notified = {}
+        self._watched = {}
+        targets = [oslo_messaging.Target(topic='notifications',
+                                         exchange='nova')]
+        transport = oslo_messaging.get_notification_transport(cfg.CONF)
+        server = oslo_messaging.get_notification_listener(
+            transport, targets, [InstanceNotificationEndpoint(self)],
+            executor='eventlet',
+            pool='nfp-instance-watcher-%s' % self._listener_pid)
+        server.start()
+        LOG.info("Listening to the Nova instance notifications, pool %s",
+                 'nfp-instance-watcher-%s' % self._listener_pid)
+
+    def set_status(self, instance_id, status):
+        if instance_id in self._watched:
+            self._notified[instance_id] = status
+
+    def _unwatch(self, instance_id):
+        self._watched.pop(instance_id, None)
+        self._notified.pop(instance_id, None)
+
+    def _prune(self, now):
+        # The instances no longer asked for, and the listings of the
+        # tenants without any watched instance, are forgotten.
+        for instance_id, (_, _, asked_at) in list(self._watched.items()):
+            if now - asked_at > self.interval * WATCH_INTERVALS:
+                self._unwatch(instance_id)
+        tenants = set(tenant_id for tenant_id, _, _ in self._watched.values())
+        for tenant_id in list(self._listings):
+            if tenant_id not in tenants:
+                del self._listings[tenant_id]
+
+    def _get_listing(self, token, tenant_id):
+        # The devices waiting while the instances are being listed get
+        # the result of that listing.
+        with self._locks[tenant_id]:
+            listed_at, statuses = self._listings.get(tenant_id, (0, {}))
+            now = time.time()
+            if now - listed_at >= self.interval:
+                instances = self.nova.get_instances(
+                    token, filters={'tenant_id': tenant_id}, limit=-1)
+                statuses = dict((instance['id'], instance['status'])
+                                for instance in instances)
+                listed_at = now
+                self._listings[tenant_id] = (listed_at, statuses)
+            return listed_at, statuses
+
+    def get_status(self, token, tenant_id, instance_id):
+        """Returns the instance status.
+
+        None when its deletion was notified. Otherwise, the instances that
+        no longer exist are got individually, which raises.
+        """
+        if self.notifications:
+            self._start_listener()
+        now = time.time()
+        watch = self._watched.setdefault(instance_id, [tenant_id, now, now])
+        watch[2] = now
+        self._prune(now)
+        if instance_id in self._notified:
+            status = self._notified[instance_id]
+            if status is None:
+                self._unwatch(instance_id)
+            return status
+        listed_at, statuses = self._get_listing(token, tenant_id)
+        status = statuses.get(instance_id) if listed_at >= watch[1] else None
+        if status is None:
+            status = self.nova.get_instance(
+                token, tenant_id, instance_id)['status']
+        return status
@@ -19,6 +19,7 @@ from gbpservice.nfp.common import exceptions
 from gbpservice.nfp.core import executor as nfp_executor
 from gbpservice.nfp.core import log as nfp_logging
 from gbpservice.nfp.lib import nfp_context_manager as nfp_ctx_mgr
+from gbpservice.nfp.orchestrator.drivers import instance_watcher
 from gbpservice.nfp.orchestrator.coal.networking import (
     nfp_gbp_network_driver
 )
@@ -66,6 +67,11 @@ class OrchestrationDriver(object):
                 nfp_neutron_network_driver.NFPNeutronNetworkDriver(config)
         }
         self.config = config
+        self.instance_watcher = instance_watcher.InstanceStatusWatcher(
+            self.compute_handler_nova,
+            config.device_orchestrator.instance_status_interval,
+            notifications=(
+                config.device_orchestrator.instance_status_notifications))
 
     def _get_admin_tenant_id(self, token=None):
         with nfp_ctx_mgr.KeystoneContextManager as kcm:
@@ -517,30 +523,26 @@ class OrchestrationDriver(object):
         token = device_data['token']
         enable_port_security = device_data.get('enable_port_security')
         if not device_data['interfaces_to_attach']:
-            for port in device_data['ports']:
-                if (port['port_classification'] ==
-                        nfp_constants.PROVIDER):
-                    if (device_data['service_details'][
-                        'service_type'].lower()
-                        in [nfp_constants.FIREWALL.lower(),
-                            nfp_constants.VPN.lower()]):
-                        network_handler.set_promiscuos_mode(
-                            token, port['id'], enable_port_security)
-                    port_id = network_handler.get_port_id(
-                        token, port['id'])
-                    interfaces_to_attach.append({'port': port_id})
-            for port in device_data['ports']:
-                if (port['port_classification'] ==
-                        nfp_constants.CONSUMER):
-                    if (device_data['service_details'][
-                        'service_type'].lower()
-                        in [nfp_constants.FIREWALL.lower(),
-                            nfp_constants.VPN.lower()]):
-                        network_handler.set_promiscuos_mode(
-                            token, port['id'], enable_port_security)
-                    port_id = network_handler.get_port_id(
-                        token, port['id'])
-                    interfaces_to_attach.append({'port': port_id})
+            ports = ([port for port in device_data['ports']
+                      if port['port_classification'] ==
+                      nfp_constants.PROVIDER] +
+                     [port for port in device_data['ports']
+                      if port['port_classification'] ==
+                      nfp_constants.CONSUMER])
+            if not ports:
+                return
+            # Resolve the neutron ports of all the PTs in one go
+            port_ids = network_handler.get_port_ids(
+                token, [port['id'] for port in ports])
+            for port in ports:
+                port_id = port_ids[port['id']]
+                if (device_data['service_details'][
+                    'service_type'].lower()
+                    in [nfp_constants.FIREWALL.lower(),
+                        nfp_constants.VPN.lower()]):
+                    network_handler.set_promiscuos_mode_fast(
+                        token, port_id, enable_port_security)
+                interfaces_to_attach.append({'port': port_id})
         else:
             for interface in device_data['interfaces_to_attach']:
                 interfaces_to_attach.append(
@@ -687,12 +689,10 @@ class OrchestrationDriver(object):
             return None
 
         with nfp_ctx_mgr.NovaContextManager.new(suppress=(Exception,)) as ncm:
-            device = ncm.retry(self.compute_handler_nova.get_instance,
-                               device_data['token'],
-                               device_data['tenant_id'],
-                               device_data['id'])
-
-            return device['status']
+            return ncm.retry(self.instance_watcher.get_status,
+                             device_data['token'],
+                             device_data['tenant_id'],
+                             device_data['id'])
 
     @_set_network_handler
     def plug_network_function_device_interfaces(self, device_data,
@@ -857,8 +857,12 @@ class OrchestrationDriver(object):
             return True
 
         with nfp_ctx_mgr.NovaContextManager.new(suppress=(Exception,)) as ncm:
+            port_ids = self._get_ports_from_pts(device_data)
             for port in device_data['ports']:
-                port_id = self._get_port_from_pt(device_data, port['id'])
+                port_id = port_ids.get(port['id'])
+                if not port_id:
+                    LOG.error('Policy Target %(pt_id)s not found in '
+                              'provided data', {'pt_id': port['id']})
                 ncm.retry(self.compute_handler_nova.detach_interface,
                           token,
                           device_data['tenant_id'],
@@ -878,41 +882,34 @@ class OrchestrationDriver(object):
         delete l2 policies
         '''
         gbp_cli = network_handler.network_handler
-        for ptg in device_data['provider']['ptg']:
-            try:
-                ptg_details = gbp_cli.get_policy_target_group(token,
-                        ptg['id'])
-                if ptg_details:
-                    LOG.debug('Provider ptg is in use !!')
-                    continue
-            except Exception:
-                LOG.debug('Provider not found !!')
-            with nfp_ctx_mgr.GBPContextManager as gcm:
-                l2p = gbp_cli.get_l2_policy(token, ptg['l2_policy_id'])
-                # deleting l2p if it is created implicitly
-                if 'Implicitly' in l2p['description']:
-                    gcm.retry(gbp_cli.delete_l2_policy, token,
-                            ptg['l2_policy_id'])
-
-        if ('consumer' not in device_data.keys() or not device_data[
+        ptgs = list(device_data['provider']['ptg'])
+        if ('consumer' in device_data.keys() and device_data[
             'consumer'].get('ptg')):
+            ptgs += device_data['consumer']['ptg']
+        if not ptgs:
             return
 
-        for ptg in device_data['consumer']['ptg']:
-            try:
-                ptg_details = gbp_cli.get_policy_target_group(token,
-                        ptg['id'])
-                if ptg_details:
-                    LOG.debug('Stitching PTG is in use !!')
-                    continue
-            except Exception:
-                LOG.debug('Stitching PTG not found !!')
-            with nfp_ctx_mgr.GBPContextManager as gcm:
-                l2p = gbp_cli.get_l2_policy(token, ptg['l2_policy_id'])
+        # Look the PTGs and their L2 policies up in one call each
+        try:
+            ptgs_in_use = set(
+                ptg['id'] for ptg in gbp_cli.get_policy_target_groups(
+                    token, filters={'id': [ptg['id'] for ptg in ptgs]}))
+        except Exception:
+            LOG.debug('Provider and stitching PTGs not found !!')
+            ptgs_in_use = set()
+        ptgs = [ptg for ptg in ptgs if ptg['id'] not in ptgs_in_use]
+        if ptgs_in_use:
+            LOG.debug('Provider or stitching PTGs %s are in use !!',
+                      list(ptgs_in_use))
+        if not ptgs:
+            return
+        with nfp_ctx_mgr.GBPContextManager as gcm:
+            l2ps = gcm.retry(gbp_cli.get_l2_policys, token, filters={
+                'id': [ptg['l2_policy_id'] for ptg in ptgs]})
+            for l2p in l2ps:
                 # deleting l2p if it is created implicitly
                 if 'Implicitly' in l2p['description']:
-                    gcm.retry(gbp_cli.delete_l2_policy, token,
-                            ptg['l2_policy_id'])
+                    gcm.retry(gbp_cli.delete_l2_policy, token, l2p['id'])
 
     def _delete_port(self, token, port_id):
         '''
@@ -925,24 +922,13 @@ class OrchestrationDriver(object):
             LOG.error("Failed to delete port %(port_id)s. Error: %(exc)s",
                     {"port_id": port_id, 'exc': exc})
 
-    def _get_port_from_pt(self, device_data, pt_id):
+    def _get_ports_from_pts(self, device_data):
         '''
-        get neutron_port_id from pt_id using data
+        get the neutron_port_id of each pt_id using data
         '''
-        port_id = None
-        for pt in device_data['provider']['pt']:
-            if pt['id'] == pt_id:
-                return pt['port_id']
-
-        if not device_data['consumer'].get('pt'):
-            return port_id
-
-        for pt in device_data['consumer']['pt']:
-            if pt['id'] == pt_id:
-                return pt['port_id']
-        LOG.error('Policy Target %(pt_id) not found in provided data',
-                {'pt_id': pt_id})
-        return port_id
+        pts = list(device_data['provider']['pt'])
+        pts += device_data['consumer'].get('pt') or []
+        return dict((pt['id'], pt['port_id']) for pt in pts)
 
     def get_port_details(self, port_id, port_model, data):
         '''
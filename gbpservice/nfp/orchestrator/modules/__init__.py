@@ -52,7 +52,22 @@ nfp_orchestrator_opts = [
                  nfp_constants.HAPROXY_LBAASV2, nfp_constants.NFP_VENDOR],
         help="Supported service vendors for nfp"),
     oslo_config.StrOpt('monitoring_ptg_l3policy_id',
-                       default='')
+                       default=''),
+    oslo_config.IntOpt('nf_context_cache_ttl',
+                       default=0,
+                       help='Seconds for which the network function contexts '
+                            'read from the DB are cached, unless the network '
+                            'function or the devices are changed by the same '
+                            'process. 0 disables the cache'),
+    oslo_config.IntOpt('nf_context_cache_size',
+                       default=1024,
+                       help='Maximum number of cached network function '
+                            'contexts'),
+    oslo_config.BoolOpt('base_mode_fast_path',
+                        default=False,
+                        help='Apply the heat config of the base mode network '
+                             'functions being created without the round '
+                             'trip to the configurator')
 ]
 
 oslo_config.CONF.register_opts(nfp_orchestrator_opts, 'orchestrator')
@@ -61,7 +76,18 @@ device_orchestrator_opts = [
     oslo_config.BoolOpt('volume_support',
                         default=False, help='cinder volume support'),
     oslo_config.StrOpt('volume_size',
-                       default='2', help='cinder volume size')
+                       default='2', help='cinder volume size'),
+    oslo_config.IntOpt('instance_status_interval',
+                       default=5,
+                       help='Seconds for which the statuses of the service '
+                            'VM instances of a tenant, listed with a single '
+                            'Nova call, are shared by the devices waiting on '
+                            'them'),
+    oslo_config.BoolOpt('instance_status_notifications',
+                        default=False,
+                        help='Take the status of the service VM instances '
+                             'from the Nova compute.instance notifications '
+                             'when available')
 ]
 
 oslo_config.CONF.register_opts(device_orchestrator_opts, 'device_orchestrator')
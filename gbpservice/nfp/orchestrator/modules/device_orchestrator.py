@@ -17,6 +17,7 @@ import traceback
 from neutron.common import rpc as n_rpc
 from neutron_lib import context as n_context
 import oslo_messaging as messaging
+from oslo_utils import uuidutils
 
 from gbpservice._i18n import _
 from gbpservice.neutron.db import api as db_api
@@ -1597,6 +1598,7 @@ class NDOConfiguratorRpcApi(object):
             'nfi_id': (
                 device['network_function_instance_id']),
             'nfd_id': device['id'],
+            'request_id': uuidutils.generate_uuid(),
             'requester': nfp_constants.DEVICE_ORCHESTRATOR,
             'operation': operation,
             'logging_context': nfp_context['log_context'],
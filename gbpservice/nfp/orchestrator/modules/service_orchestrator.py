@@ -17,6 +17,7 @@ from neutron.common import rpc as n_rpc
 from neutron_lib import context as n_context
 from oslo_log import helpers as log_helpers
 import oslo_messaging
+from oslo_utils import uuidutils
 
 from gbpservice._i18n import _
 from gbpservice.neutron.db import api as db_api
@@ -40,6 +41,8 @@ LOG = nfp_logging.getLogger(__name__)
 STOP_POLLING = {'poll': False}
 CONTINUE_POLLING = {'poll': True}
 GATEWAY_SERVICES = [nfp_constants.FIREWALL, nfp_constants.VPN]
+# Per process cache of the network function contexts read from the DB
+NF_CONTEXT_CACHE = None
 
 
 def rpc_init(controller, config):
@@ -219,6 +222,40 @@ class RpcHandler(object):
         service_orchestrator.handle_policy_target_removed(
             context, network_function_id, policy_target)
 
+    @log_helpers.log_method_call
+    def policy_targets_added_notification(self, context, network_function_id,
+                                          policy_targets):
+        '''Update Configuration to react to several members addition.
+
+        Invoked in an RPC call. The configuration is regenerated from all
+        the current members, so it is updated once for the whole batch.
+        '''
+        module_context.init()
+        LOG.info("Received RPC call for POLICY TARGETS ADDED NOTIFICATION "
+                 "for NF:"
+                 " %(network_function_id)s",
+                 {'network_function_id': network_function_id})
+        service_orchestrator = ServiceOrchestrator(self._controller, self.conf)
+        service_orchestrator.handle_policy_target_added(
+            context, network_function_id, policy_targets[-1])
+
+    @log_helpers.log_method_call
+    def policy_targets_removed_notification(self, context,
+                                            network_function_id,
+                                            policy_targets):
+        '''Update Configuration to react to several members deletion.
+
+        Invoked in an RPC call. The configuration is regenerated from all
+        the current members, so it is updated once for the whole batch.
+        '''
+        module_context.init()
+        LOG.info("Received RPC call for POLICY TARGETS REMOVED "
+                 "NOTIFICATION for NF:%(network_function_id)s",
+                 {'network_function_id': network_function_id})
+        service_orchestrator = ServiceOrchestrator(self._controller, self.conf)
+        service_orchestrator.handle_policy_target_removed(
+            context, network_function_id, policy_targets[-1])
+
     @log_helpers.log_method_call
     def consumer_ptg_added_notification(self, context, network_function_id,
                                         policy_target_group):
@@ -423,6 +460,38 @@ class RpcHandlerConfigurator(object):
                            event_data=event_data, serialize=serialize)
 
 
+class NodeDriverNotifierApi(object):
+
+    """Service Orchestrator side of the NF status notifications.
+
+    The node driver waits for the network function operations it
+    requested to complete, the ACTIVE/ERROR/DELETED transitions are
+    notified on a fanout topic so that it need not poll for them.
+    """
+    API_VERSION = '1.0'
+    target = oslo_messaging.Target(version=API_VERSION)
+
+    def __init__(self):
+        super(NodeDriverNotifierApi, self).__init__()
+        self.client = n_rpc.get_client(self.target)
+        self.rpc_api = self.client.prepare(
+            version=self.API_VERSION,
+            topic=nfp_rpc_topics.NFP_NODE_DRIVER_CALLBACK_TOPIC,
+            fanout=True)
+
+    def network_function_status_changed(self, network_function_id, status):
+        try:
+            self.rpc_api.cast(n_context.get_admin_context(),
+                              'network_function_status_changed',
+                              network_function_id=network_function_id,
+                              status=status)
+        except Exception:
+            # The node driver falls back to polling for the status.
+            LOG.exception("Failed to notify status %(status)s of network "
+                          "function %(nf_id)s",
+                          {'status': status, 'nf_id': network_function_id})
+
+
 class NFPDbPatch(nfp_db.NFPDbBase):
 
     """Patch for Db class.
@@ -434,24 +503,38 @@ class NFPDbPatch(nfp_db.NFPDbBase):
     at multiple places, patched the Db class to override update &
     delete network_function methods. Here, the path is completed and
     then the base class methods are invoked to do the actual db operation.
+    The completion is also notified to the node driver, once committed.
     """
 
     def __init__(self, controller):
         self._controller = controller
+        self._node_driver_notifier = NodeDriverNotifierApi()
         super(NFPDbPatch, self).__init__()
 
     def update_network_function(self, session, network_function_id,
                                 updated_network_function):
         status = updated_network_function.get('status')
-        if status == 'ACTIVE' or status == 'ERROR':
+        completed = status == 'ACTIVE' or status == 'ERROR'
+        if completed:
             self._controller.path_complete_event()
-        return super(NFPDbPatch, self).update_network_function(
+        network_function = super(NFPDbPatch, self).update_network_function(
             session, network_function_id, updated_network_function)
+        if completed:
+            self._after_commit(
+                session,
+                self._node_driver_notifier.network_function_status_changed,
+                network_function_id, status)
+        return network_function
 
     def delete_network_function(self, session, network_function_id):
         self._controller.path_complete_event()
-        return super(NFPDbPatch, self).delete_network_function(
+        result = super(NFPDbPatch, self).delete_network_function(
             session, network_function_id)
+        self._after_commit(
+            session,
+            self._node_driver_notifier.network_function_status_changed,
+            network_function_id, nfp_constants.DELETED)
+        return result
 
 
 class ServiceOrchestrator(nfp_api.NfpEventHandler):
@@ -804,6 +887,9 @@ class ServiceOrchestrator(nfp_api.NfpEventHandler):
                 'service_type': service_type
             }
 
+            if self._apply_user_config_fast_path(network_function_data,
+                                                 tag_str, operation):
+                return
             rpc_method = getattr(self.configurator_rpc, operation +
                                  '_network_function_user_config')
             rpc_method(network_function_data, service_config_str, tag_str)
@@ -811,6 +897,38 @@ class ServiceOrchestrator(nfp_api.NfpEventHandler):
             # Place holder for calling config_init API
             pass
 
+    def _apply_user_config_fast_path(self, network_function_data, tag_str,
+                                     operation):
+        '''Applies the heat config of a base mode NF being created.
+
+        The configurator leaves the heat config to the orchestrator, which
+        it notifies back as unhandled, only for the CHECK_HEAT_CONFIG_RESULT
+        event to be posted. When the fast path is enabled, that event is
+        posted right away, and its worker applies the config in-process,
+        yielding only to poll the heat stack. Returns False when the
+        request is to go through the configurator.
+        '''
+        nfp_context = module_context.get()
+        if not (self.conf.orchestrator.base_mode_fast_path and
+                operation == 'create' and
+                tag_str == nfp_constants.HEAT_CONFIG_TAG and
+                nfp_context.get('base_mode')):
+            return False
+        request_info = self.configurator_rpc._get_request_info(
+            network_function_data, operation)
+        # Same event data as from the configurator notification
+        request_info['network_function_id'] = request_info.pop('nf_id')
+        request_info['network_function_instance_id'] = request_info.pop(
+            'nfi_id')
+        request_info['network_function_device_id'] = request_info.pop(
+            'nfd_id')
+        LOG.debug("Applying the heat config of network function %s "
+                  "without the configurator",
+                  request_info['network_function_id'])
+        self._create_event('CHECK_HEAT_CONFIG_RESULT',
+                           event_data=request_info)
+        return True
+
     def update_consumer_ptg(self, network_function_data,
                             service_config_str, operation):
         tag_str, config_str = self.config_driver.parse_template_config_string(
@@ -2419,6 +2537,20 @@ class ServiceOrchestrator(nfp_api.NfpEventHandler):
                            is_internal_event=True,
                            original_event=event)
 
+    def _get_network_function_context_db(self, network_function_id):
+        def _load():
+            with nfp_ctx_mgr.DbContextManager:
+                return self.db_handler.get_network_function_context(
+                    self.db_session, network_function_id)
+
+        global NF_CONTEXT_CACHE
+        if not NF_CONTEXT_CACHE:
+            NF_CONTEXT_CACHE = nfp_db.NetworkFunctionContextCache(
+                self.conf.orchestrator.nf_context_cache_size)
+        return NF_CONTEXT_CACHE.get(
+            network_function_id, _load,
+            self.conf.orchestrator.nf_context_cache_ttl)
+
     def get_port_info(self, port_id):
         try:
             with nfp_ctx_mgr.DbContextManager:
@@ -2431,7 +2563,8 @@ class ServiceOrchestrator(nfp_api.NfpEventHandler):
                           {'port_id': port_id})
             return None
 
-    def get_network_function_details(self, network_function_id):
+    def get_network_function_details(self, network_function_id,
+                                     nf_context=None):
         network_function = None
         network_function_instance = None
         network_function_device = None
@@ -2448,9 +2581,16 @@ class ServiceOrchestrator(nfp_api.NfpEventHandler):
             if service_details:
                 service_type = service_details.get('service_type', None)
         if not network_function:
-            with nfp_ctx_mgr.DbContextManager:
-                network_function = self.db_handler.get_network_function(
-                    self.db_session, network_function_id)
+            # The instance and the device are read along with the NF
+            nf_context = nf_context or self._get_network_function_context_db(
+                network_function_id)
+            network_function = nf_context['network_function']
+            if not network_function_instance:
+                network_function_instance = nf_context[
+                    'network_function_instance']
+            if not network_function_device:
+                network_function_device = nf_context[
+                    'network_function_device']
 
         network_function_details = {
             'network_function': network_function,
@@ -2484,14 +2624,21 @@ class ServiceOrchestrator(nfp_api.NfpEventHandler):
         return network_function_details
 
     def get_network_function_context(self, network_function_id):
-        network_function_details = self.get_network_function_details(
+        nf_context = self._get_network_function_context_db(
             network_function_id)
+        network_function_details = self.get_network_function_details(
+            network_function_id, nf_context=nf_context)
         network_function_device = (
             network_function_details['network_function_device'])
+        port_infos = nf_context['port_infos']
+
+        def _get_port_info(port_id):
+            return port_infos.get(port_id) or self.get_port_info(port_id)
+
         ports_info = []
         for id in network_function_details[
                 'network_function_instance']['port_info']:
-            port_info = self.get_port_info(id)
+            port_info = _get_port_info(id)
             ports_info.append(port_info)
 
         mngmt_port_info = None
@@ -2499,11 +2646,11 @@ class ServiceOrchestrator(nfp_api.NfpEventHandler):
         if network_function_device:
             mgmt_port_id = network_function_device['mgmt_port_id']
             if mgmt_port_id is not None:
-                mngmt_port_info = self.get_port_info(mgmt_port_id)
+                mngmt_port_info = _get_port_info(mgmt_port_id)
 
             monitor_port_id = network_function_device['monitoring_port_id']
             if monitor_port_id is not None:
-                monitor_port_info = self.get_port_info(monitor_port_id)
+                monitor_port_info = _get_port_info(monitor_port_id)
 
         nf_context = {'network_function_details': network_function_details,
                       'ports_info': ports_info,
@@ -2562,6 +2709,7 @@ class NSOConfiguratorRpcApi(object):
             'nfi_id': (network_function_instance['id']
                        if network_function_instance else ''),
             'nfd_id': None,
+            'request_id': uuidutils.generate_uuid(),
             'requester': nfp_constants.SERVICE_ORCHESTRATOR,
             'operation': operation,
             'logging_context': nfp_context['log_context'],
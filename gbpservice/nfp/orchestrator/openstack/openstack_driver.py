@@ -10,12 +10,17 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
 import io
+import os
+import time
 
 from gbpclient.v2_0 import client as gbp_client
+from keystoneauth1.identity import generic
 from keystoneauth1.identity import v2
 from keystoneauth1.identity import v3
 from keystoneauth1 import session
+from keystoneauth1 import token_endpoint
 from keystoneclient.v2_0 import client as identity_client
 from keystoneclient.v3 import client as keyclientv3
 from neutronclient.v2_0 import client as neutron_client
@@ -26,6 +31,98 @@ from gbpservice._i18n import _
 from gbpservice.nfp.core import log as nfp_logging
 LOG = nfp_logging.getLogger(__name__)
 
+# Number of API clients kept for reuse, the least recently used ones are
+# dropped first.
+MAX_POOLED_CLIENTS = 256
+
+
+class _MeteredSession(session.Session):
+    """Keystoneauth session accounting the calls made through it."""
+
+    def __init__(self, metrics, **kwargs):
+        super(_MeteredSession, self).__init__(**kwargs)
+        self._metrics = metrics
+
+    def request(self, url, method, **kwargs):
+        endpoint = ((kwargs.get('endpoint_filter') or {}).get(
+            'service_type') or kwargs.get('endpoint_override') or
+            '/'.join(url.split('/')[:3]))
+        start = time.time()
+        try:
+            return super(_MeteredSession, self).request(url, method, **kwargs)
+        except Exception:
+            self._metrics[endpoint]['errors'] += 1
+            raise
+        finally:
+            elapsed = time.time() - start
+            stats = self._metrics[endpoint]
+            stats['calls'] += 1
+            stats['time'] += elapsed
+            stats['max_time'] = max(stats['max_time'], elapsed)
+
+
+class ClientPool(object):
+    """Process wide pool of the sessions and clients of the OpenStack APIs.
+
+    A session, and with it its HTTP connection pool, is kept per endpoint.
+    The auth plugins of the password credentials are kept, so that the
+    tokens they fetch are reused until they are about to expire. Clients
+    are kept per token and project, along with their token auth, in a
+    bounded LRU.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._pid = os.getpid()
+        self._sessions = {}
+        self._auths = {}
+        self._clients = collections.OrderedDict()
+        self.metrics = collections.defaultdict(
+            lambda: {'calls': 0, 'errors': 0, 'time': 0.0, 'max_time': 0.0})
+
+    def _check_pid(self):
+        # Connections can't be shared with the forked NFP workers.
+        if self._pid != os.getpid():
+            self.reset()
+
+    def get_session(self, endpoint, auth=None):
+        self._check_pid()
+        if (endpoint, auth) not in self._sessions:
+            self._sessions[(endpoint, auth)] = _MeteredSession(self.metrics,
+                                                               auth=auth)
+        return self._sessions[(endpoint, auth)]
+
+    def get_auth(self, key, factory):
+        """Returns the auth plugin of a fixed set of credentials.
+
+        The plugins are never evicted, those of the per request tokens are
+        to be kept with their clients instead.
+        """
+        self._check_pid()
+        if key not in self._auths:
+            self._auths[key] = factory()
+        return self._auths[key]
+
+    def get_client(self, key, factory):
+        self._check_pid()
+        client = self._clients.pop(key, None)
+        if client is None:
+            client = factory()
+            while len(self._clients) >= MAX_POOLED_CLIENTS:
+                self._clients.popitem(last=False)
+        self._clients[key] = client
+        return client
+
+    def get_metrics(self):
+        """Returns the calls, errors and latency of each endpoint."""
+        return dict((endpoint, dict(stats))
+                    for endpoint, stats in self.metrics.items())
+
+
+CLIENT_POOL = ClientPool()
+
 
 class OpenstackApi(object):
     """Initializes common attributes for openstack client drivers."""
@@ -51,6 +148,36 @@ class OpenstackApi(object):
         self.token = None
         self.admin_tenant_id = None
 
+    def _get_password_auth(self, user, password, tenant_name):
+        return CLIENT_POOL.get_auth(
+            ('password', self.identity_service, user, password, tenant_name),
+            lambda: v2.Password(username=user,
+                                password=password,
+                                tenant_name=tenant_name,
+                                auth_url=self.identity_service))
+
+    def _get_nova_client(self, token, tenant_id, version=None):
+        version = version or self.nova_version
+        # The token auth is kept with its client, and so evicted along with
+        # it, tokens come and go.
+        return CLIENT_POOL.get_client(
+            ('nova', version, self.identity_service, token, tenant_id),
+            lambda: nova_client.Client(
+                version, session=CLIENT_POOL.get_session(
+                    self.identity_service),
+                auth=generic.Token(self.identity_service, token,
+                                   project_id=tenant_id)))
+
+    def _get_neutron_client(self, token, client_module=neutron_client):
+        return CLIENT_POOL.get_client(
+            (client_module.__name__, self.network_service, token),
+            lambda: client_module.Client(
+                session=CLIENT_POOL.get_session(self.network_service),
+                auth=token_endpoint.Token(self.network_service, token)))
+
+    def _get_gbp_client(self, token):
+        return self._get_neutron_client(token, client_module=gbp_client)
+
 
 class KeystoneClient(OpenstackApi):
     """ Keystone Client Apis for orchestrator. """
@@ -85,11 +212,10 @@ class KeystoneClient(OpenstackApi):
             LOG.error(err)
             raise Exception(err)
         try:
-            auth = v2.Password(username=user,
-                           password=password,
-                           tenant_name=tenant_name,
-                           auth_url=self.identity_service)
-            sess = session.Session(auth=auth)
+            # The auth plugin keeps the token, and fetches a new one only
+            # when it's about to expire.
+            auth = self._get_password_auth(user, password, tenant_name)
+            sess = CLIENT_POOL.get_session(self.identity_service)
             scoped_token = sess.get_token(auth=auth)
         except Exception as err:
             err = ("Failed to get token from"
@@ -137,13 +263,14 @@ class KeystoneClient(OpenstackApi):
             keystone resources.
         """
         keystone_conf = self.config.nfp_keystone_authtoken
-        auth = v2.Password(username=keystone_conf.admin_user,
-                           password=keystone_conf.admin_password,
-                           tenant_name=keystone_conf.admin_tenant_name,
-                           auth_url=self.identity_service)
-        sess = session.Session(auth=auth)
-        v2client = identity_client.Client(session=sess)
-        return v2client
+        auth = self._get_password_auth(keystone_conf.admin_user,
+                                       keystone_conf.admin_password,
+                                       keystone_conf.admin_tenant_name)
+        return CLIENT_POOL.get_client(
+            ('keystone', self.identity_service, auth),
+            lambda: identity_client.Client(
+                session=CLIENT_POOL.get_session(self.identity_service,
+                                                auth=auth)))
 
     def _get_v3_keystone_admin_client(self):
         """ Returns keystone v3 client with admin credentials
@@ -154,15 +281,19 @@ class KeystoneClient(OpenstackApi):
         v3_auth_url = ('%s://%s:%s/%s/' % (
             keystone_conf.auth_protocol, keystone_conf.auth_host,
             keystone_conf.auth_port, self.config.heat_driver.keystone_version))
-        auth = v3.Password(auth_url=v3_auth_url,
-                           user_domain_name='Default',
-                           username=keystone_conf.admin_user,
-                           password=keystone_conf.admin_password,
-                           project_domain_name="Default",
-                           project_name=keystone_conf.admin_tenant_name)
-        sess = session.Session(auth=auth)
-        v3client = keyclientv3.Client(session=sess)
-        return v3client
+        auth = CLIENT_POOL.get_auth(
+            ('v3password', v3_auth_url, keystone_conf.admin_user,
+             keystone_conf.admin_password, keystone_conf.admin_tenant_name),
+            lambda: v3.Password(auth_url=v3_auth_url,
+                                user_domain_name='Default',
+                                username=keystone_conf.admin_user,
+                                password=keystone_conf.admin_password,
+                                project_domain_name="Default",
+                                project_name=keystone_conf.admin_tenant_name))
+        return CLIENT_POOL.get_client(
+            ('keystone', v3_auth_url, auth),
+            lambda: keyclientv3.Client(
+                session=CLIENT_POOL.get_session(v3_auth_url, auth=auth)))
 
 
 class NovaClient(OpenstackApi):
@@ -178,9 +309,7 @@ class NovaClient(OpenstackApi):
         :return: Image UUID
         """
         try:
-            nova = nova_client.Client(self.nova_version, auth_token=token,
-                                      tenant_id=tenant_id,
-                                      auth_url=self.identity_service)
+            nova = self._get_nova_client(token, tenant_id)
             image = nova.images.find(name=image_name)
             return image.id
         except Exception as ex:
@@ -199,9 +328,7 @@ class NovaClient(OpenstackApi):
         :return: Image UUID
         """
         try:
-            nova = nova_client.Client(self.nova_version, auth_token=token,
-                                      tenant_id=tenant_id,
-                                      auth_url=self.identity_service)
+            nova = self._get_nova_client(token, tenant_id)
             image = nova.images.find(name=image_name)
             return image.metadata
         except Exception as ex:
@@ -220,9 +347,7 @@ class NovaClient(OpenstackApi):
         :return: Flavor UUID or None if not found
         """
         try:
-            nova = nova_client.Client(self.nova_version, auth_token=token,
-                                      tenant_id=tenant_id,
-                                      auth_url=self.identity_service)
+            nova = self._get_nova_client(token, tenant_id)
             flavor = nova.flavors.find(name=flavor_name)
             return flavor.id
         except Exception as ex:
@@ -242,9 +367,7 @@ class NovaClient(OpenstackApi):
 
         """
         try:
-            nova = nova_client.Client(self.nova_version, auth_token=token,
-                                      tenant_id=tenant_id,
-                                      auth_url=self.identity_service)
+            nova = self._get_nova_client(token, tenant_id)
             instance = nova.servers.get(instance_id)
             if instance:
                 return instance.to_dict()
@@ -270,9 +393,7 @@ class NovaClient(OpenstackApi):
         """
         tenant_id = str(tenant_id)
         try:
-            nova = nova_client.Client(self.nova_version, auth_token=token,
-                                      tenant_id=tenant_id,
-                                      auth_url=self.identity_service)
+            nova = self._get_nova_client(token, tenant_id)
             keypair = nova.keypairs.find(name=keypair_name)
             return keypair.to_dict()
         except Exception as ex:
@@ -290,9 +411,7 @@ class NovaClient(OpenstackApi):
         :param port_id: Port UUID
         """
         try:
-            nova = nova_client.Client(self.nova_version, auth_token=token,
-                                      tenant_id=tenant_id,
-                                      auth_url=self.identity_service)
+            nova = self._get_nova_client(token, tenant_id)
             instance = nova.servers.interface_attach(instance_id, port_id,
                                                      None, None)
             return instance
@@ -310,9 +429,7 @@ class NovaClient(OpenstackApi):
         :param port_id: Port UUID
         """
         try:
-            nova = nova_client.Client(self.nova_version, auth_token=token,
-                                      tenant_id=tenant_id,
-                                      auth_url=self.identity_service)
+            nova = self._get_nova_client(token, tenant_id)
             instance = nova.servers.interface_detach(instance_id, port_id)
             return instance
         except Exception as ex:
@@ -330,9 +447,7 @@ class NovaClient(OpenstackApi):
 
         """
         try:
-            nova = nova_client.Client(self.nova_version, auth_token=token,
-                                      tenant_id=tenant_id,
-                                      auth_url=self.identity_service)
+            nova = self._get_nova_client(token, tenant_id)
             nova.servers.delete(instance_id)
         except Exception as ex:
             err = ("Failed to delete instance"
@@ -340,12 +455,14 @@ class NovaClient(OpenstackApi):
             LOG.error(err)
             raise Exception(err)
 
-    def get_instances(self, token, filters=None):
+    def get_instances(self, token, filters=None, limit=None):
         """ List instances
 
         :param token: A scoped_token
         :param filters: Parameters for list filter
         example for filter: {}, tenant_id is mandatory
+        :param limit: Maximum number of instances, -1 to list all the pages
+        rather than the first one only
 
         :return: instance List
 
@@ -362,10 +479,8 @@ class NovaClient(OpenstackApi):
 
         tenant_id = filters.get('tenant_id')
         try:
-            nova = nova_client.Client(self.nova_version, auth_token=token,
-                                      tenant_id=tenant_id,
-                                      auth_url=self.identity_service)
-            instances = nova.servers.list(search_opts=filters)
+            nova = self._get_nova_client(token, tenant_id)
+            instances = nova.servers.list(search_opts=filters, limit=limit)
             data = [instance.to_dict() for instance in instances]
             return data
         except Exception as ex:
@@ -386,9 +501,8 @@ class NovaClient(OpenstackApi):
         """
 
         nova_version = 2.15
-        nova = nova_client.Client(nova_version, auth_token=token,
-                                  tenant_id=tenant_id,
-                                  auth_url=self.identity_service)
+        nova = self._get_nova_client(token, tenant_id,
+                                     version=nova_version)
 
         try:
             affinity_group = nova.server_groups.find(name=nf_id)
@@ -417,9 +531,8 @@ class NovaClient(OpenstackApi):
 
         nova_version = 2.15
         kwargs = dict(name=nf_id, policies=['soft-anti-affinity'])
-        nova = nova_client.Client(nova_version, auth_token=token,
-                                  tenant_id=tenant_id,
-                                  auth_url=self.identity_service)
+        nova = self._get_nova_client(token, tenant_id,
+                                     version=nova_version)
 
         try:
             affinity_group = nova.server_groups.create(**kwargs)
@@ -514,9 +627,7 @@ class NovaClient(OpenstackApi):
             kwargs.update(security_groups=[secgroup_name])
 
         try:
-            nova = nova_client.Client(self.nova_version, auth_token=token,
-                                      tenant_id=tenant_id,
-                                      auth_url=self.identity_service)
+            nova = self._get_nova_client(token, tenant_id)
             flavor = nova.flavors.find(name=flavor)
             instance = nova.servers.create(name, nova.images.get(image_id),
                                            flavor, **kwargs)
@@ -542,8 +653,7 @@ class NeutronClient(OpenstackApi):
 
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             return neutron.show_floatingip(floatingip_id)['floatingip']
         except Exception as ex:
             err = ("Failed to read floatingip from"
@@ -555,8 +665,7 @@ class NeutronClient(OpenstackApi):
     def get_floating_ips(self, token, **filters):
         """ Get list of floatingips, associated with port if passed"""
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             return neutron.list_floatingips(**filters)['floatingips']
         except Exception as ex:
             err = ("Failed to read floatingips from"
@@ -568,8 +677,7 @@ class NeutronClient(OpenstackApi):
     def get_security_groups(self, token, tenant_id=None, filters=None):
         """ Get list of security groups"""
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             filters = filters if filters is not None else {}
             return neutron.list_security_groups(**filters)['security_groups']
         except Exception as ex:
@@ -582,8 +690,7 @@ class NeutronClient(OpenstackApi):
     def create_security_group(self, token, attrs=None):
         """ Create security group"""
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
 
             sg_info = {"security_group": attrs}
             return neutron.create_security_group(body=sg_info)[
@@ -598,8 +705,7 @@ class NeutronClient(OpenstackApi):
     def create_security_group_rule(self, token, attrs=None):
         """ Create security group rule"""
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
 
             # attrs={'direction': 'egress', 'protocol': 'TCP',
             # 'security_group_id': 'c90c7b29-f653-4c41-ae1a-0290dc64e020'}
@@ -624,8 +730,7 @@ class NeutronClient(OpenstackApi):
 
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             ports = neutron.list_ports(**filters).get('ports', [])
             return ports
         except Exception as ex:
@@ -645,8 +750,7 @@ class NeutronClient(OpenstackApi):
 
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             return neutron.show_port(port_id)
         except Exception as ex:
             err = ("Failed to read port information"
@@ -665,8 +769,7 @@ class NeutronClient(OpenstackApi):
 
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             subnets = neutron.list_subnets(**filters).get('subnets', [])
             return subnets
         except Exception as ex:
@@ -683,8 +786,7 @@ class NeutronClient(OpenstackApi):
         :return: Subnet details
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             return neutron.show_subnet(subnet_id)
         except Exception as ex:
             err = ("Failed to read subnet from"
@@ -700,8 +802,7 @@ class NeutronClient(OpenstackApi):
         :param floatingip_id: Floatingip UUID
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             return neutron.delete_floatingip(floatingip_id)
         except Exception as ex:
             err = ("Failed to delete floatingip from"
@@ -719,8 +820,7 @@ class NeutronClient(OpenstackApi):
         :return:
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             port_info = dict(port={})
             port_info['port'].update(kwargs)
             return neutron.update_port(port_id, body=port_info)
@@ -739,8 +839,7 @@ class NeutronClient(OpenstackApi):
         """
         data = {'floatingips': []}
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             data = neutron.list_floatingips(port_id=[kwargs[key]
                                                      for key in kwargs])
             return data
@@ -754,8 +853,7 @@ class NeutronClient(OpenstackApi):
         :param data: data to update
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             return neutron.update_floatingip(floatingip_id, body=data)
         except Exception as ex:
             err = ("Failed to update floatingip from"
@@ -804,8 +902,7 @@ class NeutronClient(OpenstackApi):
         :return:
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             port_ids = port_ids if port_ids is not None else []
             if port_ids:
                 ports = neutron.list_ports(id=port_ids).get('ports', [])
@@ -825,8 +922,7 @@ class NeutronClient(OpenstackApi):
         :return:
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             subnet_ids = subnet_ids if subnet_ids is not None else []
             subnets = neutron.list_subnets(id=subnet_ids).get('subnets', [])
             return subnets
@@ -848,8 +944,7 @@ class NeutronClient(OpenstackApi):
             attr['port'].update(attrs)
 
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             return neutron.create_port(body=attr)['port']
         except Exception as ex:
             raise Exception(_("Port creation failed in network: %(net)r "
@@ -865,8 +960,7 @@ class NeutronClient(OpenstackApi):
         :return:
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             return neutron.delete_port(port_id)
         except Exception as ex:
             err = ("Failed to delete port %s"
@@ -885,8 +979,7 @@ class NeutronClient(OpenstackApi):
 
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             nets = neutron.list_networks(**filters).get('networks', [])
             return nets
         except Exception as ex:
@@ -903,8 +996,7 @@ class NeutronClient(OpenstackApi):
         :return:
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             return neutron.delete_network(net_id)
         except Exception as ex:
             err = ('Failed to delete network %s . %s' % (net_id, str(ex)))
@@ -921,8 +1013,7 @@ class NeutronClient(OpenstackApi):
 
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             pools = neutron.list_pools(**filters).get('pools', [])
             return pools
         except Exception as ex:
@@ -943,8 +1034,7 @@ class NeutronClient(OpenstackApi):
 
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             loadbalancers = neutron.list_loadbalancers(**filters).get(
                 'loadbalancers', [])
             return loadbalancers
@@ -965,8 +1055,7 @@ class NeutronClient(OpenstackApi):
 
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             return neutron.show_vip(vip_id)
         except Exception as ex:
             err = ("Failed to read vip information"
@@ -984,8 +1073,7 @@ class NeutronClient(OpenstackApi):
 
         """
         try:
-            neutron = neutron_client.Client(token=token,
-                                            endpoint_url=self.network_service)
+            neutron = self._get_neutron_client(token)
             return neutron.list_agents(**filters).get('agents', [])
         except Exception as ex:
             err = ("Failed to read agents information"
@@ -1008,8 +1096,7 @@ class GBPClient(OpenstackApi):
 
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             return gbp.list_policy_target_groups(
                 **filters)['policy_target_groups']
         except Exception as ex:
@@ -1027,8 +1114,7 @@ class GBPClient(OpenstackApi):
         :return:
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             filters = filters if filters is not None else {}
             return gbp.show_policy_target_group(
                 ptg_id, **filters)['policy_target_group']
@@ -1049,8 +1135,7 @@ class GBPClient(OpenstackApi):
         :return: PTG dict
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             return gbp.update_policy_target_group(
                 ptg_id,
                 body=policy_target_group_info)['policy_target_group']
@@ -1084,8 +1169,7 @@ class GBPClient(OpenstackApi):
             policy_target_info["policy_target"]["description"] = description
 
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             return gbp.create_policy_target(
                 body=policy_target_info)['policy_target']
 
@@ -1102,8 +1186,7 @@ class GBPClient(OpenstackApi):
         :param policy_target_id: PT UUID
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             return gbp.delete_policy_target(policy_target_id)
 
         except Exception as ex:
@@ -1119,8 +1202,7 @@ class GBPClient(OpenstackApi):
         :param policy_target_id: PTG UUID
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             return gbp.delete_policy_target_group(policy_target_group_id)
         except Exception as ex:
             err = ("Failed to delete policy target group from"
@@ -1142,8 +1224,7 @@ class GBPClient(OpenstackApi):
         }
 
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             return gbp.update_policy_target(
                 policy_target_id, body=policy_target_info)['policy_target']
         except Exception as ex:
@@ -1177,8 +1258,7 @@ class GBPClient(OpenstackApi):
         policy_target_group_info['policy_target_group'].update(ext_data)
 
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             return gbp.create_policy_target_group(
                 body=policy_target_group_info)['policy_target_group']
         except Exception as ex:
@@ -1202,8 +1282,7 @@ class GBPClient(OpenstackApi):
             l2_policy_info["description"].update({'description': description})
 
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             return gbp.create_l2_policy(body=l2_policy_info)['l2_policy']
         except Exception as ex:
             err = ("Failed to create l2 policy under tenant"
@@ -1218,8 +1297,7 @@ class GBPClient(OpenstackApi):
         :return:
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             return gbp.delete_l2_policy(l2policy_id)
         except Exception as ex:
             err = ("Failed to delete l2 policy %s. Reason %s" %
@@ -1240,8 +1318,7 @@ class GBPClient(OpenstackApi):
 
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             filters = filters if filters is not None else {}
             return gbp.list_l2_policies(**filters)['l2_policies']
         except Exception as ex:
@@ -1261,8 +1338,7 @@ class GBPClient(OpenstackApi):
 
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             filters = filters if filters is not None else {}
             return gbp.show_l2_policy(
                 policy_id, **filters)['l2_policy']
@@ -1277,8 +1353,7 @@ class GBPClient(OpenstackApi):
                                       network_service_policy_info):
 
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             return gbp.create_network_service_policy(
                 body=network_service_policy_info)['network_service_policy']
         except Exception as ex:
@@ -1298,8 +1373,7 @@ class GBPClient(OpenstackApi):
 
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             filters = filters if filters is not None else {}
             return gbp.list_network_service_policies(**filters)[
                 'network_service_policies']
@@ -1319,8 +1393,7 @@ class GBPClient(OpenstackApi):
 
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             filters = filters if filters is not None else {}
             return gbp.list_external_policies(**filters)['external_policies']
         except Exception as ex:
@@ -1339,8 +1412,7 @@ class GBPClient(OpenstackApi):
 
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             filters = filters if filters is not None else {}
             return gbp.list_policy_rule_sets(**filters)['policy_rule_sets']
         except Exception as ex:
@@ -1359,8 +1431,7 @@ class GBPClient(OpenstackApi):
 
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             filters = filters if filters is not None else {}
             return gbp.list_policy_actions(**filters)['policy_actions']
         except Exception as ex:
@@ -1379,8 +1450,7 @@ class GBPClient(OpenstackApi):
 
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             filters = filters if filters is not None else {}
             return gbp.list_policy_rules(**filters)['policy_rules']
         except Exception as ex:
@@ -1391,8 +1461,7 @@ class GBPClient(OpenstackApi):
     def create_l3_policy(self, token, l3_policy_info):  # tenant_id, name):
 
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             return gbp.create_l3_policy(body=l3_policy_info)['l3_policy']
         except Exception as ex:
             err = ("Failed to create l3 policy under tenant"
@@ -1412,8 +1481,7 @@ class GBPClient(OpenstackApi):
 
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             filters = filters if filters is not None else {}
             return gbp.show_l3_policy(
                 policy_id, **filters)['l3_policy']
@@ -1435,8 +1503,7 @@ class GBPClient(OpenstackApi):
 
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             filters = filters if filters is not None else {}
             return gbp.list_l3_policies(**filters)['l3_policies']
         except Exception as ex:
@@ -1455,8 +1522,7 @@ class GBPClient(OpenstackApi):
 
         """
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             filters = filters if filters is not None else {}
             return gbp.list_policy_targets(**filters)['policy_targets']
         except Exception as ex:
@@ -1471,8 +1537,7 @@ class GBPClient(OpenstackApi):
 
     def get_policy_target(self, token, pt_id, filters=None):
         try:
-            gbp = gbp_client.Client(token=token,
-                                    endpoint_url=self.network_service)
+            gbp = self._get_gbp_client(token)
             filters = filters if filters is not None else {}
             return gbp.show_policy_target(pt_id,
                                           **filters)['policy_target']
@@ -1484,17 +1549,14 @@ class GBPClient(OpenstackApi):
             raise Exception(err)
 
     def get_service_profile(self, token, service_profile_id):
-        gbp = gbp_client.Client(token=token,
-                                endpoint_url=self.network_service)
+        gbp = self._get_gbp_client(token)
         return gbp.show_service_profile(service_profile_id)['service_profile']
 
     def get_servicechain_node(self, token, node_id):
-        gbp = gbp_client.Client(token=token,
-                                endpoint_url=self.network_service)
+        gbp = self._get_gbp_client(token)
         return gbp.show_servicechain_node(node_id)['servicechain_node']
 
     def get_servicechain_instance(self, token, instance_id):
-        gbp = gbp_client.Client(token=token,
-                                endpoint_url=self.network_service)
+        gbp = self._get_gbp_client(token)
         return gbp.show_servicechain_instance(instance_id)[
             'servicechain_instance']
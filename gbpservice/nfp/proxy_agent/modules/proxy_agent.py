@@ -15,6 +15,7 @@ from gbpservice.nfp.core import log as nfp_logging
 from gbpservice.nfp.core.rpc import RpcAgent
 from gbpservice.nfp.lib import transport as transport
 from gbpservice.nfp.proxy_agent.lib import topics
+from gbpservice.nfp.proxy_agent.notifications import pull
 
 
 from oslo_log import helpers as log_helpers
@@ -47,6 +48,14 @@ class RpcHandler(object):
         super(RpcHandler, self).__init__()
         self._conf = conf
         self._sc = sc
+        self._pending_requests = pull.PendingRequests(
+            pull.PullNotification(sc, conf))
+
+    def _send_request(self, context, body, method_type, **kwargs):
+        transport.send_request_to_configurator(self._conf,
+                                               context, body,
+                                               method_type, **kwargs)
+        self._pending_requests.add(body)
 
     @log_helpers.log_method_call
     def create_network_function_config(self, context, body):
@@ -54,9 +63,7 @@ class RpcHandler(object):
         Return: Http Response.
         """
         module_context.init()
-        transport.send_request_to_configurator(self._conf,
-                                               context, body,
-                                               "CREATE")
+        self._send_request(context, body, "CREATE")
 
     @log_helpers.log_method_call
     def delete_network_function_config(self, context, body):
@@ -64,9 +71,7 @@ class RpcHandler(object):
         Return: Http Response.
         """
         module_context.init()
-        transport.send_request_to_configurator(self._conf,
-                                               context, body,
-                                               "DELETE")
+        self._send_request(context, body, "DELETE")
 
     @log_helpers.log_method_call
     def update_network_function_config(self, context, body):
@@ -74,9 +79,7 @@ class RpcHandler(object):
         Return: Http Response.
         """
         module_context.init()
-        transport.send_request_to_configurator(self._conf,
-                                               context, body,
-                                               "UPDATE")
+        self._send_request(context, body, "UPDATE")
 
     @log_helpers.log_method_call
     def create_network_function_device_config(self, context, body):
@@ -84,10 +87,7 @@ class RpcHandler(object):
         Return: Http Response.
         """
         module_context.init()
-        transport.send_request_to_configurator(self._conf,
-                                               context, body,
-                                               "CREATE",
-                                               device_config=True)
+        self._send_request(context, body, "CREATE", device_config=True)
 
     @log_helpers.log_method_call
     def delete_network_function_device_config(self, context, body):
@@ -95,10 +95,7 @@ class RpcHandler(object):
         Return: Http Response.
         """
         module_context.init()
-        transport.send_request_to_configurator(self._conf,
-                                               context, body,
-                                               "DELETE",
-                                               device_config=True)
+        self._send_request(context, body, "DELETE", device_config=True)
 
     @log_helpers.log_method_call
     def network_function_event(self, context, body):
@@ -106,7 +103,5 @@ class RpcHandler(object):
         Return: Http Response.
         """
         module_context.init()
-        transport.send_request_to_configurator(self._conf,
-                                               context, body,
-                                               "CREATE",
-                                               network_function_event=True)
+        self._send_request(context, body, "CREATE",
+                           network_function_event=True)
@@ -11,8 +11,10 @@
 #    under the License.
 
 import sys
+import time
 import traceback
 
+import eventlet
 from neutron_lib import context as n_context
 
 from gbpservice.nfp.common import constants as nfp_constants
@@ -66,6 +68,11 @@ class PullNotification(nfp_api.NfpEventHandler):
             spacing=nfp_constants.PULL_NOTIFICATIONS_SPACING)
     def pull_notifications(self, ev):
         """Pull and handle notification from configurator."""
+        self.handle_notifications()
+
+    def handle_notifications(self):
+        """Returns the request ids of the notifications handled."""
+        request_ids = []
         notifications = transport.get_response_from_configurator(self._conf)
 
         if not isinstance(notifications, list):
@@ -79,6 +86,8 @@ class PullNotification(nfp_api.NfpEventHandler):
                     LOG.info(message)
                     continue
                 try:
+                    request_ids.append(
+                        notification['info']['context'].get('request_id'))
                     self._method_handler(notification)
                 except AttributeError:
                     exc_type, exc_value, exc_traceback = sys.exc_info()
@@ -95,3 +104,58 @@ class PullNotification(nfp_api.NfpEventHandler):
                             e, notification, traceback.format_exception(
                                 exc_type, exc_value, exc_traceback)))
                     LOG.error(message)
+        return request_ids
+
+
+class PendingRequests(object):
+    """Requests forwarded to the configurator, awaiting their notification.
+
+    The notifications of the configurator are otherwise pulled once per
+    PULL_NOTIFICATIONS_SPACING. While requests forwarded by this process
+    are pending, they are also pulled once per spacing, and matched to the
+    pending requests on the request_id of their context, so that the events
+    of the orchestrator waiting on them are woken up as soon as the
+    configurator responds. The requests not answered within the timeout,
+    or whose notification was pulled by the periodic pull, are left to it.
+    """
+
+    def __init__(self, handler,
+                 spacing=nfp_constants.PENDING_NOTIFICATIONS_SPACING,
+                 timeout=nfp_constants.PENDING_NOTIFICATIONS_TIMEOUT):
+        self.handler = handler
+        self.spacing = spacing
+        self.timeout = timeout
+        # request_id -> time forwarded
+        self._pending = {}
+        self._task = None
+
+    def add(self, request):
+        try:
+            request_id = request['info']['context'].get('request_id')
+        except (KeyError, TypeError):
+            return
+        if not request_id:
+            return
+        self._pending[request_id] = time.time()
+        if not self._task:
+            self._task = eventlet.spawn(self._run)
+
+    def pull(self, now=None):
+        for request_id in self.handler.handle_notifications():
+            self._pending.pop(request_id, None)
+        now = now or time.time()
+        for request_id, forwarded_at in list(self._pending.items()):
+            if now - forwarded_at > self.timeout:
+                del self._pending[request_id]
+
+    def _run(self):
+        try:
+            while self._pending:
+                eventlet.sleep(self.spacing)
+                try:
+                    self.pull()
+                except Exception as e:
+                    LOG.error("Exception while pulling the notifications of "
+                              "the pending requests: %s", e)
+        finally:
+            self._task = None